@@ -10,6 +10,11 @@ class Constants:
             }
 
 
+class Endpoints:
+    AUTH_INFO = "/api/form/create/auth_info"
+    CREDIT_PARAMETERS = "/api/form/create/credit_parameters_info"
+
+
 class Body:
     AUTH_INDO_STEP = {
             "user_agent": "Mozilla/5.0 (X11; Ubuntu; Linux x86_64; rv:97.0) Gecko/20100101 Firefox/97.0",
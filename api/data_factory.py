@@ -0,0 +1,197 @@
+"""
+Seeded test data for the form payloads (`Body.AUTH_INDO_STEP`, `Body.CREDIT_PARAMETERS_STEP`).
+
+Values are generated in blocks: one `Random.choices` call builds the digits or letters of a whole
+block, and `take()` hands out the next value of the block. Every pool has its own generator seeded
+from `(seed, salt, pool name)`, so a pool's sequence does not depend on which other pools a test
+happened to use; the same seed reproduces the same values.
+
+    factory = FormDataFactory(seed=42)
+    auth_info, credit_parameters = factory.funnel()   # both steps for the same applicant
+    factory.credit_sum()                              # '130 000'
+"""
+import copy
+import os
+import random
+import string
+import threading
+from typing import Any, Callable, Generic, TypeVar
+
+from api.api import Body
+
+T = TypeVar('T')
+
+FEMALE = {'value': 'FEMALE', 'title': 'Женский'}
+MALE = {'value': 'MALE', 'title': 'Мужской'}
+
+FIRST_NAMES = {
+    'FEMALE': ('Анна', 'Мария', 'Елена', 'Ольга', 'Наталья', 'Ирина', 'Татьяна', 'Светлана', 'Юлия', 'Алёна'),
+    'MALE': ('Иван', 'Алексей', 'Дмитрий', 'Сергей', 'Андрей', 'Михаил', 'Николай', 'Павел', 'Артём', 'Егор'),
+}
+SURNAMES = {
+    'FEMALE': ('Иванова', 'Смирнова', 'Кузнецова', 'Попова', 'Соколова', 'Лебедева', 'Козлова', 'Новикова'),
+    'MALE': ('Иванов', 'Смирнов', 'Кузнецов', 'Попов', 'Соколов', 'Лебедев', 'Козлов', 'Новиков'),
+}
+PATRONYMICS = {
+    'FEMALE': ('Ивановна', 'Алексеевна', 'Дмитриевна', 'Сергеевна', 'Андреевна', 'Михайловна'),
+    'MALE': ('Иванович', 'Алексеевич', 'Дмитриевич', 'Сергеевич', 'Андреевич', 'Михайлович'),
+}
+EMAIL_DOMAINS = ('mail.ru', 'yandex.ru', 'gmail.com', 'bk.ru', 'inbox.ru')
+
+CREDIT_SUM_MIN = 10_000
+CREDIT_SUM_MAX = 5_000_000
+CREDIT_SUM_STEP = 1_000
+
+
+def format_sum(value: int) -> str:
+    """130000 -> '130 000', the format the form sends."""
+    return f'{value:,}'.replace(',', ' ')
+
+
+class Pool(Generic[T]):
+    """Values built `block_size` at a time by `generate(rng, n)` and handed out one by one."""
+
+    def __init__(self, rng: random.Random, generate: Callable[[random.Random, int], list[T]], block_size: int):
+        self.rng = rng
+        self.generate = generate
+        self.block_size = block_size
+        self._items = iter(())
+        self._lock = threading.Lock()
+
+    def take(self) -> T:
+        try:
+            return next(self._items)
+        except StopIteration:
+            with self._lock:
+                self._items = iter(self.generate(self.rng, self.block_size))
+            return next(self._items)
+
+    def take_many(self, n: int) -> list[T]:
+        return [self.take() for _ in range(n)]
+
+
+def _digits(rng: random.Random, n: int, length: int, prefix: str = '') -> list[str]:
+    chars = ''.join(rng.choices(string.digits, k=n * length))
+    return [prefix + chars[i:i + length] for i in range(0, n * length, length)]
+
+
+def _phone_numbers(rng: random.Random, n: int) -> list[str]:
+    return _digits(rng, n, 9, prefix='79')
+
+
+def _credit_sums(rng: random.Random, n: int) -> list[str]:
+    steps = rng.choices(range(CREDIT_SUM_MIN // CREDIT_SUM_STEP, CREDIT_SUM_MAX // CREDIT_SUM_STEP + 1), k=n)
+    return [format_sum(step * CREDIT_SUM_STEP) for step in steps]
+
+
+def _applicants(rng: random.Random, n: int) -> list[dict[str, Any]]:
+    genders = rng.choices((FEMALE, MALE), k=n)
+    picks = rng.choices(range(10 ** 6), k=n * 3)
+    logins = ''.join(rng.choices(string.ascii_lowercase, k=n * 8))
+    phones = _phone_numbers(rng, n)
+    sms_codes = _digits(rng, n, 4)
+    domains = rng.choices(EMAIL_DOMAINS, k=n)
+    credit_sums = _credit_sums(rng, n)
+    applicants = []
+    for i, gender in enumerate(genders):
+        key = gender['value']
+        applicants.append({
+            'name': FIRST_NAMES[key][picks[3 * i] % len(FIRST_NAMES[key])],
+            'surname': SURNAMES[key][picks[3 * i + 1] % len(SURNAMES[key])],
+            'patronymic': PATRONYMICS[key][picks[3 * i + 2] % len(PATRONYMICS[key])],
+            'email': f'{logins[8 * i:8 * i + 8]}{i % 100}@{domains[i]}',
+            'phone_number': phones[i],
+            'sms_code': sms_codes[i],
+            'credit_sum': credit_sums[i],
+            'gender': gender,
+        })
+    return applicants
+
+
+class FormDataFactory:
+    """
+    Deterministic generator of form payloads. The seed comes from the argument, QA_DATA_SEED, or is
+    drawn at random; it is kept in `seed` so a failing run can be repeated with QA_DATA_SEED=<seed>.
+    `salt` separates parallel workers, so shards do not submit the same phone numbers.
+    """
+
+    def __init__(self, seed: int | None = None, salt: str = '', block_size: int = 1000):
+        if seed is None:
+            seed = int(os.getenv('QA_DATA_SEED') or random.SystemRandom().randrange(2 ** 32))
+        self.seed = seed
+        self.salt = salt
+        self.block_size = block_size
+        self._pools: dict[str, Pool] = {}
+
+    def _pool(self, name: str, generate: Callable[[random.Random, int], list]) -> Pool:
+        pool = self._pools.get(name)
+        if pool is None:
+            rng = random.Random(f'{self.seed}:{self.salt}:{name}')
+            pool = self._pools.setdefault(name, Pool(rng, generate, self.block_size))
+        return pool
+
+    def phone_number(self) -> str:
+        return self._pool('phone_number', _phone_numbers).take()
+
+    def credit_sum(self) -> str:
+        return self._pool('credit_sum', _credit_sums).take()
+
+    def applicant(self) -> dict[str, Any]:
+        """Name, surname, patronymic, email, phone, SMS code, requested sum and gender of one person."""
+        return self._pool('applicant', _applicants).take()
+
+    def string(self, n: int) -> str:
+        """Uppercase alphanumeric string of length `n`."""
+        def generate(rng: random.Random, count: int) -> list[str]:
+            chars = ''.join(rng.choices(string.ascii_uppercase + string.digits, k=count * n))
+            return [chars[i:i + n] for i in range(0, count * n, n)]
+        return self._pool(f'string:{n}', generate).take()
+
+    def auth_info(self, applicant: dict[str, Any] | None = None) -> dict[str, Any]:
+        applicant = applicant or self.applicant()
+        return {
+            **Body.AUTH_INDO_STEP,
+            'phone_number': applicant['phone_number'],
+            'sms_code': applicant['sms_code'],
+        }
+
+    def credit_parameters(self, applicant: dict[str, Any] | None = None) -> dict[str, Any]:
+        applicant = applicant or self.applicant()
+        return {
+            'credit_target': dict(Body.CREDIT_PARAMETERS_STEP['credit_target']),
+            'credit_sum': applicant['credit_sum'],
+            'name': applicant['name'],
+            'surname': applicant['surname'],
+            'patronymic': applicant['patronymic'],
+            'email': applicant['email'],
+            'phone_number': applicant['phone_number'],
+            'gender': dict(applicant['gender']),
+        }
+
+    def funnel(self) -> tuple[dict[str, Any], dict[str, Any]]:
+        """Payloads of both form steps for the same applicant."""
+        applicant = self.applicant()
+        return self.auth_info(applicant), self.credit_parameters(applicant)
+
+    def funnels(self, n: int) -> list[tuple[dict[str, Any], dict[str, Any]]]:
+        return [self.funnel() for _ in range(n)]
+
+    @staticmethod
+    def boundary_credit_parameters() -> list[tuple[str, dict[str, Any]]]:
+        """(label, payload) pairs with values at the edges of what the form accepts."""
+        base = copy.deepcopy(Body.CREDIT_PARAMETERS_STEP)
+        variants = {
+            'min_sum': {'credit_sum': format_sum(CREDIT_SUM_MIN)},
+            'max_sum': {'credit_sum': format_sum(CREDIT_SUM_MAX)},
+            'one_letter_names': {'name': 'Я', 'surname': 'Ю', 'patronymic': 'Э'},
+            'hyphenated_surname': {'surname': 'Петрова-Водкина'},
+            'yo_letter': {'name': 'Алёна', 'surname': 'Королёва', 'patronymic': 'Фёдоровна'},
+            'long_name': {'name': 'А' * 50, 'surname': 'Б' * 50, 'patronymic': 'В' * 50},
+            'email_plus_tag': {'email': 'test+form@mail.ru'},
+            'email_subdomain': {'email': 'test@corp.example.co.uk'},
+            'phone_all_zeros': {'phone_number': '70000000000'},
+            'phone_all_nines': {'phone_number': '79999999999'},
+            'male': {'gender': dict(MALE)},
+            'female': {'gender': dict(FEMALE)},
+        }
+        return [(label, {**copy.deepcopy(base), **changes}) for label, changes in variants.items()]
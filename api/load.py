@@ -0,0 +1,282 @@
+"""
+Asyncio load generator for the credit-application funnel.
+
+Every virtual user walks the two form steps (auth info, then credit parameters) with its own
+`user_id`, over its own keep-alive connection. Each walk submits a new applicant from the seeded
+`FormDataFactory`. Run against the stand or against the bundled stub:
+
+    python -m api.load --stub --users 200 --concurrency 50 --ramp-up 5 --duration 30 --seed 42
+"""
+import argparse
+import asyncio
+import json
+import math
+import time
+from dataclasses import dataclass, field
+from urllib.parse import urlencode, urlsplit
+
+from api.api import Constants, Endpoints
+from api.data_factory import FormDataFactory
+
+
+FUNNEL = (Endpoints.AUTH_INFO, Endpoints.CREDIT_PARAMETERS)
+
+
+@dataclass
+class LoadConfig:
+    base_url: str = Constants.URL
+    users: int = 10
+    concurrency: int = 10
+    ramp_up: float = 0.0
+    duration: float = 10.0
+    first_user_id: int = 1
+    timeout: float = 30.0
+    seed: int | None = None  # Test data seed; QA_DATA_SEED or random if not set
+
+
+@dataclass
+class LoadReport:
+    elapsed: float = 0.0
+    seed: int | None = None
+    latencies: dict[str, list[float]] = field(default_factory=dict)  # Successful requests only
+    error_latencies: dict[str, list[float]] = field(default_factory=dict)
+
+    def add(self, endpoint: str, latency: float, ok: bool) -> None:
+        """Failed requests are kept apart, so timeouts do not distort the percentiles of served requests."""
+        self.latencies.setdefault(endpoint, [])
+        self.error_latencies.setdefault(endpoint, [])
+        (self.latencies if ok else self.error_latencies)[endpoint].append(latency)
+
+    @staticmethod
+    def percentile(sorted_values: list[float], p: float) -> float:
+        """Nearest-rank percentile of an already sorted list."""
+        if not sorted_values:
+            return 0.0
+        rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+        return sorted_values[rank - 1]
+
+    def summary(self) -> list[dict]:
+        rows = []
+        for endpoint, values in self.latencies.items():
+            values = sorted(values)
+            errors = self.error_latencies.get(endpoint, [])
+            count = len(values) + len(errors)
+            rows.append({
+                'endpoint': endpoint,
+                'count': count,
+                'errors': len(errors),
+                'rps': count / self.elapsed if self.elapsed else 0.0,
+                'error_mean_ms': sum(errors) / len(errors) * 1000 if errors else 0.0,
+                'p50_ms': self.percentile(values, 50) * 1000,
+                'p95_ms': self.percentile(values, 95) * 1000,
+                'p99_ms': self.percentile(values, 99) * 1000,
+            })
+        return rows
+
+    def format(self) -> str:
+        lines = [f'{"endpoint":<45} {"count":>7} {"errors":>7} {"rps":>8} '
+                 f'{"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8} {"err ms":>8}']
+        total = 0
+        for row in self.summary():
+            total += row['count']
+            lines.append(f'{row["endpoint"]:<45} {row["count"]:>7} {row["errors"]:>7} {row["rps"]:>8.1f} '
+                         f'{row["p50_ms"]:>8.1f} {row["p95_ms"]:>8.1f} {row["p99_ms"]:>8.1f} '
+                         f'{row["error_mean_ms"]:>8.1f}')
+        lines.append('Percentiles cover successful requests; "err ms" is the mean latency of failed ones.')
+        lines.append(f'Total: {total} requests in {self.elapsed:.1f}s '
+                     f'({total / self.elapsed if self.elapsed else 0.0:.1f} req/s)')
+        if self.seed is not None:
+            lines.append(f'Test data seed: {self.seed}')
+        return '\n'.join(lines)
+
+
+class _Connection:
+    """Minimal HTTP/1.1 keep-alive connection on top of asyncio streams."""
+
+    def __init__(self, base_url: str, timeout: float):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == 'https' else 80)
+        self.ssl = parts.scheme == 'https'
+        self.timeout = timeout
+        self.reader: asyncio.StreamReader | None = None
+        self.writer: asyncio.StreamWriter | None = None
+
+    async def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except OSError:
+                pass
+            self.reader = self.writer = None
+
+    async def post(self, path: str, params: dict, body: dict) -> tuple[int, bytes]:
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port, ssl=self.ssl), self.timeout
+            )
+        payload = json.dumps(body).encode('utf-8')
+        head = (
+            f'POST {path}?{urlencode(params)} HTTP/1.1\r\n'
+            f'Host: {self.host}:{self.port}\r\n'
+            + ''.join(f'{k}: {v}\r\n' for k, v in Constants.HEADERS.items())
+            + f'Content-Length: {len(payload)}\r\n\r\n'
+        )
+        self.writer.write(head.encode('latin-1') + payload)
+        await self.writer.drain()
+        return await asyncio.wait_for(self._read_response(), self.timeout)
+
+    async def _read_response(self) -> tuple[int, bytes]:
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError('Connection closed by server')
+        status = int(status_line.split()[1])
+        headers = {}
+        while (line := await self.reader.readline()) not in (b'\r\n', b'\n', b''):
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            body = b''
+            while size := int((await self.reader.readline()).split(b';')[0], 16):
+                body += await self.reader.readexactly(size)
+                await self.reader.readline()
+            await self.reader.readline()
+        else:
+            body = await self.reader.readexactly(int(headers.get('content-length', 0)))
+
+        if headers.get('connection', '').lower() == 'close':
+            await self.close()
+        return status, body
+
+
+async def _virtual_user(user_id: int, start_delay: float, deadline: float, config: LoadConfig,
+                        semaphore: asyncio.Semaphore, report: LoadReport, factory: FormDataFactory) -> None:
+    await asyncio.sleep(start_delay)
+    connection = _Connection(config.base_url, config.timeout)
+    params = {'user_id': user_id}
+    try:
+        while time.perf_counter() < deadline:
+            for endpoint, body in zip(FUNNEL, factory.funnel()):
+                async with semaphore:
+                    started = time.perf_counter()
+                    try:
+                        status, _ = await connection.post(endpoint, params, body)
+                        ok = status == 200
+                    except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError):
+                        await connection.close()
+                        ok = False
+                    report.add(endpoint, time.perf_counter() - started, ok)
+                if not ok:
+                    await asyncio.sleep(0.1)  # do not hammer a failing stand
+                    break
+                if time.perf_counter() >= deadline:
+                    break
+    finally:
+        await connection.close()
+
+
+async def run_load(config: LoadConfig) -> LoadReport:
+    """
+    Runs `config.users` virtual users for `config.duration` seconds.
+    Users start evenly over `config.ramp_up` seconds; at most `config.concurrency` requests are in flight.
+    """
+    factory = FormDataFactory(config.seed)
+    report = LoadReport(seed=factory.seed)
+    semaphore = asyncio.Semaphore(config.concurrency)
+    started = time.perf_counter()
+    deadline = started + config.duration
+    step = config.ramp_up / config.users if config.users else 0.0
+    await asyncio.gather(*(
+        _virtual_user(config.first_user_id + i, i * step, deadline, config, semaphore, report, factory)
+        for i in range(config.users)
+    ))
+    report.elapsed = time.perf_counter() - started
+    return report
+
+
+class StubServer:
+    """
+    Local stand-in for the form API: answers both funnel steps with the messages the stand returns.
+    """
+    RESPONSES = {
+        Endpoints.AUTH_INFO: {'message': 'Данные успешно сохранены/изменены на нулевом этапе'},
+        Endpoints.CREDIT_PARAMETERS: {'message': 'Данные успешно сохранены/изменены на первом этапе'},
+    }
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0):
+        self.host = host
+        self.port = port
+        self._server: asyncio.AbstractServer | None = None
+
+    @property
+    def url(self) -> str:
+        return f'http://{self.host}:{self.port}'
+
+    async def start(self) -> 'StubServer':
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def __aenter__(self) -> 'StubServer':
+        return await self.start()
+
+    async def __aexit__(self, *exc) -> None:
+        await self.stop()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while request_line := await reader.readline():
+                path = request_line.split()[1].decode('latin-1').split('?')[0]
+                length = 0
+                while (line := await reader.readline()) not in (b'\r\n', b'\n', b''):
+                    name, _, value = line.decode('latin-1').partition(':')
+                    if name.strip().lower() == 'content-length':
+                        length = int(value)
+                await reader.readexactly(length)
+
+                if path in self.RESPONSES:
+                    status, body = '200 OK', self.RESPONSES[path]
+                else:
+                    status, body = '404 Not Found', {'detail': 'Not found'}
+                payload = json.dumps(body, ensure_ascii=False).encode('utf-8')
+                writer.write(
+                    f'HTTP/1.1 {status}\r\nContent-Type: application/json\r\n'
+                    f'Content-Length: {len(payload)}\r\n\r\n'.encode('latin-1') + payload
+                )
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+async def _main(args: argparse.Namespace) -> None:
+    config = LoadConfig(base_url=args.url, users=args.users, concurrency=args.concurrency,
+                        ramp_up=args.ramp_up, duration=args.duration, first_user_id=args.first_user_id,
+                        seed=args.seed)
+    if args.stub:
+        async with StubServer() as stub:
+            config.base_url = stub.url
+            report = await run_load(config)
+    else:
+        report = await run_load(config)
+    print(report.format())
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Load test for the credit-application funnel.')
+    parser.add_argument('--url', default=Constants.URL)
+    parser.add_argument('--stub', action='store_true', help='Run against a local stub server.')
+    parser.add_argument('--users', type=int, default=10)
+    parser.add_argument('--concurrency', type=int, default=10)
+    parser.add_argument('--ramp-up', type=float, default=0.0)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--first-user-id', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=None, help='Test data seed (default: QA_DATA_SEED or random).')
+    asyncio.run(_main(parser.parse_args()))
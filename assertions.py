@@ -1,19 +1,35 @@
 import json
+import weakref
 import pytest
 from typing import Any, List, Dict
-from common.authentication import JWTAuthentication
+from qa_lib.json_diff import diff_json
 
 
 class Assertions:
+    _parsed_cache: "weakref.WeakKeyDictionary[Any, Any]" = weakref.WeakKeyDictionary()
+
     @staticmethod
     def _parse_json(response: Any) -> Dict:
         """
         Helper method to parse JSON response safely.
+        The body of each response object is parsed once and reused by all helpers;
+        already parsed data (dict or list) is returned as is.
         """
+        if isinstance(response, (dict, list)):
+            return response
+        try:
+            return Assertions._parsed_cache[response]
+        except (KeyError, TypeError):
+            pass
         try:
-            return response.json()
+            parsed = response.json()
         except json.decoder.JSONDecodeError:
             pytest.fail(f"Response is not in JSON format. Response content is {response.content}")
+        try:
+            Assertions._parsed_cache[response] = parsed
+        except TypeError:  # Response type does not support weak references
+            pass
+        return parsed
 
     @staticmethod
     def assert_json_value_by_name(response: Any, name: str, expected_value: Any) -> None:
@@ -64,6 +80,8 @@ class Assertions:
         """
         Checks that the JSON response contains a valid JWT token with the correct type.
         """
+        from common.authentication import JWTAuthentication
+
         json_response = Assertions._parse_json(response)
         assert 'access_token' in json_response, "Response JSON does not contain 'access_token'"
         jwt_token = json_response['access_token']
@@ -83,29 +101,16 @@ class Assertions:
             updated_dict: Dict, original_dict: Dict, ignore_keys: List[str] = None
     ) -> None:
         """
-        Recursively compares two dictionaries, ensuring that all keys not listed in `ignore_keys`
-        have identical values. Supports nested dictionaries.
+        Compares two JSON structures in a single pass, descending into nested dicts and lists.
+        `ignore_keys` may hold bare key names (ignored at any level), dotted paths ("owner.id",
+        "items.0.id") or globs ("items.*.modified_at"). Reports every difference at once.
         """
         auto_updated_fields = ['modified_at']
-        ignore_keys = set((ignore_keys or []) + auto_updated_fields)
-
-        filtered_original = {k: v for k, v in original_dict.items() if k not in ignore_keys}
-        filtered_updated = {k: v for k, v in updated_dict.items() if k not in ignore_keys}
-
-        assert filtered_original.keys() == filtered_updated.keys(), (
-            f"Key mismatch: expected {set(filtered_original.keys())}, got {set(filtered_updated.keys())}"
+        differences = diff_json(original_dict, updated_dict, (ignore_keys or []) + auto_updated_fields)
+        assert not differences, (
+            f"Dicts differ in {len(differences)} place(s):\n" + "\n".join(f"  {d}" for d in differences)
         )
 
-        for key in filtered_original:
-            orig_value, upd_value = filtered_original[key], filtered_updated[key]
-
-            if isinstance(orig_value, dict) and isinstance(upd_value, dict):
-                Assertions.assert_dicts_equal_except(upd_value, orig_value, list(ignore_keys))
-            else:
-                assert upd_value == orig_value, (
-                    f"Value mismatch for key '{key}': expected {orig_value}, but received {upd_value}"
-                )
-
     @staticmethod
     def assert_partial_update_response(response: Any, original_data: Dict, payload: Dict) -> None:
         """
@@ -121,21 +126,24 @@ class Assertions:
                 else:
                     pytest.fail(f"Did not receive key '{key}' in response")
             else:
-                Assertions.assert_json_value_by_name(response, key, expected_value)
+                Assertions.assert_json_value_by_name(updated_data, key, expected_value)
 
         ignore_keys = list(payload.keys())
         Assertions.assert_dicts_equal_except(updated_data, original_data, ignore_keys)
 
     @staticmethod
-    def assert_response_schema_by_serializer(response: Any, serializer_class: Any) -> None:
+    def assert_response_schema_by_serializer(response: Any, serializer_class: Any, sample_size: int = None) -> None:
         """
         Validates that the response data matches the schema defined by the serializer.
+        The serializer is compiled once per class into a lightweight validator; pass `sample_size`
+        to check only that many evenly spaced items of a large list.
         """
+        from qa_lib.schema_validator import validate_items
+
         data = Assertions._parse_json(response)
-        items = data.get("results", data)  # Handle pagination
-        many = isinstance(items, list)
-        serializer = serializer_class(data=items, many=many)
-        assert serializer.is_valid(), f"Response schema does not match: {serializer.errors}"
+        items = data.get("results", data) if isinstance(data, dict) else data  # Handle pagination
+        errors = validate_items(items, serializer_class, sample_size)
+        assert not errors, f"Response schema does not match: {errors}"
 
     @staticmethod
     def assert_user_list_field_equal(data: Dict, field_key: str, expected_user_ids: List[int]) -> None:
@@ -0,0 +1,274 @@
+"""
+Benchmark of the per-request overhead of the QA library: MyDjangoClient._send, Logger.add_request /
+add_response, the Assertions helpers and universal_replace (compiled and one-off payloads), with small,
+medium and huge JSON bodies.
+
+    python -m qa_lib.benchmarks.hot_paths                      # run and compare with the baseline
+    python -m qa_lib.benchmarks.hot_paths --save-baseline      # store the current numbers as the baseline
+    python -m qa_lib.benchmarks.hot_paths --filter _send --threshold 0.15
+
+Requests go to an in-process Django app that returns pre-encoded bodies, so `raw_client` is the cost
+of Django's test client alone and `_send` minus `raw_client` is what the library adds. Memory is the
+peak traced by tracemalloc during one operation. The exit code is 1 if any case is slower, or
+allocates more, than the baseline by more than the threshold.
+"""
+import argparse
+import copy
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable
+
+SIZES = {'small': 1, 'medium': 100, 'huge': 10_000}  # Items in the response list
+MIN_ALLOCATION_DELTA = 4096  # Bytes; smaller peak differences are noise
+
+
+def make_body(items: int) -> dict:
+    return {
+        'count': items,
+        'next': None,
+        'results': [
+            {
+                'id': i,
+                'title': f'Task {i}',
+                'description': 'Lorem ipsum dolor sit amet, consectetur adipiscing elit ' * 2,
+                'is_active': i % 2 == 0,
+                'priority': i % 5,
+                'owner': {'id': i % 97, 'email': f'user{i % 97}@example.com'},
+                'tags': ['backend', 'api', f'tag{i % 13}'],
+                'created_at': '2024-01-01T00:00:00Z',
+                'modified_at': '2024-01-02T00:00:00Z',
+            }
+            for i in range(items)
+        ],
+    }
+
+
+BODIES = {size: make_body(items) for size, items in SIZES.items()}
+ENCODED = {size: json.dumps(body).encode('utf-8') for size, body in BODIES.items()}
+
+
+def _setup_django() -> None:
+    """Minimal settings of the stub app; the project's own settings and database are not needed."""
+    from django.conf import settings
+    import django
+
+    settings.configure(
+        DEBUG=False,
+        SECRET_KEY='benchmark',
+        ALLOWED_HOSTS=['testserver'],
+        ROOT_URLCONF=__name__,
+        MIDDLEWARE=[],
+        DATABASES={},
+        INSTALLED_APPS=['django.contrib.contenttypes', 'django.contrib.auth', 'rest_framework'],
+        USE_TZ=True,
+    )
+    django.setup()
+
+
+def stub_view(request, size: str):
+    from django.http import HttpResponse
+    return HttpResponse(ENCODED[size], content_type='application/json')
+
+
+urlpatterns = []  # Filled by main() once Django is configured
+
+
+class _Response:
+    """Response with an unparsed body, so assertion benchmarks include parsing like a fresh response does."""
+    __slots__ = ('content', 'status_code', '__weakref__')
+
+    def __init__(self, content: bytes):
+        self.content = content
+        self.status_code = 200
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+
+class _Request:
+    """The part of pytest's `request` that universal_replace uses."""
+    values = {'generated_string': lambda n: 'X' * n, 'owner_email': 'owner@example.com'}
+
+    def getfixturevalue(self, name: str) -> Any:
+        return self.values[name]
+
+
+def build_cases() -> dict[str, Callable[[], Any]]:
+    from django.test import Client
+    from rest_framework import serializers
+    from qa_lib.assertions import Assertions
+    from qa_lib.body_capture import BodyCapture, short_repr
+    from qa_lib.logger import Logger
+    from qa_lib.my_django_client import MyDjangoClient
+    from qa_lib.payload_template import compile_template, replace_placeholders
+
+    class OwnerSerializer(serializers.Serializer):
+        id = serializers.IntegerField()
+        email = serializers.EmailField()
+
+    class TaskSerializer(serializers.Serializer):
+        id = serializers.IntegerField()
+        title = serializers.CharField(max_length=100)
+        description = serializers.CharField()
+        is_active = serializers.BooleanField()
+        priority = serializers.IntegerField(min_value=0, max_value=4)
+        owner = OwnerSerializer()
+        tags = serializers.ListField(child=serializers.CharField())
+        created_at = serializers.DateTimeField()
+        modified_at = serializers.DateTimeField()
+
+    client = Client()
+    headers = {'Content-Type': 'application/json', 'Content-Length': '0'}
+    cases: dict[str, Callable[[], Any]] = {
+        'assert_status_code': lambda: Assertions.assert_status_code(_Response(ENCODED['small']), 200),
+    }
+    for size, body in BODIES.items():
+        path = f'/bench/{size}/'
+        encoded = ENCODED[size]
+        updated = copy.deepcopy(body)
+        for item in updated['results']:
+            item['modified_at'] = '2024-02-01T00:00:00Z'
+        template = copy.deepcopy(body)
+        for item in template['results'][::10]:
+            item['title'] = 'FIX::generated_string(12)'
+            item['owner']['email'] = 'FIX::owner_email'
+        compile_template(template)
+        request = _Request()
+
+        cases.update({
+            f'raw_client[{size}]': lambda path=path, body=body: client.post(path, body, content_type='application/json'),
+            f'_send[{size}]': lambda path=path, body=body: MyDjangoClient._send('POST', path, body, None, 'application/json'),
+            f'Logger.add_request[{size}]': lambda path=path, body=body: Logger.add_request(
+                url=path, data=short_repr(body), headers=None, method='POST'),
+            f'Logger.add_response[{size}]': lambda path=path, encoded=encoded: Logger.add_response(
+                status_code=200, response_body=BodyCapture.from_bytes(encoded, f'POST {path} -> 200'), headers=headers),
+            f'assert_json_value_by_name[{size}]': lambda encoded=encoded, body=body: Assertions.assert_json_value_by_name(
+                _Response(encoded), 'count', body['count']),
+            f'assert_dicts_equal_except[{size}]': lambda body=body, updated=updated: Assertions.assert_dicts_equal_except(
+                updated, body),
+            f'assert_response_schema[{size}]': lambda encoded=encoded: Assertions.assert_response_schema_by_serializer(
+                _Response(encoded), TaskSerializer),
+            f'universal_replace[{size}]': lambda template=template, request=request: compile_template(
+                template).render(request),
+            f'replace_placeholders[{size}]': lambda template=template, request=request: replace_placeholders(
+                template, request),
+        })
+    return cases
+
+
+def ops_per_sec(fn: Callable[[], Any], min_time: float, repeats: int = 5) -> float:
+    """Best of `repeats` timings, each running `fn` for at least `min_time / repeats` seconds."""
+    fn()  # Warm-up: compiled templates, caches, lazy imports
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time / repeats / 4:
+            break
+        number *= 2
+    number = max(1, int(number * (min_time / repeats) / max(elapsed, 1e-9)))
+    best = float('inf')
+    for _ in range(repeats):
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.perf_counter() - started) / number)
+    return 1 / best
+
+
+def peak_allocation(fn: Callable[[], Any], runs: int = 3) -> int:
+    """Largest memory peak above the starting point traced during one call of `fn`."""
+    tracemalloc.start()
+    try:
+        fn()
+        peak = 0
+        for _ in range(runs):
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            fn()
+            peak = max(peak, tracemalloc.get_traced_memory()[1] - current)
+        return peak
+    finally:
+        tracemalloc.stop()
+
+
+def compare(results: dict[str, dict], baseline: dict[str, dict], threshold: float) -> list[str]:
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if result['ops_per_sec'] < base['ops_per_sec'] * (1 - threshold):
+            regressions.append(f'{name}: {result["ops_per_sec"]:.0f} ops/s, baseline {base["ops_per_sec"]:.0f} ops/s')
+        if (result['peak_bytes'] > base['peak_bytes'] * (1 + threshold)
+                and result['peak_bytes'] - base['peak_bytes'] > MIN_ALLOCATION_DELTA):
+            regressions.append(f'{name}: peak {result["peak_bytes"]} bytes, baseline {base["peak_bytes"]} bytes')
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Benchmark the per-request overhead of the QA library.')
+    parser.add_argument('--baseline', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json'))
+    parser.add_argument('--save-baseline', action='store_true', help='Write the results as the new baseline.')
+    parser.add_argument('--threshold', type=float, default=0.25, help='Allowed relative regression (0.25 = 25%%).')
+    parser.add_argument('--min-time', type=float, default=1.0, help='Seconds of timing per case.')
+    parser.add_argument('--filter', default='', help='Only run cases whose name contains this string.')
+    parser.add_argument('--json', default=None, help='Also write the results to this file.')
+    args = parser.parse_args()
+    baseline_path = os.path.abspath(args.baseline)
+    json_path = os.path.abspath(args.json) if args.json else None
+
+    from django.urls import path
+    _setup_django()
+    urlpatterns.append(path('bench/<str:size>/', stub_view))
+    os.chdir(tempfile.mkdtemp(prefix='qa_bench_'))  # Log files of the benchmark do not go to the project
+
+    results = {}
+    print(f'{"case":<40} {"ops/s":>12} {"us/op":>10} {"peak KiB":>10}')
+    for name, fn in build_cases().items():
+        if args.filter not in name:
+            continue
+        rate = ops_per_sec(fn, args.min_time)
+        peak = peak_allocation(fn)
+        results[name] = {'ops_per_sec': round(rate, 1), 'peak_bytes': peak}
+        print(f'{name:<40} {rate:>12.1f} {1e6 / rate:>10.1f} {peak / 1024:>10.1f}')
+
+    for size in SIZES:
+        raw, send = results.get(f'raw_client[{size}]'), results.get(f'_send[{size}]')
+        if raw and send:
+            overhead = 1e6 / send['ops_per_sec'] - 1e6 / raw['ops_per_sec']
+            print(f'Library overhead per request [{size}]: {overhead:.1f} us')
+
+    if json_path:
+        with open(json_path, 'w', encoding='utf-8') as stream:
+            json.dump(results, stream, indent=2)
+
+    if args.save_baseline:
+        stored = {}
+        if os.path.exists(baseline_path):
+            with open(baseline_path, encoding='utf-8') as stream:
+                stored = json.load(stream)
+        stored.update(results)
+        with open(baseline_path, 'w', encoding='utf-8') as stream:
+            json.dump(stored, stream, indent=2, sort_keys=True)
+        print(f'Baseline written to {baseline_path}')
+        return 0
+
+    if not os.path.exists(baseline_path):
+        print(f'No baseline at {baseline_path}; run with --save-baseline to create one')
+        return 0
+    with open(baseline_path, encoding='utf-8') as stream:
+        regressions = compare(results, json.load(stream), args.threshold)
+    for regression in regressions:
+        print(f'REGRESSION {regression}')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,65 @@
+"""
+Startup benchmark: wall time of `pytest --collect-only` for the given targets.
+
+    python benchmarks/startup.py test_api.py --runs 10 --importtime
+    python benchmarks/startup.py test_api.py --max-seconds 1.5   # exit code 1 if the median is slower
+
+Every run is a fresh interpreter, so the numbers include conftest and plugin imports.
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+
+def measure(targets: list[str], runs: int) -> list[float]:
+    command = [sys.executable, '-m', 'pytest', '--collect-only', '-q', '-p', 'no:cacheprovider', *targets]
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def top_imports(targets: list[str], limit: int) -> list[tuple[int, str]]:
+    """Slowest imports by cumulative time (microseconds) from `python -X importtime`."""
+    command = [sys.executable, '-X', 'importtime', '-m', 'pytest', '--collect-only', '-q',
+               '-p', 'no:cacheprovider', *targets]
+    stderr = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, module = line[len('import time:'):].split('|')
+        rows.append((int(cumulative), module.rstrip()))
+    return sorted(rows, reverse=True)[:limit]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Measure pytest startup (collection) time.')
+    parser.add_argument('targets', nargs='*', default=['test_api.py'])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--importtime', action='store_true', help='Also show the slowest imports.')
+    parser.add_argument('--max-seconds', type=float, default=None, help='Fail if the median is above this.')
+    args = parser.parse_args()
+
+    timings = measure(args.targets, args.runs)
+    median = statistics.median(timings)
+    print(f'pytest --collect-only {" ".join(args.targets)}: '
+          f'min {min(timings):.3f}s, median {median:.3f}s, max {max(timings):.3f}s over {args.runs} runs')
+
+    if args.importtime:
+        print('Slowest imports (cumulative):')
+        for cumulative, module in top_imports(args.targets, 15):
+            print(f'  {cumulative / 1000:>9.1f} ms  {module}')
+
+    if args.max_seconds is not None and median > args.max_seconds:
+        print(f'Median startup {median:.3f}s is above the limit of {args.max_seconds:.3f}s')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
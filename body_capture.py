@@ -0,0 +1,227 @@
+import hashlib
+import os
+from collections import deque
+from typing import Any, Iterable, Iterator
+
+
+repr_limit = int(os.getenv('QA_REPR_LIMIT', '2000'))
+_MAX_DEPTH = 50
+_SCALARS = (int, float, bool, type(None))
+_FAST_SCALARS = frozenset({int, float, bool, type(None)})
+
+
+class _LimitReached(Exception):
+    pass
+
+
+class _BoundedRepr:
+    """repr() written piece by piece into a character budget; stops as soon as the budget is spent."""
+    __slots__ = ('parts', 'left')
+
+    def __init__(self, limit: int):
+        self.parts: list[str] = []
+        self.left = limit
+
+    def emit(self, text: str) -> None:
+        self.parts.append(text)
+        self.left -= len(text)
+        if self.left < 0:
+            raise _LimitReached
+
+    def write(self, obj: Any, depth: int) -> None:
+        if isinstance(obj, (str, bytes, bytearray)):
+            # Only the part that can fit is converted, whatever the length of the string
+            self.emit(repr(obj[:self.left + 1]) if len(obj) > self.left else repr(obj))
+        elif isinstance(obj, _SCALARS):
+            self.emit(repr(obj))
+        elif depth >= _MAX_DEPTH:
+            self.emit('...')
+        elif _estimate(obj, self.left, depth) >= 0:
+            self.emit(repr(obj))  # Plain data that fits is printed by repr() itself, in one go
+        elif isinstance(obj, dict):
+            self.emit('{')
+            for index, (key, value) in enumerate(obj.items()):
+                if index:
+                    self.emit(', ')
+                self.write(key, depth + 1)
+                self.emit(': ')
+                self.write(value, depth + 1)
+            self.emit('}')
+        elif isinstance(obj, (list, tuple, set, frozenset)) and obj:
+            opening, closing = (('[', ']') if isinstance(obj, list) else ('(', ')') if isinstance(obj, tuple)
+                                else ('frozenset({', '})') if isinstance(obj, frozenset) else ('{', '}'))
+            self.emit(opening)
+            for index, item in enumerate(obj):
+                if index:
+                    self.emit(', ')
+                self.write(item, depth + 1)
+            self.emit(',' + closing if isinstance(obj, tuple) and len(obj) == 1 else closing)
+        else:
+            self.emit(repr(obj))
+
+
+def _estimate(obj: Any, left: int, depth: int) -> int:
+    """
+    Subtracts a generous estimate of len(repr(obj)) from `left`. Stops early once the result is negative;
+    objects of other types than plain JSON-like data count as not fitting at all.
+    """
+    kind = type(obj)
+    if kind is str:
+        return left - len(obj) - 2
+    if kind in _FAST_SCALARS:
+        return left - 24
+    if depth >= _MAX_DEPTH:
+        return -1
+    if kind is dict:
+        left -= 2
+        for key, value in obj.items():
+            left -= (len(key) + 4) if type(key) is str else 26 if type(key) in _FAST_SCALARS else left + 1
+            value_kind = type(value)
+            if value_kind is str:
+                left -= len(value) + 4
+            elif value_kind in _FAST_SCALARS:
+                left -= 26
+            else:
+                left = _estimate(value, left, depth + 1) - 2
+            if left < 0:
+                return left
+        return left
+    if kind is list or kind is tuple:
+        left -= 3
+        for item in obj:
+            item_kind = type(item)
+            if item_kind is str:
+                left -= len(item) + 4
+            elif item_kind in _FAST_SCALARS:
+                left -= 26
+            else:
+                left = _estimate(item, left, depth + 1) - 2
+            if left < 0:
+                return left
+        return left
+    return -1
+
+
+def short_repr(obj: Any, limit: int | None = None) -> str:
+    """
+    repr() of request data cut at `limit` characters (QA_REPR_LIMIT, 2000 by default). Containers are walked
+    only until the limit is reached, so the cost is bounded by the limit and not by the size of the payload.
+    """
+    if limit is None:
+        limit = repr_limit
+    writer = _BoundedRepr(limit)
+    try:
+        writer.write(obj, 0)
+    except _LimitReached:
+        return ''.join(writer.parts)[:limit] + '...'
+    return ''.join(writer.parts)
+
+
+class BodyCapture:
+    """
+    Size-bounded view of an HTTP body: byte length, sha256, and a head/tail preview.
+
+    For a regular response the full content stays where it already is (on the response) and is decoded
+    only when `text()` is called. For a streaming response the capture is filled while the test consumes
+    the stream; only the preview is kept, never the whole body.
+    """
+    preview_size = int(os.getenv('QA_BODY_PREVIEW', '1024'))
+    keep_per_test = 50
+    _test_captures: deque = deque(maxlen=keep_per_test)
+
+    __slots__ = ('_content', '_hash', '_digest', 'size', 'head', 'tail', 'streaming', 'complete', 'label')
+
+    def __init__(self, label: str = ''):
+        self._content: bytes | None = None
+        self._hash = None
+        self._digest: str | None = None
+        self.size = 0
+        self.head = b''
+        self.tail = b''
+        self.streaming = False
+        self.complete = True
+        self.label = label
+
+    @staticmethod
+    def from_bytes(content: bytes, label: str = '') -> 'BodyCapture':
+        capture = BodyCapture(label)
+        capture._content = content
+        capture.size = len(content)
+        capture.head = content[:BodyCapture.preview_size]
+        if capture.size > 2 * BodyCapture.preview_size:
+            capture.tail = content[-BodyCapture.preview_size:]
+        else:
+            capture.head = content
+        BodyCapture._test_captures.append(capture)
+        return capture
+
+    @staticmethod
+    def wrap_stream(chunks: Iterable[bytes], label: str = '') -> tuple['BodyCapture', Iterator[bytes]]:
+        """
+        Returns a capture and a generator to put back in place of the stream. The generator passes
+        chunks through unchanged and updates the capture as they go.
+        """
+        capture = BodyCapture(label)
+        capture.streaming = True
+        capture.complete = False
+        capture._hash = hashlib.sha256()
+        BodyCapture._test_captures.append(capture)
+
+        def passthrough() -> Iterator[bytes]:
+            limit = BodyCapture.preview_size
+            for chunk in chunks:
+                if isinstance(chunk, str):
+                    chunk = chunk.encode('utf-8')
+                capture.size += len(chunk)
+                capture._hash.update(chunk)
+                if len(capture.head) < limit:
+                    capture.head += chunk[:limit - len(capture.head)]
+                capture.tail = (capture.tail + chunk[-limit:])[-limit:]
+                yield chunk
+            capture.complete = True
+            capture._digest = capture._hash.hexdigest()
+            if capture.size <= 2 * limit:  # Head and tail together hold the whole body
+                rest = capture.size - len(capture.head)
+                capture.head += capture.tail[len(capture.tail) - rest:] if rest else b''
+                capture.tail = b''
+
+        return capture, passthrough()
+
+    @property
+    def sha256(self) -> str | None:
+        if self._digest is None and self._content is not None:
+            self._digest = hashlib.sha256(self._content).hexdigest()
+        return self._digest
+
+    def text(self) -> str:
+        """Materializes the full body. Not available for streams, which are never kept in memory."""
+        if self._content is None:
+            raise ValueError('Full body of a streaming response is not kept; use the preview')
+        return self._content.decode('utf-8', errors='replace')
+
+    def prefix(self, size: int) -> bytes:
+        """First `size` bytes of the body; a stream keeps only its head preview."""
+        return self.head[:size] if self._content is None else self._content[:size]
+
+    def preview(self) -> str:
+        if self.streaming and not self.complete:
+            return f'<streaming body, {self.size} bytes read so far>'
+        if not self.tail:
+            return self.head.decode('utf-8', errors='replace')
+        skipped = self.size - len(self.head) - len(self.tail)
+        return (f'{self.head.decode("utf-8", errors="replace")}'
+                f'... <{skipped} bytes skipped, {self.size} total> ...'
+                f'{self.tail.decode("utf-8", errors="replace")}')
+
+    def __str__(self) -> str:
+        return self.preview()
+
+    @staticmethod
+    def reset_test() -> None:
+        """Forgets the captures of the previous test. Called at the start of every test."""
+        BodyCapture._test_captures.clear()
+
+    @staticmethod
+    def test_captures() -> list['BodyCapture']:
+        """Captures made by the current test (at most `keep_per_test`, most recent last)."""
+        return list(BodyCapture._test_captures)
@@ -0,0 +1,163 @@
+import base64
+import glob
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import Any
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from qa_lib.logger import Logger
+
+
+class CassetteMissError(LookupError):
+    """Raised in replay mode when a request has no recorded exchange."""
+
+
+class Cassette:
+    """
+    Record/replay store for live-stand exchanges made through MyRequestsClient.
+
+    QA_CASSETTE=record   - send requests to the stand and store every exchange;
+    QA_CASSETTE=replay   - serve exchanges from the store, never touching the network;
+    QA_CASSETTE=off      - default, plain live requests.
+
+    Exchanges are matched by method, path, query params and a hash of the JSON body. Fields listed in
+    QA_CASSETTE_IGNORE (default "user_id") are dropped from params and body before matching, so volatile
+    values such as the random user_id do not break replay. The store is a gzip-compressed JSON file
+    (QA_CASSETTE_DIR/QA_CASSETTE_NAME.json.gz) loaded into memory once; recording merges into it.
+    Parallel workers (--shards, xdist) save their recordings to `<cassette>.<worker>`; the parent
+    process merges those files into the cassette. Bodies that are not UTF-8 text are stored base64-encoded.
+    """
+    mode = os.getenv('QA_CASSETTE', 'off')
+    directory = os.getenv('QA_CASSETTE_DIR', 'cassettes')
+    name = os.getenv('QA_CASSETTE_NAME', 'live')
+    ignore_fields = frozenset(filter(None, os.getenv('QA_CASSETTE_IGNORE', 'user_id').split(',')))
+
+    _exchanges: dict[str, list[dict]] | None = None
+    _replay_positions: dict[str, int] = {}
+    _recorded: set[str] = set()
+    _lock = threading.Lock()
+
+    @staticmethod
+    def path() -> str:
+        return os.path.join(Cassette.directory, f'{Cassette.name}.json.gz')
+
+    @staticmethod
+    def _strip(value: Any) -> Any:
+        match value:
+            case dict():
+                return {k: Cassette._strip(v) for k, v in value.items() if k not in Cassette.ignore_fields}
+            case list():
+                return [Cassette._strip(item) for item in value]
+            case _:
+                return value
+
+    @staticmethod
+    def match_key(method: str, path: str, params: dict | None, body: Any) -> str:
+        params = sorted((str(k), str(v)) for k, v in (params or {}).items() if k not in Cassette.ignore_fields)
+        body_hash = hashlib.sha1(
+            json.dumps(Cassette._strip(body), sort_keys=True, ensure_ascii=False, default=str).encode('utf-8')
+        ).hexdigest()[:16]
+        query = '&'.join(f'{k}={v}' for k, v in params)
+        return f'{method.upper()} {path}?{query} {body_hash}'
+
+    @staticmethod
+    def _load() -> dict[str, list[dict]]:
+        if Cassette._exchanges is None:
+            with Cassette._lock:
+                if Cassette._exchanges is None:
+                    if os.path.exists(Cassette.path()):
+                        Cassette._exchanges = Cassette._read(Cassette.path())
+                    else:
+                        Cassette._exchanges = {}
+        return Cassette._exchanges
+
+    @staticmethod
+    def record(key: str, response: requests.Response) -> None:
+        exchanges = Cassette._load()
+        with Cassette._lock:
+            if key not in Cassette._recorded:  # Re-recording replaces exchanges from earlier runs
+                Cassette._recorded.add(key)
+                exchanges[key] = []
+            exchange = {'status': response.status_code, 'headers': dict(response.headers)}
+            try:
+                exchange['body'] = response.content.decode('utf-8')
+            except UnicodeDecodeError:  # Binary body, e.g. a file export
+                exchange['body_base64'] = base64.b64encode(response.content).decode('ascii')
+            exchanges[key].append(exchange)
+
+    @staticmethod
+    def replay(key: str, url: str) -> requests.Response:
+        exchanges = Cassette._load()
+        with Cassette._lock:
+            recorded = exchanges.get(key)
+            if not recorded:
+                raise CassetteMissError(
+                    f'No recorded exchange for "{key}" in cassette {Cassette.path()}. '
+                    f'Record it with QA_CASSETTE=record against the stand.'
+                )
+            # Repeated identical requests are served in recorded order; the last one is reused after that
+            position = Cassette._replay_positions.get(key, 0)
+            Cassette._replay_positions[key] = position + 1
+            exchange = recorded[min(position, len(recorded) - 1)]
+
+        response = requests.Response()
+        response.status_code = exchange['status']
+        response.headers = CaseInsensitiveDict(exchange['headers'])
+        response.headers.pop('Content-Encoding', None)  # Body is stored decoded
+        if 'body_base64' in exchange:
+            response._content = base64.b64decode(exchange['body_base64'])
+        else:
+            response._content = exchange['body'].encode('utf-8')
+            response.encoding = 'utf-8'
+        response.url = url
+        return response
+
+    @staticmethod
+    def save() -> None:
+        """
+        Writes the exchanges recorded by this process. Called at the end of the session in record mode.
+        A parallel worker writes only its own recordings to `<cassette>.<worker>`, so workers finishing
+        one after another do not overwrite each other.
+        """
+        if Cassette.mode != 'record' or not Cassette._recorded:
+            return
+        recorded = {key: Cassette._exchanges[key] for key in Cassette._recorded}
+        worker = Logger.worker_id()
+        if worker:
+            Cassette._write(f'{Cassette.path()}.{worker}', recorded)
+        else:
+            Cassette._merge(recorded)
+
+    @staticmethod
+    def merge_worker_files() -> None:
+        """Folds the cassettes recorded by parallel workers into the main cassette."""
+        for worker_path in sorted(glob.glob(glob.escape(Cassette.path()) + '.*')):
+            Cassette._merge(Cassette._read(worker_path))
+            os.remove(worker_path)
+
+    @staticmethod
+    def _merge(recorded: dict[str, list[dict]]) -> None:
+        """Replaces the exchanges of the recorded keys in the cassette file and keeps the rest."""
+        stored = Cassette._read(Cassette.path()) if os.path.exists(Cassette.path()) else {}
+        stored.update(recorded)
+        Cassette._write(Cassette.path(), stored)
+
+    @staticmethod
+    def _read(path: str) -> dict[str, list[dict]]:
+        with gzip.open(path, 'rt', encoding='utf-8') as stream:
+            return json.load(stream)
+
+    @staticmethod
+    def _write(path: str, exchanges: dict[str, list[dict]]) -> None:
+        """Written atomically, so a crashed run cannot corrupt the cassette."""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=directory, delete=False) as raw:
+            with gzip.open(raw, 'wt', encoding='utf-8') as stream:
+                json.dump(exchanges, stream, ensure_ascii=False, separators=(',', ':'))
+        os.replace(raw.name, path)
@@ -1,25 +1,214 @@
+# Heavy dependencies (Django, DRF, JWT services, requests, qase) are imported inside the fixtures
+# and hooks that use them, so collection and runs that do not request those fixtures skip their import.
+from __future__ import annotations
+
 import pytest
-import re
-from rest_framework import status
-from django.urls import reverse
-from django.conf import settings
-from core.jwt_token.token_service import JWTAuth
-from qa_lib.my_django_client import MyDjangoClient
-from typing import Callable, Any, Tuple, Union
-from datetime import datetime
 import os
-from dotenv import load_dotenv
+import sys
+from typing import Callable, Any, Tuple, Union, TYPE_CHECKING
+from datetime import datetime
+from qa_lib.logger import Logger
+from qa_lib.body_capture import BodyCapture
+from qa_lib.token_cache import TokenCache
+from qa_lib.latency_stats import LatencyStats
+from qa_lib.seed_data import SeedData
+from qa_lib.payload_template import (
+    cached_template, compile_template, parse_placeholder, replace_placeholders, resolve_fixture,
+)
+from api.data_factory import FormDataFactory
+
+if TYPE_CHECKING:
+    from qa_lib.my_django_client import MyDjangoClient
+    from qa_lib.my_requests_client import MyRequestsClient
+
+
+pytest_plugins = ['qa_lib.sharding', 'qa_lib.fixture_profiler', 'qa_lib.impact_index']
+
+FORM_DATA_KEY = pytest.StashKey[FormDataFactory]()
+DB_BLOCKER_KEY = pytest.StashKey[Any]()  # pytest-django's DjangoDbBlocker, once the seed rows are built
+
+
+_env_loaded = False
+
+
+def load_env() -> None:
+    """
+    Loads .env into the environment once, on first use by a fixture that needs project or stand settings,
+    so runs that never request one (collection, plain unit tests) do not import python-dotenv.
+    """
+    global _env_loaded
+    if not _env_loaded:
+        from dotenv import load_dotenv
+
+        load_dotenv()
+        _env_loaded = True
+
+
+def testops_reporter() -> Any:
+    """
+    The buffered TestOps reporter when QA_TESTOPS_MODE enables it, otherwise None. Imported on first use:
+    it pulls in urllib and http.client, which runs that report through qase-pytest do not need.
+    """
+    module = sys.modules.get('qa_lib.testops_reporter')
+    if module is None:
+        if os.getenv('QA_TESTOPS_MODE', 'off') == 'off':
+            return None
+        from qa_lib import testops_reporter as module
+    return module.TestOpsReporter if module.TestOpsReporter.enabled() else None
+
 
+def latency_report_path() -> str:
+    return os.getenv('QA_LATENCY_REPORT', os.path.join('logs', 'latency.json'))
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """
+    Flushes queued log records (QA_LOG_ASYNC=1), buffered TestOps results and recorded cassettes.
+    Parallel workers also dump their endpoint latencies for the parent process.
+    """
+    if (reporter := sys.modules.get('qa_lib.testops_reporter')) is not None:  # Only if something was reported
+        reporter.TestOpsReporter.shutdown()
+    Logger.shutdown()
+    if Logger.worker_id() and LatencyStats.has_data():
+        LatencyStats.dump(f'{latency_report_path()}.{Logger.worker_id()}')
+    if (cassette := sys.modules.get('qa_lib.cassette')) is not None:  # Only if live tests ran
+        cassette.Cassette.save()
+    if not Logger.worker_id() and os.getenv('QA_CASSETTE') == 'record':
+        from qa_lib.cassette import Cassette
+        Cassette.merge_worker_files()  # xdist workers finish before their controller
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_cmdline_main(config):
+    """Merges the latencies and cassettes of shard processes (--shards) once they have all finished."""
+    yield
+    if not config.getoption('shards'):
+        return
+    LatencyStats.merge_worker_files(latency_report_path())
+    if LatencyStats.has_data():
+        sys.stdout.write(f'\n{"=" * 30} endpoint latency (all shards) {"=" * 30}\n')
+        sys.stdout.write(''.join(f'{line}\n' for line in LatencyStats.format_table()))
+        LatencyStats.write_json(latency_report_path())
+    if os.getenv('QA_CASSETTE') == 'record':
+        from qa_lib.cassette import Cassette
+        Cassette.merge_worker_files()
+
+
+def pytest_terminal_summary(terminalreporter):
+    """Reports endpoint latencies, JWT token reuse and time spent waiting for the live-stand rate limit."""
+    if not Logger.worker_id():
+        LatencyStats.merge_worker_files(latency_report_path())  # xdist workers finish before their controller
+    if LatencyStats.has_data():
+        terminalreporter.section('endpoint latency')
+        for line in LatencyStats.format_table():
+            terminalreporter.write_line(line)
+        if not Logger.worker_id():  # A shard's numbers are reported by the parent, together with the others
+            LatencyStats.write_json(latency_report_path())
+
+    stats = TokenCache.stats()
+    if stats['hits'] or stats['misses']:
+        terminalreporter.write_line(
+            f"JWT token cache: {stats['hits']} hits, {stats['misses']} misses, {stats['size']} tokens"
+        )
+
+    if (rate_limiter := sys.modules.get('qa_lib.rate_limiter')) is not None:  # Only if live tests ran
+        terminalreporter.write_line(rate_limiter.RateLimiter.format_summary())
+
+    form_data = terminalreporter.config.stash.get(FORM_DATA_KEY, None)
+    if form_data is not None:
+        terminalreporter.write_line(f'Test data seed: {form_data.seed} (reproduce with QA_DATA_SEED={form_data.seed})')
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_setup(item):
+    BodyCapture.reset_test()
+    Logger.set_current_test(item.nodeid, 'setup')
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_call(item):
+    Logger.set_current_test(item.nodeid, 'call')
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_teardown(item, nextitem):
+    """Rebuilds the seed rows (if they were built) after a transactional test, once its database flush has run."""
+    Logger.set_current_test(item.nodeid, 'teardown')
+    yield
+    blocker = item.config.stash.get(DB_BLOCKER_KEY, None)
+    if blocker is not None and nextitem is not None and flushes_database(item):
+        with blocker.unblock():
+            SeedData.build_all()
+
+
+def pytest_runtest_logfinish(nodeid):
+    Logger.set_current_test(None)
+
+
+def pytest_runtest_logreport(report):
+    """Hands the test result to the buffered TestOps reporter (QA_TESTOPS_MODE=buffered|file)."""
+    if getattr(report, 'node', None) is not None:
+        return  # Reports relayed from xdist workers were already queued by the worker itself
+    if (reporter := testops_reporter()) is None:
+        return
+    comment = report.longreprtext[-2000:] if report.failed else ''
+    if report.when == 'call' or (report.when == 'setup' and not report.passed):
+        reporter.record_result(report.nodeid, report.outcome, report.duration, comment)
+    elif report.when == 'teardown':
+        reporter.finish_test(report.nodeid, comment)  # Queued with the steps of the teardown
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """Logs the full bodies of the test's responses when it fails; only previews are logged otherwise."""
+    outcome = yield
+    report = outcome.get_result()
+    if report.when == 'call' and report.failed:
+        for capture in BodyCapture.test_captures():
+            if capture.tail and not capture.streaming:
+                Logger.log_message(f'Full response body of {capture.label}: {capture.text()}', 'error')
 
-load_dotenv()
 
 # ===========================
 # Fixtures for Authentication
 # ===========================
+def cached_pair_of_tokens(subject_id: int) -> dict:
+    """Returns a pair of tokens for a user, reused until the access token is close to expiring."""
+    load_env()
+    from django.conf import settings
+    from core.jwt_token.token_service import JWTAuth
+
+    return TokenCache.get(
+        subject_id, SubjectType.USER.value, 'pair',
+        lambda: JWTAuth().generate_pair_of_tokens(subject=subject_id, subject_type=SubjectType.USER.value),
+        settings.ACCESS_TOKEN_EXPIRATION_TIME,
+    )
+
+
+def cached_access_token(subject_id: int) -> str:
+    """Returns a signed access token for a user, reused until it is close to expiring."""
+    load_env()
+    import jwt
+    from django.conf import settings
+
+    expiration_time = settings.ACCESS_TOKEN_EXPIRATION_TIME
+    return TokenCache.get(
+        subject_id, SubjectType.USER.value, 'access',
+        lambda: jwt.encode(
+            {'sub': subject_id, 'exp': round((datetime.now() + expiration_time).timestamp()), 'type': 'access'},
+            settings.SECRET_KEY,
+            algorithm=settings.ALGORITHM,
+        ),
+        expiration_time,
+    )
+
+
 @pytest.fixture
 def auth_client(db, user) -> MyDjangoClient:
     """Creates an instance of MyDjangoClient with authentication."""
-    token = JWTAuth().generate_pair_of_tokens(subject=user.id, subject_type=SubjectType.USER.value)
+    from qa_lib.my_django_client import MyDjangoClient
+
+    token = cached_pair_of_tokens(user.id)
     client = MyDjangoClient()
     client.client.defaults['HTTP_AUTHORIZATION'] = 'Bearer ' + token['access']
     return client
@@ -28,7 +217,9 @@ def auth_client(db, user) -> MyDjangoClient:
 @pytest.fixture
 def auth_superuser(db, superuser) -> MyDjangoClient:
     """Authenticates Django client as a superuser."""
-    token = JWTAuth().generate_pair_of_tokens(subject=superuser.id, subject_type=SubjectType.USER.value)
+    from qa_lib.my_django_client import MyDjangoClient
+
+    token = cached_pair_of_tokens(superuser.id)
     client = MyDjangoClient()
     client.client.defaults['HTTP_AUTHORIZATION'] = 'Bearer ' + token['access']
     return client
@@ -37,52 +228,158 @@ def auth_superuser(db, superuser) -> MyDjangoClient:
 @pytest.fixture
 def token_for_user(user) -> str:
     """Generates a JWT access token for a regular user."""
-    expiration_time = settings.ACCESS_TOKEN_EXPIRATION_TIME
-    return jwt.encode(
-        {'sub': user.pk, 'exp': round((datetime.now() + expiration_time).timestamp()), 'type': 'access'},
-        settings.SECRET_KEY,
-        algorithm=settings.ALGORITHM,
-    )
+    return cached_access_token(user.pk)
 
 
 @pytest.fixture
 def token_for_superuser(superuser) -> str:
     """Generates a JWT access token for a superuser."""
-    expiration_time = settings.ACCESS_TOKEN_EXPIRATION_TIME
-    return jwt.encode(
-        {'sub': superuser.pk, 'exp': round((datetime.now() + expiration_time).timestamp()), 'type': 'access'},
-        settings.SECRET_KEY,
-        algorithm=settings.ALGORITHM,
-    )
+    return cached_access_token(superuser.pk)
 
 
 @pytest.fixture
 def get_pair_of_tokens(user, client: Client) -> dict:
     """Returns tokens."""
-    return JWTAuth().generate_pair_of_tokens(subject=user.id, subject_type=SubjectType.USER.value)
+    return cached_pair_of_tokens(user.id)
+
+
+# ===========================
+# Fixtures for Live HTTP Stand
+# ===========================
+@pytest.fixture(scope='session')
+def live_client() -> MyRequestsClient:
+    """Returns a pooled keep-alive client for the live stand; closes the pool at session end."""
+    load_env()  # The client reads its LIVE_* settings on import
+    from qa_lib.my_requests_client import MyRequestsClient
+
+    yield MyRequestsClient()
+    MyRequestsClient.close()
+
+
+# ===========================
+# Session Seed Data
+# ===========================
+def seed_password() -> str:
+    return os.getenv('QA_SEED_PASSWORD', 'Seed-Password-1')
+
+
+@SeedData.register('user')
+def seed_user():
+    from django.contrib.auth import get_user_model
+
+    user_model = get_user_model()
+    lookup = {user_model.USERNAME_FIELD: 'seed-user@example.com'}
+    return user_model.objects.filter(**lookup).first() or user_model.objects.create_user(**lookup, password=seed_password())
+
+
+@SeedData.register('superuser')
+def seed_superuser():
+    from django.contrib.auth import get_user_model
+
+    user_model = get_user_model()
+    lookup = {user_model.USERNAME_FIELD: 'seed-superuser@example.com'}
+    return user_model.objects.filter(**lookup).first() or user_model.objects.create_superuser(
+        **lookup, password=seed_password()
+    )
+
+
+@SeedData.register('password_recovery_code')
+def seed_password_recovery_code():
+    recovery_code_model = project_model('UserPasswordRecoveryCode')
+    user = SeedData.get('user')
+    existing = recovery_code_model.objects.filter(user=user).first()
+    return existing or recovery_code_model.objects.create(user=user, code=recovery_code_model.create_unique_code())
+
+
+def project_model(name: str) -> type:
+    """Looks a model of the project up by class name in Django's app registry."""
+    from django.apps import apps
+
+    for model in apps.get_models():
+        if model.__name__ == name:
+            return model
+    raise LookupError(f'No installed model named {name}')
+
+
+@pytest.fixture(scope='session')
+def seed_data(django_db_setup, django_db_blocker, pytestconfig) -> type[SeedData]:
+    """
+    Builds the session seed rows on first use, once the test database (one per worker) is ready.
+    Only tests that request a seeded fixture pay for it.
+    """
+    load_env()
+    with django_db_blocker.unblock():
+        SeedData.build_all()
+    pytestconfig.stash[DB_BLOCKER_KEY] = django_db_blocker  # Seeds are rebuilt after transactional tests
+    return SeedData
+
+
+def flushes_database(item) -> bool:
+    """True for tests that run outside the rolled-back per-test transaction; the database is flushed after them."""
+    if {'transactional_db', 'live_server', 'django_db_reset_sequences'} & set(getattr(item, 'fixturenames', ())):
+        return True
+    marker = item.get_closest_marker('django_db')
+    if marker is not None and (marker.kwargs.get('transaction') or (marker.args and marker.args[0])):
+        return True
+    cls = getattr(item, 'cls', None)
+    if cls is None or 'django.test' not in sys.modules:
+        return False
+    from django.test import TestCase, TransactionTestCase
+    return issubclass(cls, TransactionTestCase) and not issubclass(cls, TestCase)
+
+
+@pytest.fixture(scope='session')
+def django_db_modify_db_settings_xdist_suffix(request) -> None:
+    """Gives every parallel worker (pytest-xdist or --shards) its own test database."""
+    from pytest_django.fixtures import _set_suffix_to_test_databases
+
+    suffix = getattr(request.config, 'workerinput', {}).get('workerid') or Logger.worker_id()
+    if suffix:
+        _set_suffix_to_test_databases(suffix)
+
+
+# `user` and `superuser` are defined here for the whole suite and replace per-test user fixtures
+# with the session seed rows: one user and one superuser, with only the username (an email) and
+# QA_SEED_PASSWORD set. A conftest closer to a test that defines its own `user` still takes precedence.
+@pytest.fixture
+def user(db, seed_data):
+    """Returns the seeded regular user (seed-user@example.com); changes are rolled back after each test."""
+    return seed_data.get('user')
+
+
+@pytest.fixture
+def superuser(db, seed_data):
+    """Returns the seeded superuser (seed-superuser@example.com); changes are rolled back after each test."""
+    return seed_data.get('superuser')
 
 
 # ==============================
 # Fixtures for Password Recovery
 # ==============================
 @pytest.fixture
-def password_recovery_code(db, user) -> UserPasswordRecoveryCode:
-    """Creates a password recovery code for a user."""
-    unique_code = UserPasswordRecoveryCode.create_unique_code()
-    return UserPasswordRecoveryCode.objects.create(user=user, code=unique_code)
+def password_recovery_code(db, user, seed_data):
+    """Returns the seeded password recovery code, or creates one if `user` is not the seeded user."""
+    if seed_data.is_seeded('user', user):
+        return seed_data.get('password_recovery_code')
+    recovery_code_model = project_model('UserPasswordRecoveryCode')
+    return recovery_code_model.objects.create(user=user, code=recovery_code_model.create_unique_code())
 
 
 # ==============================
 # Fixtures for Utility Functions
 # ==============================
-@pytest.fixture
-def n_numbered_chars() -> Callable[[int], str]:
-    """Returns a function to generate a random alphanumeric string of a given length."""
+@pytest.fixture(scope='session')
+def form_data(pytestconfig) -> FormDataFactory:
+    """Seeded factory of form payloads and strings; the seed is shown in the terminal summary."""
+    factory = FormDataFactory(salt=Logger.worker_id())
+    pytestconfig.stash[FORM_DATA_KEY] = factory
+    return factory
 
-    def internal(n: int) -> str:
-        return ''.join(random.choices(string.ascii_uppercase + string.digits, k=n))
 
-    return internal
+@pytest.fixture
+def n_numbered_chars(form_data: FormDataFactory) -> Callable[[int], str]:
+    """Returns a function to generate a random alphanumeric string of a given length."""
+    return form_data.string
 
 
 @pytest.fixture
@@ -120,25 +417,25 @@ def fill_templated_values(request) -> Union[Tuple[Any, str], Tuple[Any, str, str
 
 def universal_replace(obj: Any, request) -> Any:
     """
-    Recursively iterates over an object (dict, list, str) and replaces all strings
-    formatted as "FIX::<fixture_name>" with the corresponding fixture value.
+    Replaces all strings formatted as "FIX::<fixture_name>" inside an object (dict, list, str)
+    with the corresponding fixture value.
+
+    Payloads of `fill_templated_values` are compiled into templates at collection time and rendered
+    from them; other objects (usually built by the test itself and used once) are walked directly.
+    Either way the result is a fresh copy of the dicts and lists, so it can be mutated without
+    touching the original.
 
     Args:
         obj (Any): The object to process, which can be a dict, list, or string.
-    request: The pytest request object used to resolve fixture values.
+        request: The pytest request object used to resolve fixture values.
 
     Returns:
         Any: The processed object with all placeholders replaced by their actual values.
     """
-    match obj:
-        case dict():
-            return {k: universal_replace(v, request) for k, v in obj.items()}
-        case list():
-            return [universal_replace(item, request) for item in obj]
-        case str():
-            return resolve_placeholder(obj, request)
-        case _:
-            return obj
+    template = cached_template(obj)
+    if template is not None:
+        return template.render(request)
+    return replace_placeholders(obj, request)
 
 
 def resolve_placeholder(value: Any, request) -> Any:
@@ -153,15 +450,14 @@ def resolve_placeholder(value: Any, request) -> Any:
     Returns:
         Any: The resolved fixture value if the pattern matches, otherwise the original value.
     """
-    fixture_pattern = re.compile(r'^FIX::(\w+)(?:\((\d+)\))?$')
-
-    if isinstance(value, str) and (match := fixture_pattern.match(value)):
-        fixture_name, param = match.groups()
+    if isinstance(value, str) and (placeholder := parse_placeholder(value)):
+        return resolve_fixture(*placeholder, request)
+    return value
 
-        match fixture_name, param:
-            case 'generated_string', str(length):  # Handles dynamically generated string lengths
-                return request.getfixturevalue('generated_string')(int(length))
-            case _, None:  # Handles standard fixtures without parameters
-                return request.getfixturevalue(fixture_name)
 
-    return value
+def pytest_collection_modifyitems(items):
+    """Compiles the payload templates of all `fill_templated_values` cases at collection time."""
+    for item in items:
+        callspec = getattr(item, 'callspec', None)
+        if callspec is not None and 'fill_templated_values' in callspec.params:
+            compile_template(callspec.params['fill_templated_values'][0])
@@ -0,0 +1,129 @@
+import datetime
+import glob
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Iterator
+from qa_lib.body_capture import BodyCapture
+
+
+class ExchangeLog:
+    """
+    Structured request/response log: one JSON line per exchange.
+
+    Data files rotate by size (`exchanges_<stamp>_<n>.jsonl`). Every written line is also recorded
+    in a small tab-separated index (`exchanges_<stamp>.idx`: test id, file, offset, length), so the
+    traffic of one test can be read back with a few seeks instead of scanning the whole log.
+    """
+
+    def __init__(
+            self,
+            log_dir: str = 'logs',
+            max_body_size: int = 4096,
+            body_mode: str = 'truncate',
+            max_file_size: int = 100 * 1024 * 1024,
+            stamp: str | None = None
+    ):
+        if body_mode not in {'truncate', 'hash'}:
+            raise ValueError(f'Invalid body mode "{body_mode}". Must be "truncate" or "hash".')
+        os.makedirs(log_dir, exist_ok=True)
+        self.log_dir = log_dir
+        self.max_body_size = max_body_size
+        self.body_mode = body_mode
+        self.max_file_size = max_file_size
+        self._stamp = stamp or datetime.datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
+        self._part = 0
+        self._lock = threading.Lock()
+        self._stream = self._open_part()
+        self._index = open(os.path.join(log_dir, f'exchanges_{self._stamp}.idx'), 'a', encoding='utf-8')
+
+    def _open_part(self):
+        self._part += 1
+        self._file_name = f'exchanges_{self._stamp}_{self._part:03d}.jsonl'
+        return open(os.path.join(self.log_dir, self._file_name), 'ab')
+
+    def _cap_body(self, body: Any) -> dict[str, Any]:
+        """
+        Returns the body fields of a record. Bodies above `max_body_size` characters are cut to a head
+        ('truncate') or dropped ('hash'); the full size and sha256 are kept in both cases.
+        """
+        if body is None:
+            return {'body': None}
+        if isinstance(body, BodyCapture):
+            if body.size <= self.max_body_size:
+                if not body.tail:  # The preview holds the whole body
+                    return {'body': body.preview()}
+                if not body.streaming:
+                    return {'body': body.text()}
+            capped = {'body_size': body.size, 'body_sha256': body.sha256, 'body_truncated': True}
+            if self.body_mode == 'truncate':
+                capped['body'] = body.prefix(self.max_body_size).decode('utf-8', errors='replace')
+            return capped
+        text = body if isinstance(body, str) else json.dumps(body, ensure_ascii=False, default=str)
+        if len(text) <= self.max_body_size:
+            return {'body': body if isinstance(body, str) else json.loads(text)}
+        capped = {
+            'body_size': len(text),
+            'body_sha256': hashlib.sha256(text.encode('utf-8')).hexdigest(),
+            'body_truncated': True,
+        }
+        if self.body_mode == 'truncate':
+            capped['body'] = text[:self.max_body_size]
+        return capped
+
+    def write(
+            self,
+            test_id: str,
+            method: str,
+            url: str,
+            status_code: int | None,
+            duration: float,
+            request_body: Any = None,
+            response_body: Any = None
+    ) -> None:
+        record = {
+            'ts': datetime.datetime.now().isoformat(timespec='milliseconds'),
+            'test_id': test_id,
+            'method': method,
+            'url': url,
+            'status': status_code,
+            'duration_ms': round(duration * 1000, 3),
+            'request': self._cap_body(request_body),
+            'response': self._cap_body(response_body),
+        }
+        line = (json.dumps(record, ensure_ascii=False, default=str) + '\n').encode('utf-8')
+        with self._lock:
+            if self._stream.tell() and self._stream.tell() + len(line) > self.max_file_size:
+                self._stream.close()
+                self._stream = self._open_part()
+            offset = self._stream.tell()
+            self._stream.write(line)
+            self._index.write(f'{test_id}\t{self._file_name}\t{offset}\t{len(line)}\n')
+
+    def close(self) -> None:
+        with self._lock:
+            self._stream.close()
+            self._index.close()
+
+    @staticmethod
+    def read_test(test_id: str, log_dir: str = 'logs') -> Iterator[dict[str, Any]]:
+        """
+        Yields the exchanges of one test from every index in `log_dir`, oldest run first.
+        """
+        for index_path in sorted(glob.glob(os.path.join(log_dir, 'exchanges_*.idx'))):
+            with open(index_path, encoding='utf-8') as index:
+                entries = [line.rstrip('\n').split('\t') for line in index]
+            streams = {}
+            try:
+                for entry_test_id, file_name, offset, length in entries:
+                    if entry_test_id != test_id:
+                        continue
+                    if file_name not in streams:
+                        streams[file_name] = open(os.path.join(log_dir, file_name), 'rb')
+                    stream = streams[file_name]
+                    stream.seek(int(offset))
+                    yield json.loads(stream.read(int(length)))
+            finally:
+                for stream in streams.values():
+                    stream.close()
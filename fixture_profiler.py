@@ -0,0 +1,190 @@
+"""
+Fixture setup/teardown cost profiler.
+
+    pytest --profile-fixtures                     # top fixtures in the terminal summary
+    pytest --profile-fixtures=fixtures.json       # ... and a JSON report to track over time
+
+Times are self times: fixtures requested from inside another fixture (request.getfixturevalue)
+are not counted twice. In parallel runs (--shards, xdist) every worker writes its numbers to
+`<JSON_PATH>.<worker>` and the parent process reports the merged profile.
+"""
+import glob
+import json
+import os
+import sys
+import time
+
+import pytest
+
+from qa_lib.logger import Logger
+
+DEFAULT_WORKER_PATH = os.path.join('logs', 'fixture_profile.json')  # Worker files when no JSON_PATH is given
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('fixture profiling')
+    group.addoption('--profile-fixtures', nargs='?', const='', default=None, metavar='JSON_PATH',
+                    help='Time every fixture setup and teardown; optionally write the report to JSON_PATH.')
+    group.addoption('--profile-fixtures-top', type=int, default=15,
+                    help='Number of fixtures shown in the terminal report.')
+
+
+class _FixtureStats:
+    __slots__ = ('setups', 'setup_time', 'teardowns', 'teardown_time')
+
+    def __init__(self):
+        self.setups = 0
+        self.setup_time = 0.0
+        self.teardowns = 0
+        self.teardown_time = 0.0
+
+    @property
+    def total(self) -> float:
+        return self.setup_time + self.teardown_time
+
+
+class FixtureProfiler:
+    def __init__(self, json_path: str, top: int):
+        self.json_path = json_path
+        self.top = top
+        self.worker = Logger.worker_id()
+        self.stats: dict[tuple[str, str], _FixtureStats] = {}
+        self.phases = {'setup': 0.0, 'call': 0.0, 'teardown': 0.0}
+        self._stack: list[float] = []  # Time spent in nested fixtures, per active setup
+        self._teardown_started: dict[int, float] = {}
+
+    def _stats_for(self, fixturedef) -> _FixtureStats:
+        key = (fixturedef.argname, fixturedef.scope)
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = _FixtureStats()
+        return stats
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_fixture_setup(self, fixturedef, request):
+        self._stack.append(0.0)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            nested = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += elapsed
+            stats = self._stats_for(fixturedef)
+            stats.setups += 1
+            stats.setup_time += elapsed - nested
+            # Finalizers run in reverse order, so this one runs right before the fixture's own teardown
+            fixturedef.addfinalizer(lambda: self._teardown_started.__setitem__(id(fixturedef), time.perf_counter()))
+
+    @pytest.hookimpl
+    def pytest_fixture_post_finalizer(self, fixturedef, request):
+        started = self._teardown_started.pop(id(fixturedef), None)
+        if started is not None:
+            stats = self._stats_for(fixturedef)
+            stats.teardowns += 1
+            stats.teardown_time += time.perf_counter() - started
+
+    @pytest.hookimpl
+    def pytest_runtest_logreport(self, report):
+        if getattr(report, 'node', None) is not None:
+            return  # Report of an xdist worker; its phases come with the worker file
+        self.phases[report.when] += report.duration
+
+    def merge(self, report: dict) -> None:
+        """Adds a report of another process (see `report()`) to these numbers."""
+        for phase, duration in report['phases'].items():
+            self.phases[phase] += duration
+        for row in report['fixtures']:
+            stats = self.stats.get((row['name'], row['scope']))
+            if stats is None:
+                stats = self.stats[(row['name'], row['scope'])] = _FixtureStats()
+            stats.setups += row['setups']
+            stats.setup_time += row['setup_s']
+            stats.teardowns += row['teardowns']
+            stats.teardown_time += row['teardown_s']
+
+    def merge_worker_files(self) -> None:
+        base = self.json_path or DEFAULT_WORKER_PATH
+        for worker_path in sorted(glob.glob(glob.escape(base) + '.*')):
+            with open(worker_path, encoding='utf-8') as stream:
+                self.merge(json.load(stream))
+            os.remove(worker_path)
+
+    def write_json(self, path: str) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as stream:
+            json.dump(self.report(), stream, indent=2)
+
+    def report(self) -> dict:
+        fixtures = sorted(self.stats.items(), key=lambda item: item[1].total, reverse=True)
+        return {
+            'phases': self.phases,
+            'fixtures': [
+                {
+                    'name': name,
+                    'scope': scope,
+                    'setups': stats.setups,
+                    'setup_s': round(stats.setup_time, 6),
+                    'teardowns': stats.teardowns,
+                    'teardown_s': round(stats.teardown_time, 6),
+                    'total_s': round(stats.total, 6),
+                    'mean_setup_ms': round(stats.setup_time / stats.setups * 1000, 3) if stats.setups else 0.0,
+                }
+                for (name, scope), stats in fixtures
+            ],
+        }
+
+    def format_table(self) -> list[str]:
+        report = self.report()
+        phases = report['phases']
+        lines = [
+            f"setup {phases['setup']:.2f}s, call {phases['call']:.2f}s, teardown {phases['teardown']:.2f}s",
+            f'{"fixture":<40} {"scope":<9} {"built":>7} {"setup s":>9} {"teardown s":>11} {"mean ms":>9}',
+        ]
+        for row in report['fixtures'][:self.top]:
+            lines.append(
+                f'{row["name"]:<40} {row["scope"]:<9} {row["setups"]:>7} {row["setup_s"]:>9.3f} '
+                f'{row["teardown_s"]:>11.3f} {row["mean_setup_ms"]:>9.2f}'
+            )
+        return lines
+
+    @pytest.hookimpl
+    def pytest_sessionfinish(self, session):
+        if self.worker:  # xdist workers have no terminal summary; the parent merges this file
+            self.write_json(f'{self.json_path or DEFAULT_WORKER_PATH}.{self.worker}')
+
+    @pytest.hookimpl
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.worker:
+            self.merge_worker_files()  # xdist workers finish before their controller
+        terminalreporter.section('fixture profile')
+        for line in self.format_table():
+            terminalreporter.write_line(line)
+        if self.json_path and not self.worker:
+            self.write_json(self.json_path)
+            terminalreporter.write_line(f'Fixture profile written to {self.json_path}')
+
+
+def pytest_configure(config):
+    json_path = config.getoption('profile_fixtures')
+    if json_path is not None:
+        config.pluginmanager.register(
+            FixtureProfiler(json_path, config.getoption('profile_fixtures_top')), 'qa-fixture-profiler'
+        )
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_cmdline_main(config):
+    yield
+    json_path = config.getoption('profile_fixtures')
+    if json_path is None or not config.getoption('shards'):
+        return
+    # The shard runner does not start a session of its own, so the profile is built from the shards' files
+    profiler = FixtureProfiler(json_path, config.getoption('profile_fixtures_top'))
+    profiler.merge_worker_files()
+    sys.stdout.write(f'\n{"=" * 30} fixture profile (all shards) {"=" * 30}\n')
+    sys.stdout.write(''.join(f'{line}\n' for line in profiler.format_table()))
+    if profiler.json_path:
+        profiler.write_json(profiler.json_path)
+        sys.stdout.write(f'Fixture profile written to {profiler.json_path}\n')
@@ -0,0 +1,216 @@
+"""
+Endpoint-to-test impact index.
+
+Every request made through MyDjangoClient / MyRequestsClient is recorded as (route template, test).
+After each run the routes of the tests that ran replace their previous entries in `--impact-file`,
+so the index follows the suite incrementally. Select the tests affected by a backend change with
+
+    pytest --changed-routes /api/form/create/auth_info,/api/users/<int:pk>/
+    pytest --changed-routes @changed_routes.txt      # one route per line
+    pytest --changed-routes '/api/form/*'             # glob patterns match several routes
+
+Routes may be prefixed with a method ("POST /api/..."); the method is ignored. Tests that are not
+in the index yet (new tests, renamed tests) are always selected, and so are tests that made no
+instrumented request in their last run: their dependencies are unknown, not empty.
+"""
+import fnmatch
+import glob
+import json
+import os
+import tempfile
+
+import pytest
+from qa_lib.logger import Logger
+from qa_lib.latency_stats import route_template
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('impact selection')
+    group.addoption('--changed-routes', default=None, metavar='ROUTES',
+                    help='Run only tests that call these routes: comma-separated, or @file with one per line.')
+    group.addoption('--impact-file', default='.test_impact.json',
+                    help='Where the route-to-test index is read from and updated.')
+
+
+class ImpactIndex:
+    """Routes called by each test of the current run."""
+    _routes: dict[str, set[str]] = {}  # Test in progress -> routes
+    _called: set[str] = set()
+    _completed: dict[str, set[str]] = {}
+
+    @staticmethod
+    def record(route: str, test_id: str) -> None:
+        ImpactIndex._routes.setdefault(test_id, set()).add(route)
+
+    @staticmethod
+    def call_ran(test_id: str) -> None:
+        ImpactIndex._called.add(test_id)
+
+    @staticmethod
+    def finish_test(test_id: str) -> None:
+        """
+        Keeps the routes of a test whose call phase ran (including those called by its fixtures).
+        Skipped tests and setup errors keep their previous index entries.
+        """
+        routes = ImpactIndex._routes.pop(test_id, set())
+        if test_id in ImpactIndex._called:
+            ImpactIndex._called.discard(test_id)
+            ImpactIndex._completed[test_id] = routes
+
+    @staticmethod
+    def observed() -> dict[str, set[str]]:
+        return ImpactIndex._completed
+
+    @staticmethod
+    def reset() -> None:
+        ImpactIndex._routes.clear()
+        ImpactIndex._called.clear()
+        ImpactIndex._completed.clear()
+
+
+def load_index(path: str) -> dict[str, list[str]]:
+    """{route: [node ids]} from the index file, empty if there is none yet."""
+    try:
+        with open(path, encoding='utf-8') as stream:
+            return json.load(stream)['routes']
+    except (OSError, ValueError, KeyError):
+        return {}
+
+
+def update_index(path: str, observed: dict[str, set[str]]) -> None:
+    """
+    Replaces the entries of the tests in `observed` with their observed routes and keeps the rest.
+    Written atomically so a crashed run cannot corrupt the index.
+    """
+    routes: dict[str, set[str]] = {}
+    for route, node_ids in load_index(path).items():
+        kept = {node_id for node_id in node_ids if node_id not in observed}
+        if kept:
+            routes[route] = kept
+    for node_id, node_routes in observed.items():
+        for route in node_routes:
+            routes.setdefault(route, set()).add(node_id)
+    routed = {node_id for node_id, node_routes in observed.items() if node_routes}
+    payload = {
+        'routes': {route: sorted(node_ids) for route, node_ids in sorted(routes.items())},
+        'tests': sorted((known_tests(path) - set(observed)) | routed),
+        # Tests that ran without an instrumented request; not in 'tests', so they are always selected
+        'unrouted': sorted((unrouted_tests(path) | set(observed)) - routed),
+    }
+    directory = os.path.dirname(os.path.abspath(path))
+    with tempfile.NamedTemporaryFile('w', dir=directory, delete=False, encoding='utf-8') as stream:
+        json.dump(payload, stream, indent=1, ensure_ascii=False)
+    os.replace(stream.name, path)
+
+
+def _read_ids(path: str, key: str) -> set[str]:
+    try:
+        with open(path, encoding='utf-8') as stream:
+            return set(json.load(stream).get(key, []))
+    except (OSError, ValueError):
+        return set()
+
+
+def known_tests(path: str) -> set[str]:
+    """Tests with recorded routes; only these can be deselected."""
+    return _read_ids(path, 'tests')
+
+
+def unrouted_tests(path: str) -> set[str]:
+    return _read_ids(path, 'unrouted')
+
+
+def parse_changed_routes(value: str) -> list[str]:
+    if value.startswith('@'):
+        with open(value[1:], encoding='utf-8') as stream:
+            entries = stream.read().splitlines()
+    else:
+        entries = value.split(',')
+    routes = []
+    for entry in entries:
+        entry = entry.strip()
+        if not entry or entry.startswith('#'):
+            continue
+        if ' ' in entry:
+            entry = entry.split(None, 1)[1]  # "POST /api/..." -> "/api/..."
+        path, _, query = entry.partition('?')
+        if '=' in query:
+            entry = path  # A query string, not a "?" wildcard
+        routes.append(entry if any(c in entry for c in '*?[') else route_template(entry))
+    return routes
+
+
+def impacted_tests(index: dict[str, list[str]], changed_routes: list[str]) -> set[str]:
+    selected = set()
+    for pattern in changed_routes:
+        for route in fnmatch.filter(index, pattern) if any(c in pattern for c in '*?[') else [pattern]:
+            selected.update(index.get(route, ()))
+    return selected
+
+
+def merge_worker_files(path: str) -> None:
+    """Folds per-worker index files (`<path>.<worker>`) of a parallel run into the main index."""
+    for worker_path in sorted(glob.glob(glob.escape(path) + '.*')):
+        with open(worker_path, encoding='utf-8') as stream:
+            worker = json.load(stream)
+        observed = {node_id: set() for node_id in worker.get('tests', []) + worker.get('unrouted', [])}
+        for route, node_ids in worker.get('routes', {}).items():
+            for node_id in node_ids:
+                observed.setdefault(node_id, set()).add(route)
+        update_index(path, observed)
+        os.remove(worker_path)
+
+
+_SELECTION_KEY = pytest.StashKey[tuple]()
+
+
+@pytest.hookimpl(tryfirst=True)  # Before sharding, so shards are balanced over the selected tests only
+def pytest_collection_modifyitems(config, items):
+    value = config.getoption('changed_routes')
+    if value is None:
+        return
+    path = config.getoption('impact_file')
+    changed_routes = parse_changed_routes(value)
+    selected = impacted_tests(load_index(path), changed_routes)
+    known = known_tests(path)
+    deselected = [item for item in items if item.nodeid in known and item.nodeid not in selected]
+    config.stash[_SELECTION_KEY] = (changed_routes, len(items) - len(deselected), len(items))
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        deselected_ids = {item.nodeid for item in deselected}
+        items[:] = [item for item in items if item.nodeid not in deselected_ids]
+
+
+def pytest_runtest_logreport(report):
+    if getattr(report, 'node', None) is not None:
+        return  # Report of an xdist worker; the worker records its own tests
+    if report.when == 'call':
+        ImpactIndex.call_ran(report.nodeid)
+    elif report.when == 'teardown':
+        ImpactIndex.finish_test(report.nodeid)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    selection = config.stash.get(_SELECTION_KEY, None)
+    if selection is not None:
+        changed_routes, selected, total = selection
+        terminalreporter.write_line(
+            f'Impact selection: {selected} of {total} tests for {len(changed_routes)} changed routes'
+        )
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_sessionfinish(session):
+    path = session.config.getoption('impact_file')
+    worker = Logger.worker_id()
+    if ImpactIndex.observed():
+        update_index(f'{path}.{worker}' if worker else path, ImpactIndex.observed())  # Workers are merged later
+    if not worker:
+        merge_worker_files(path)  # xdist workers finish before their controller
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_cmdline_main(config):
+    yield
+    if config.getoption('shards'):
+        merge_worker_files(config.getoption('impact_file'))  # Shard processes write per-worker files
@@ -0,0 +1,98 @@
+import fnmatch
+import re
+from typing import Any, Iterable, List, NamedTuple
+
+
+class Difference(NamedTuple):
+    path: str
+    kind: str  # 'changed', 'missing', 'unexpected'
+    expected: Any = None
+    actual: Any = None
+
+    def __str__(self) -> str:
+        match self.kind:
+            case 'missing':
+                return f"{self.path}: missing, expected {self.expected!r}"
+            case 'unexpected':
+                return f"{self.path}: unexpected key with value {self.actual!r}"
+            case _:
+                return f"{self.path}: expected {self.expected!r}, but received {self.actual!r}"
+
+
+class IgnoreRules:
+    """
+    Compiled ignore rules.
+    - a bare name ("modified_at") ignores that key at any nesting level;
+    - a dotted path ("owner.profile.id", list items as "items.0.id") ignores exactly that node;
+    - a glob ("items.*.modified_at", "*.id") is matched against the full dotted path.
+    """
+
+    def __init__(self, rules: Iterable[str] = ()):
+        self.names = set()
+        self.paths = set()
+        globs = []
+        for rule in rules:
+            if any(ch in rule for ch in '*?['):
+                globs.append(fnmatch.translate(rule))
+            elif '.' in rule:
+                self.paths.add(rule)
+            else:
+                self.names.add(rule)
+        self.pattern = re.compile('|'.join(globs)) if globs else None
+        self.uses_paths = bool(self.paths or self.pattern)
+
+    def ignored(self, key: str, path: str) -> bool:
+        if key in self.names:
+            return True
+        if not self.uses_paths:
+            return False
+        return path in self.paths or bool(self.pattern and self.pattern.match(path))
+
+
+def diff_json(expected: Any, actual: Any, ignore: Iterable[str] | IgnoreRules = ()) -> List[Difference]:
+    """
+    Walks both JSON trees once, without copying them, and returns every difference with its dotted path.
+    Dicts are compared key by key and lists item by item; all other values are compared with ==.
+    """
+    rules = ignore if isinstance(ignore, IgnoreRules) else IgnoreRules(ignore)
+    differences: List[Difference] = []
+    _walk(expected, actual, '', rules, differences)
+    return differences
+
+
+def _child(path: str, key: Any) -> str:
+    return f'{path}.{key}' if path else str(key)
+
+
+def _walk(expected: Any, actual: Any, path: str, rules: IgnoreRules, out: List[Difference]) -> None:
+    if expected is actual:
+        return
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        for key, expected_value in expected.items():
+            child = _child(path, key)
+            if rules.ignored(key, child):
+                continue
+            if key not in actual:
+                out.append(Difference(child, 'missing', expected=expected_value))
+            else:
+                _walk(expected_value, actual[key], child, rules, out)
+        for key, actual_value in actual.items():
+            if key not in expected:
+                child = _child(path, key)
+                if not rules.ignored(key, child):
+                    out.append(Difference(child, 'unexpected', actual=actual_value))
+    elif isinstance(expected, list) and isinstance(actual, list):
+        for index, (expected_item, actual_item) in enumerate(zip(expected, actual)):
+            child = _child(path, index)
+            if not rules.ignored(str(index), child):
+                _walk(expected_item, actual_item, child, rules, out)
+        for index in range(len(actual), len(expected)):
+            child = _child(path, index)
+            if not rules.ignored(str(index), child):
+                out.append(Difference(child, 'missing', expected=expected[index]))
+        for index in range(len(expected), len(actual)):
+            child = _child(path, index)
+            if not rules.ignored(str(index), child):
+                out.append(Difference(child, 'unexpected', actual=actual[index]))
+    elif expected != actual:
+        out.append(Difference(path or '<root>', 'changed', expected, actual))
@@ -0,0 +1,189 @@
+import glob
+import heapq
+import json
+import math
+import os
+import re
+import threading
+from typing import Any
+
+
+_ID_SEGMENT = re.compile(r'/(?:\d+|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12})(?=/|$)')
+
+
+def route_template(path: str, response: Any = None) -> str:
+    """
+    Returns the route template of a request: the Django URL pattern when the response carries
+    `resolver_match`, otherwise the path without query string and with numeric/UUID segments replaced by {id}.
+    """
+    resolver_match = getattr(response, 'resolver_match', None)
+    if resolver_match is not None:
+        try:
+            if route := resolver_match.route:
+                return '/' + route.lstrip('/')
+        except Exception:  # resolver_match is lazy and may fail to resolve (e.g. 404)
+            pass
+    return _ID_SEGMENT.sub('/{id}', path.split('?', 1)[0])
+
+
+class Histogram:
+    """
+    Log-bucketed latency histogram with fixed memory: buckets grow by 5% from 10 microseconds,
+    so percentiles are accurate to about 5% whatever the number of samples.
+    """
+    MIN_VALUE = 1e-5
+    GROWTH = 1.05
+    BUCKETS = 400  # Covers 10 us .. ~3 h
+    _log_growth = math.log(GROWTH)
+
+    __slots__ = ('counts', 'count', 'total', 'max')
+
+    def __init__(self):
+        self.counts = [0] * self.BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value: float) -> None:
+        index = 0 if value <= self.MIN_VALUE else int(math.log(value / self.MIN_VALUE) / self._log_growth) + 1
+        self.counts[min(index, self.BUCKETS - 1)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, p: float) -> float:
+        """Upper bound of the bucket holding the p-th percentile, capped by the observed maximum."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(p / 100 * self.count))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                if index == self.BUCKETS - 1:  # The last bucket also holds everything above its bound
+                    return self.max
+                return min(self.MIN_VALUE * self.GROWTH ** index, self.max)
+        return self.max
+
+
+class LatencyStats:
+    """
+    Per-endpoint latency statistics collected from MyDjangoClient/MyRequestsClient during a session.
+    Keeps one Histogram per (method, route template) and the `slowest_size` slowest individual calls.
+    """
+    slowest_size = int(os.getenv('QA_LATENCY_SLOWEST', '10'))
+    _histograms: dict[tuple[str, str], Histogram] = {}
+    _slowest: list[tuple[float, str, str, str]] = []
+    _lock = threading.Lock()
+
+    @staticmethod
+    def add(method: str, route: str, duration: float, test_id: str, path: str | None = None) -> None:
+        with LatencyStats._lock:
+            key = (method, route)
+            histogram = LatencyStats._histograms.get(key)
+            if histogram is None:
+                histogram = LatencyStats._histograms[key] = Histogram()
+            histogram.add(duration)
+
+            call = (duration, method, path or route, test_id)
+            if len(LatencyStats._slowest) < LatencyStats.slowest_size:
+                heapq.heappush(LatencyStats._slowest, call)
+            elif duration > LatencyStats._slowest[0][0]:
+                heapq.heapreplace(LatencyStats._slowest, call)
+
+    @staticmethod
+    def reset() -> None:
+        with LatencyStats._lock:
+            LatencyStats._histograms.clear()
+            LatencyStats._slowest.clear()
+
+    @staticmethod
+    def summary() -> dict[str, list[dict[str, Any]]]:
+        with LatencyStats._lock:
+            endpoints = [
+                {
+                    'method': method,
+                    'route': route,
+                    'count': histogram.count,
+                    'mean_ms': histogram.total / histogram.count * 1000,
+                    'p50_ms': histogram.percentile(50) * 1000,
+                    'p95_ms': histogram.percentile(95) * 1000,
+                    'p99_ms': histogram.percentile(99) * 1000,
+                    'max_ms': histogram.max * 1000,
+                }
+                for (method, route), histogram in LatencyStats._histograms.items()
+            ]
+            slowest = [
+                {'duration_ms': duration * 1000, 'method': method, 'path': path, 'test_id': test_id}
+                for duration, method, path, test_id in sorted(LatencyStats._slowest, reverse=True)
+            ]
+        endpoints.sort(key=lambda row: row['p95_ms'], reverse=True)
+        return {'endpoints': endpoints, 'slowest': slowest}
+
+    @staticmethod
+    def format_table() -> list[str]:
+        summary = LatencyStats.summary()
+        lines = [f'{"method":<7} {"route":<50} {"count":>7} {"p50 ms":>9} {"p95 ms":>9} {"p99 ms":>9} {"max ms":>9}']
+        for row in summary['endpoints']:
+            lines.append(f'{row["method"]:<7} {row["route"]:<50} {row["count"]:>7} {row["p50_ms"]:>9.1f} '
+                         f'{row["p95_ms"]:>9.1f} {row["p99_ms"]:>9.1f} {row["max_ms"]:>9.1f}')
+        if summary['slowest']:
+            lines.append('Slowest calls:')
+            for call in summary['slowest']:
+                lines.append(f'  {call["duration_ms"]:>9.1f} ms  {call["method"]} {call["path"]}  [{call["test_id"]}]')
+        return lines
+
+    @staticmethod
+    def has_data() -> bool:
+        return bool(LatencyStats._histograms)
+
+    @staticmethod
+    def dump(path: str) -> None:
+        """Writes the raw histograms and slowest calls, to be merged by the parent of a parallel run."""
+        with LatencyStats._lock:
+            state = {
+                'histograms': [
+                    {'method': method, 'route': route, 'count': histogram.count, 'total': histogram.total,
+                     'max': histogram.max, 'counts': {index: count for index, count in enumerate(histogram.counts)
+                                                      if count}}
+                    for (method, route), histogram in LatencyStats._histograms.items()
+                ],
+                'slowest': LatencyStats._slowest,
+            }
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as stream:
+            json.dump(state, stream, ensure_ascii=False)
+
+    @staticmethod
+    def load(path: str) -> None:
+        """Adds the statistics dumped by another process to this one."""
+        with open(path, encoding='utf-8') as stream:
+            state = json.load(stream)
+        with LatencyStats._lock:
+            for row in state['histograms']:
+                key = (row['method'], row['route'])
+                histogram = LatencyStats._histograms.get(key)
+                if histogram is None:
+                    histogram = LatencyStats._histograms[key] = Histogram()
+                for index, count in row['counts'].items():
+                    histogram.counts[int(index)] += count
+                histogram.count += row['count']
+                histogram.total += row['total']
+                histogram.max = max(histogram.max, row['max'])
+            slowest = LatencyStats._slowest + [tuple(call) for call in state['slowest']]
+            LatencyStats._slowest[:] = heapq.nlargest(LatencyStats.slowest_size, slowest)
+            heapq.heapify(LatencyStats._slowest)
+
+    @staticmethod
+    def merge_worker_files(path: str) -> None:
+        """Folds the dumps of parallel workers (`<path>.<worker>`) into this process's statistics."""
+        for worker_path in sorted(glob.glob(glob.escape(path) + '.*')):
+            LatencyStats.load(worker_path)
+            os.remove(worker_path)
+
+    @staticmethod
+    def write_json(path: str) -> None:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as stream:
+            json.dump(LatencyStats.summary(), stream, ensure_ascii=False, indent=2)
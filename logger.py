@@ -1,53 +1,258 @@
+import atexit
 import datetime
 import logging
 import os
+import queue
+import threading
+import time
+from typing import Any
+from qa_lib.exchange_log import ExchangeLog
+
+
+def _request_lines(testname: str, method: str, url: str, headers: Any, data: Any) -> tuple:
+    return (
+        '----- REQUEST START -----',
+        f'Test Name: {testname}',
+        f'Request Method: {method}',
+        f'Request URL: {url}',
+        f'Request Headers: {headers}',
+        f'Request Data: {data}',
+        '----- REQUEST END -----',
+    )
+
+
+def _response_lines(testname: str, status_code: int, headers: Any, response_body: Any) -> tuple:
+    return (
+        '----- RESPONSE START -----',
+        f'Test Name: {testname}',
+        f'Response Code: {status_code}',
+        f'Response Headers: {headers}',
+        f'Response Body: {response_body}',
+        '----- RESPONSE END -----',
+    )
+
+
+class _BatchWriter(threading.Thread):
+    """
+    Фоновый поток, который забирает записи из очереди и пишет их в файл пачками.
+    Тестовый поток только кладёт запись в очередь и сразу возвращается.
+    """
+
+    def __init__(self, log_file: str, batch_size: int = 500, flush_interval: float = 0.5):
+        super().__init__(name='LoggerBatchWriter', daemon=True)
+        self.log_file = log_file
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = queue.SimpleQueue()
+        self._stop_marker = object()
+
+    def put(self, level: str, lines: tuple, formatter=None):
+        """
+        Кладёт запись в очередь. Если передан `formatter`, `lines` — его сырые аргументы,
+        а строки текста собираются здесь, в фоновом потоке, а не в тестовом.
+        """
+        self.queue.put((time.time(), level, lines, formatter))
+
+    def stop(self):
+        self.queue.put(self._stop_marker)
+        self.join()
+
+    @staticmethod
+    def _format(created: float, level: str, lines: tuple, formatter=None) -> str:
+        # Тот же формат, что и у '%(asctime)s [%(levelname)s] %(message)s'
+        if formatter is not None:
+            lines = formatter(*lines)
+        asctime = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(created)) + f',{int(created % 1 * 1000):03d}'
+        return ''.join(f'{asctime} [{level}] {line}\n' for line in lines)
+
+    def run(self):
+        with open(self.log_file, 'a', encoding='utf-8') as stream:
+            stopping = False
+            while not stopping:
+                try:
+                    batch = [self.queue.get(timeout=self.flush_interval)]
+                except queue.Empty:
+                    continue
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(self.queue.get_nowait())
+                    except queue.Empty:
+                        break
+                if self._stop_marker in batch:
+                    stopping = True
+                    batch = [item for item in batch if item is not self._stop_marker]
+                stream.write(''.join(self._format(*item) for item in batch))
+                stream.flush()
 
 
 class Logger:
     _initialized = False
+    _async = os.getenv('QA_LOG_ASYNC', '0') == '1'
+    _batch_size = 500
+    _flush_interval = 0.5
+    _writer: _BatchWriter | None = None
+    _jsonl = os.getenv('QA_LOG_JSONL', '0') == '1'
+    _exchange_log: ExchangeLog | None = None
+    _LEVELS = ('debug', 'info', 'warning', 'error', 'critical')
+    _init_lock = threading.Lock()
+    _log_file: str | None = None
+    _file_handler: logging.FileHandler | None = None
+    _current_test: tuple[str, str] | None = None  # (node id, фаза), задаётся хуками pytest в conftest
+
+    @staticmethod
+    def enable_async(batch_size: int = 500, flush_interval: float = 0.5):
+        """
+        Включает неблокирующий режим: каждый запрос/ответ — одна запись в очереди,
+        запись в файл выполняет фоновый поток. Вызывать до первого логирования
+        (или задать переменную окружения QA_LOG_ASYNC=1).
+        """
+        Logger._async = True
+        Logger._batch_size = batch_size
+        Logger._flush_interval = flush_interval
+
+    @staticmethod
+    def enable_jsonl():
+        """
+        Включает структурированный JSONL-лог обменов (или переменная окружения QA_LOG_JSONL=1).
+        Лимит тела — QA_LOG_BODY_LIMIT (символы), режим — QA_LOG_BODY_MODE (truncate/hash),
+        ротация — QA_LOG_ROTATE_MB.
+        """
+        Logger._jsonl = True
 
     @staticmethod
     def _initialize(log_dir='logs'):
-        if not Logger._initialized:
+        if Logger._initialized:
+            return
+        with Logger._init_lock:  # Первый вызов может прийти одновременно из нескольких потоков
+            if Logger._initialized:
+                return
             os.makedirs(log_dir, exist_ok=True)
-            log_file = os.path.join(log_dir, f'log_{datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")}.log')
+            stamp = Logger.run_stamp() + (f'_{Logger.worker_id()}' if Logger.worker_id() else '')
+            Logger._log_file = os.path.join(log_dir, f'log_{stamp}.log')
 
             # Настраиваем логгер вручную
             logger = logging.getLogger('CustomLogger')
             logger.setLevel(logging.DEBUG)
 
-            file_handler = logging.FileHandler(log_file, encoding='utf-8')
-            file_handler.setFormatter(logging.Formatter('%(asctime)s [%(levelname)s] %(message)s'))
-            logger.addHandler(file_handler)
+            if Logger._async:
+                Logger._writer = _BatchWriter(Logger._log_file, Logger._batch_size, Logger._flush_interval)
+                Logger._writer.start()
+            else:
+                Logger._attach_file_handler()
+
+            if Logger._jsonl:
+                Logger._exchange_log = ExchangeLog(
+                    log_dir=log_dir,
+                    stamp=stamp,
+                    max_body_size=int(os.getenv('QA_LOG_BODY_LIMIT', '4096')),
+                    body_mode=os.getenv('QA_LOG_BODY_MODE', 'truncate'),
+                    max_file_size=int(os.getenv('QA_LOG_ROTATE_MB', '100')) * 1024 * 1024,
+                )
+
+            if Logger._writer is not None or Logger._exchange_log is not None:
+                atexit.register(Logger.shutdown)
 
             Logger._initialized = True
 
+    @staticmethod
+    def _attach_file_handler():
+        if Logger._file_handler is None:
+            Logger._file_handler = logging.FileHandler(Logger._log_file, encoding='utf-8')
+            Logger._file_handler.setFormatter(logging.Formatter('%(asctime)s [%(levelname)s] %(message)s'))
+            logging.getLogger('CustomLogger').addHandler(Logger._file_handler)
+
+    @staticmethod
+    def shutdown():
+        """
+        Дописывает все записи из очереди, останавливает фоновый поток и закрывает JSONL-лог.
+        Вызывается в конце сессии. Записи после этого пишутся синхронно в тот же файл лога,
+        JSONL-лог обменов больше не пополняется.
+        """
+        with Logger._init_lock:
+            if Logger._writer is not None:
+                Logger._writer.stop()
+                Logger._writer = None
+                Logger._attach_file_handler()
+            if Logger._exchange_log is not None:
+                Logger._exchange_log.close()
+                Logger._exchange_log = None
+
+    @staticmethod
+    def run_stamp() -> str:
+        """
+        Метка времени, общая для всех файлов логов одного запуска. Параллельные шарды получают её
+        от родительского процесса (QA_LOG_STAMP), чтобы их файлы можно было потом объединить.
+        """
+        return os.getenv('QA_LOG_STAMP') or datetime.datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
+
+    @staticmethod
+    def worker_id() -> str:
+        """
+        Идентификатор параллельного воркера (шард или pytest-xdist); пустая строка, если запуск не параллельный.
+        """
+        return os.getenv('QA_WORKER_ID') or os.getenv('PYTEST_XDIST_WORKER', '')
+
+    @staticmethod
+    def set_current_test(node_id: str | None, phase: str = 'call'):
+        """
+        Запоминает текущий тест и фазу. Вызывается из runtest-хуков в conftest, чтобы логирование
+        не читало PYTEST_CURRENT_TEST из окружения при каждом вызове.
+        """
+        Logger._current_test = (node_id, phase) if node_id is not None else None
+
+    @staticmethod
+    def _test_name() -> str:
+        """Текущий тест с фазой, например 'test_api.py::test_x (call)'."""
+        if Logger._current_test is not None:
+            return f'{Logger._current_test[0]} ({Logger._current_test[1]})'
+        return os.environ.get('PYTEST_CURRENT_TEST', 'Unknown Test')
+
+    @staticmethod
+    def current_test_id() -> str:
+        """
+        Node id текущего теста без суффикса фазы (' (call)', ' (setup)').
+        """
+        if Logger._current_test is not None:
+            return Logger._current_test[0]
+        return os.environ.get('PYTEST_CURRENT_TEST', 'Unknown Test').rsplit(' (', 1)[0]
+
     @staticmethod
     def add_request(url: str, data: dict = None, headers: dict = None, method: str = 'GET'):
         Logger._initialize()  # Убедиться, что логгер инициализирован
-        logger = logging.getLogger('CustomLogger')
-        testname = os.environ.get('PYTEST_CURRENT_TEST', 'Unknown Test')
+        headers = dict(headers) if headers else headers  # Вызывающий код может изменить свой словарь позже
+        Logger._emit('INFO', (Logger._test_name(), method, url, headers, data), _request_lines)
 
-        logger.info('----- REQUEST START -----')
-        logger.info(f'Test Name: {testname}')
-        logger.info(f'Request Method: {method}')
-        logger.info(f'Request URL: {url}')
-        logger.info(f'Request Headers: {headers}')
-        logger.info(f'Request Data: {data}')
-        logger.info('----- REQUEST END -----')
+    @staticmethod
+    def add_response(status_code: int, response_body: Any = '', headers: dict = None):
+        Logger._initialize()  # Убедиться, что логгер инициализирован
+        Logger._emit('INFO', (Logger._test_name(), status_code, headers, response_body), _response_lines)
 
     @staticmethod
-    def add_response(status_code: int, response_body: str = '', headers: dict = None):
+    def add_exchange(method: str, url: str, status_code: int | None, duration: float,
+                     request_body=None, response_body=None):
+        """
+        Пишет одну строку в JSONL-лог обменов, если он включён.
+        """
         Logger._initialize()  # Убедиться, что логгер инициализирован
-        logger = logging.getLogger('CustomLogger')
-        testname = os.environ.get('PYTEST_CURRENT_TEST', 'Unknown Test')
+        if Logger._exchange_log is not None:
+            Logger._exchange_log.write(Logger.current_test_id(), method, url, status_code, duration,
+                                       request_body, response_body)
 
-        logger.info('----- RESPONSE START -----')
-        logger.info(f'Test Name: {testname}')
-        logger.info(f'Response Code: {status_code}')
-        logger.info(f'Response Headers: {headers}')
-        logger.info(f'Response Body: {response_body}')
-        logger.info('----- RESPONSE END -----')
+    @staticmethod
+    def _emit(level: str, lines: tuple, formatter=None):
+        """
+        Пишет запись. Если передан `formatter`, `lines` — его сырые аргументы: в неблокирующем режиме
+        они ставятся в очередь как есть и форматируются фоновым потоком.
+        """
+        writer = Logger._writer
+        if writer is not None:
+            writer.put(level, lines, formatter)
+            return
+        if formatter is not None:
+            lines = formatter(*lines)
+        logger = logging.getLogger('CustomLogger')
+        for line in lines:
+            logger.log(getattr(logging, level), line)
 
     @staticmethod
     def log_message(message: str, level: str = 'info'):
@@ -55,6 +260,9 @@ class Logger:
         Логирует произвольное сообщение с указанным уровнем.
         """
         Logger._initialize()  # Убедиться, что логгер инициализирован
+        if Logger._writer is not None:
+            Logger._writer.put(level.upper() if level.lower() in Logger._LEVELS else 'INFO', (message,))
+            return
         logger = logging.getLogger('CustomLogger')
         log_function = {
             'debug': logger.debug,
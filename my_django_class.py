@@ -1,8 +1,12 @@
 from django.test import Client
 from django.http import HttpResponse
-from qase.pytest import qase
 from qa_lib.logger import Logger
+from qa_lib.body_capture import BodyCapture, short_repr
+from qa_lib.testops_reporter import report_step
+from qa_lib.latency_stats import LatencyStats, route_template
+from qa_lib.impact_index import ImpactIndex
 from typing import Any
+import time
 
 
 class MyDjangoClient:
@@ -22,8 +26,9 @@ class MyDjangoClient:
         """
         if method.upper() in {'GET', 'DELETE'}:
             content_type = None
-        with qase.step(f'{method} request to URL "{path}" with data:\n{data}'):
-            return MyDjangoClient._send(method, path, data, headers, content_type)
+        data_repr = short_repr(data)  # Shared by the log and the step title
+        with report_step(lambda: f'{method} request to URL "{path}" with data:\n{data_repr}'):
+            return MyDjangoClient._send(method, path, data, headers, content_type, data_repr=data_repr)
 
     @staticmethod
     def get(path: str, data: dict[str, Any] | None = None, headers: dict[str, str] | None = None,
@@ -55,33 +60,50 @@ class MyDjangoClient:
             path: str,
             data: dict[str, Any] | None,
             headers: dict[str, str] | None,
-            content_type: str | None = None
+            content_type: str | None = None,
+            data_repr: str | None = None
     ) -> HttpResponse:
         """
         Sends an HTTP request using Django test client.
-        Logs the request and response.
+        Logs the request and response. Bodies are logged as size-bounded previews; the full body of
+        a regular response is decoded only on demand, and streaming responses are never read here.
         """
         headers = headers or {}
 
         # Log request
-        Logger.add_request(url=path, data=data, headers=headers, method=method)
+        Logger.add_request(url=path, data=short_repr(data) if data_repr is None else data_repr,
+                           headers=headers, method=method)
 
-        # Prepare request arguments
+        # Prepare request arguments; headers are passed as WSGI environ entries
         request_kwargs = {'path': path, 'data': data}
         if method in {'POST', 'PUT', 'PATCH'}:
             request_kwargs['content_type'] = content_type
+        for name, value in headers.items():
+            request_kwargs['HTTP_' + name.upper().replace('-', '_')] = value
 
         # Execute request dynamically
         try:
-            response = getattr(MyDjangoClient.client, method.lower())(**request_kwargs)
+            send = getattr(MyDjangoClient.client, method.lower())
         except AttributeError:
             raise ValueError(f'Invalid HTTP method "{method}"')
+        started = time.perf_counter()
+        response = send(**request_kwargs)
+        duration = time.perf_counter() - started
 
         # Log response
+        label = f'{method} {path} -> {response.status_code}'
+        if getattr(response, 'streaming', False) and not getattr(response, 'is_async', False):
+            response_body, response.streaming_content = BodyCapture.wrap_stream(response.streaming_content, label)
+        else:
+            response_body = BodyCapture.from_bytes(response.content, label)
         Logger.add_response(
             status_code=response.status_code,
-            response_body=response.content.decode('utf-8'),
+            response_body=response_body,
             headers=response.headers
         )
+        Logger.add_exchange(method, path, response.status_code, duration, data, response_body)
+        route, test_id = route_template(path, response), Logger.current_test_id()
+        LatencyStats.add(method, route, duration, test_id, path)
+        ImpactIndex.record(route, test_id)
 
         return response
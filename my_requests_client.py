@@ -0,0 +1,275 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
+from qa_lib.logger import Logger
+from qa_lib.body_capture import BodyCapture, short_repr
+from qa_lib.testops_reporter import report_completed_step, report_step
+from qa_lib.cassette import Cassette
+from qa_lib.rate_limiter import RateLimiter
+from qa_lib.latency_stats import LatencyStats, route_template
+from qa_lib.impact_index import ImpactIndex
+from api.api import Constants
+from typing import Any
+
+
+class MyRequestsClient:
+    """
+    Live-HTTP counterpart of MyDjangoClient.
+    All threads share one connection pool, so keep-alive connections to the stand are reused
+    instead of paying a TCP/TLS handshake per request.
+    """
+    base_url = os.getenv('LIVE_BASE_URL', Constants.URL)
+    pool_size = int(os.getenv('LIVE_POOL_SIZE', '10'))
+    keep_alive = os.getenv('LIVE_KEEP_ALIVE', '1') != '0'
+    connect_timeout = float(os.getenv('LIVE_CONNECT_TIMEOUT', '5'))
+    read_timeout = float(os.getenv('LIVE_READ_TIMEOUT', '30'))
+
+    _adapter: HTTPAdapter | None = None
+    _local = threading.local()
+    _lock = threading.Lock()
+
+    @staticmethod
+    def configure(
+            base_url: str | None = None,
+            pool_size: int | None = None,
+            keep_alive: bool | None = None,
+            connect_timeout: float | None = None,
+            read_timeout: float | None = None
+    ) -> None:
+        """
+        Overrides the settings taken from the environment. Must be called before the first request,
+        or after close(), because the pool is built lazily with the current settings.
+        """
+        if base_url is not None:
+            MyRequestsClient.base_url = base_url
+        if pool_size is not None:
+            MyRequestsClient.pool_size = pool_size
+        if keep_alive is not None:
+            MyRequestsClient.keep_alive = keep_alive
+        if connect_timeout is not None:
+            MyRequestsClient.connect_timeout = connect_timeout
+        if read_timeout is not None:
+            MyRequestsClient.read_timeout = read_timeout
+
+    @staticmethod
+    def _get_adapter() -> HTTPAdapter:
+        """
+        Returns the shared adapter. urllib3 pools are thread-safe, so one adapter serves all threads.
+        """
+        if MyRequestsClient._adapter is None:
+            with MyRequestsClient._lock:
+                if MyRequestsClient._adapter is None:
+                    MyRequestsClient._adapter = HTTPAdapter(
+                        pool_connections=MyRequestsClient.pool_size,
+                        pool_maxsize=MyRequestsClient.pool_size,
+                        pool_block=True
+                    )
+        return MyRequestsClient._adapter
+
+    @staticmethod
+    def _get_session() -> requests.Session:
+        """
+        Returns a session for the current thread. Sessions keep mutable state (cookies, headers),
+        so each thread gets its own, but all of them are mounted on the shared adapter.
+        """
+        session = getattr(MyRequestsClient._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            adapter = MyRequestsClient._get_adapter()
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            if not MyRequestsClient.keep_alive:
+                session.headers['Connection'] = 'close'
+            MyRequestsClient._local.session = session
+        return session
+
+    @staticmethod
+    def close() -> None:
+        """
+        Closes the shared connection pool. Called once at the end of the session.
+        """
+        with MyRequestsClient._lock:
+            if MyRequestsClient._adapter is not None:
+                MyRequestsClient._adapter.close()
+                MyRequestsClient._adapter = None
+            MyRequestsClient._local = threading.local()
+
+    @staticmethod
+    def request(
+            method: str,
+            path: str,
+            data: dict[str, Any] | None = None,
+            headers: dict[str, str] | None = None,
+            params: dict[str, Any] | None = None
+    ) -> requests.Response:
+        """
+        A universal method for all HTTP requests (GET, POST, PUT, PATCH, DELETE).
+        Logs the request and response.
+        """
+        data_repr = short_repr(data)  # Shared by the log and the step title
+        with report_step(lambda: f'{method} request to URL "{path}" with data:\n{data_repr}'):
+            return MyRequestsClient._send(method.upper(), path, data, headers, params, data_repr)
+
+    @staticmethod
+    def get(path: str, data: dict[str, Any] | None = None, headers: dict[str, str] | None = None,
+            params: dict[str, Any] | None = None) -> requests.Response:
+        return MyRequestsClient.request('GET', path, data, headers, params)
+
+    @staticmethod
+    def post(path: str, data: dict[str, Any] | None = None, headers: dict[str, str] | None = None,
+             params: dict[str, Any] | None = None) -> requests.Response:
+        return MyRequestsClient.request('POST', path, data, headers, params)
+
+    @staticmethod
+    def put(path: str, data: dict[str, Any] | None = None, headers: dict[str, str] | None = None,
+            params: dict[str, Any] | None = None) -> requests.Response:
+        return MyRequestsClient.request('PUT', path, data, headers, params)
+
+    @staticmethod
+    def patch(path: str, data: dict[str, Any] | None = None, headers: dict[str, str] | None = None,
+              params: dict[str, Any] | None = None) -> requests.Response:
+        return MyRequestsClient.request('PATCH', path, data, headers, params)
+
+    @staticmethod
+    def delete(path: str, headers: dict[str, str] | None = None,
+               params: dict[str, Any] | None = None) -> requests.Response:
+        return MyRequestsClient.request('DELETE', path, None, headers, params)
+
+    @staticmethod
+    def batch(calls: list[dict[str, Any] | tuple], max_workers: int | None = None) -> list[requests.Response]:
+        """
+        Sends several requests concurrently and returns the responses in the order of `calls`.
+
+        Each request is a dict with the keys of `request` (method, path, data, headers, params) or a
+        (method, path[, data[, headers[, params]]]) tuple. Requests run on a bounded thread pool
+        (`pool_size` workers by default, one per pooled connection); each worker has its own session on
+        the shared adapter, so cookies of the test thread are not sent and auth goes in `headers`.
+        The rate limiter applies as for single requests.
+
+        Every request is reported as a step with its data, status code and duration, in the order of
+        `calls`, once the batch is done. If requests fail, the others still complete and the first
+        error is raised after all steps are reported.
+        """
+        fields = ('method', 'path', 'data', 'headers', 'params')
+        specs = [dict(call) if isinstance(call, dict) else dict(zip(fields, call)) for call in calls]
+
+        def run(spec: dict[str, Any]) -> tuple[requests.Response | None, BaseException | None, float, float]:
+            started = time.time()
+            try:
+                response = MyRequestsClient._send(spec['method'].upper(), spec['path'], spec.get('data'),
+                                                  spec.get('headers'), spec.get('params'), spec['data_repr'])
+            except Exception as e:
+                return None, e, started, time.time() - started
+            return response, None, started, time.time() - started
+
+        for spec in specs:
+            spec['data_repr'] = short_repr(spec.get('data'))
+        with report_step(lambda: f'Batch of {len(specs)} requests'):
+            workers = min(max_workers or MyRequestsClient.pool_size, len(specs)) or 1
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='MyRequestsClient') as executor:
+                outcomes = list(executor.map(run, specs))
+            for spec, (response, error, started, duration) in zip(specs, outcomes):
+                result = type(error).__name__ if response is None else response.status_code
+                report_completed_step(
+                    lambda spec=spec, result=result, duration=duration:
+                    f'{spec["method"].upper()} request to URL "{spec["path"]}" with data:\n{spec["data_repr"]}\n'
+                    f'-> {result} in {duration * 1000:.0f} ms',
+                    'passed' if error is None else 'failed', started, duration
+                )
+            errors = [error for _, error, _, _ in outcomes if error is not None]
+            if errors:
+                raise errors[0]
+        return [response for response, _, _, _ in outcomes]
+
+    @staticmethod
+    def _send(
+            method: str,
+            path: str,
+            data: dict[str, Any] | None,
+            headers: dict[str, str] | None,
+            params: dict[str, Any] | None,
+            data_repr: str | None = None
+    ) -> requests.Response:
+        """
+        Sends an HTTP request through the pooled session.
+        For GET and DELETE `data` goes to the query string, otherwise it is sent as a JSON body.
+        """
+        headers = {**Constants.HEADERS, **(headers or {})}
+        url = MyRequestsClient.base_url + path
+
+        # Log request
+        Logger.add_request(url=url, data=short_repr(data) if data_repr is None else data_repr,
+                           headers=headers, method=method)
+
+        # Prepare request arguments
+        request_kwargs = {
+            'headers': headers,
+            'params': params,
+            'timeout': (MyRequestsClient.connect_timeout, MyRequestsClient.read_timeout),
+        }
+        if method in {'GET', 'DELETE'}:
+            request_kwargs['params'] = {**(params or {}), **(data or {})}
+        elif method in {'POST', 'PUT', 'PATCH'}:
+            request_kwargs['json'] = data
+        else:
+            raise ValueError(f'Invalid HTTP method "{method}"')
+
+        if Cassette.mode == 'off':
+            response, duration = MyRequestsClient._perform(method, url, request_kwargs)
+        else:
+            key = Cassette.match_key(method, path, request_kwargs['params'], request_kwargs.get('json'))
+            if Cassette.mode == 'replay':
+                started = time.perf_counter()
+                response = Cassette.replay(key, url)
+                duration = time.perf_counter() - started
+            else:
+                response, duration = MyRequestsClient._perform(method, url, request_kwargs)
+                Cassette.record(key, response)
+
+        # Log response
+        response_body = BodyCapture.from_bytes(response.content, f'{method} {path} -> {response.status_code}')
+        Logger.add_response(
+            status_code=response.status_code,
+            response_body=response_body,
+            headers=response.headers
+        )
+        Logger.add_exchange(method, url, response.status_code, duration, data, response_body)
+        route, test_id = route_template(path), Logger.current_test_id()
+        LatencyStats.add(method, route, duration, test_id, path)
+        ImpactIndex.record(route, test_id)
+
+        return response
+
+    @staticmethod
+    def _perform(method: str, url: str, request_kwargs: dict[str, Any]) -> tuple[requests.Response, float]:
+        """
+        Sends the request through the shared rate limiter. Idempotent requests are retried with
+        jittered backoff on connection errors, timeouts and 429/502/503/504 answers.
+        Returns the response and the duration of the last attempt, without waiting time.
+        """
+        base_url = MyRequestsClient.base_url
+        attempt = 0
+        while True:
+            RateLimiter.acquire(base_url)
+            started = time.perf_counter()
+            try:
+                response = MyRequestsClient._get_session().request(method, url, **request_kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if not RateLimiter.should_retry(method, attempt):
+                    raise
+                delay = RateLimiter.backoff(attempt)
+                Logger.log_message(f'{method} {url} failed ({e}); retry {attempt + 1} in {delay:.2f}s', 'warning')
+                attempt += 1
+                continue
+            duration = time.perf_counter() - started
+            RateLimiter.record_response(base_url, response.status_code)
+            if not RateLimiter.should_retry(method, attempt, response.status_code):
+                return response, duration
+            delay = RateLimiter.backoff(attempt, response.headers.get('Retry-After'))
+            Logger.log_message(
+                f'{method} {url} -> {response.status_code}; retry {attempt + 1} in {delay:.2f}s', 'warning'
+            )
+            attempt += 1
@@ -0,0 +1,113 @@
+import re
+from typing import Any, Callable
+
+
+FIXTURE_PATTERN = re.compile(r'^FIX::(\w+)(?:\((\d+)\))?$')
+
+
+def parse_placeholder(value: str) -> tuple[str, str | None] | None:
+    """
+    Returns (fixture_name, param) if the string is a resolvable "FIX::<fixture_name>(param)" placeholder.
+    Only `generated_string` accepts a parameter; other parametrized names are left as plain strings.
+    """
+    if match := FIXTURE_PATTERN.match(value):
+        fixture_name, param = match.groups()
+        if param is None or fixture_name == 'generated_string':
+            return fixture_name, param
+    return None
+
+
+def resolve_fixture(fixture_name: str, param: str | None, request) -> Any:
+    """
+    Returns the value for a parsed placeholder.
+    """
+    if param is not None:  # Handles dynamically generated string lengths
+        return request.getfixturevalue('generated_string')(int(param))
+    return request.getfixturevalue(fixture_name)  # Handles standard fixtures without parameters
+
+
+def replace_placeholders(obj: Any, request) -> Any:
+    """
+    Uncompiled rendering: walks the object once, copying dicts and lists and resolving placeholders.
+    Cheaper than compiling for objects that are rendered only once.
+    """
+    match obj:
+        case dict():
+            return {key: replace_placeholders(value, request) for key, value in obj.items()}
+        case list():
+            return [replace_placeholders(item, request) for item in obj]
+        case str():
+            if placeholder := parse_placeholder(obj):
+                return resolve_fixture(*placeholder, request)
+    return obj
+
+
+def _copy_containers(obj: Any) -> Any:
+    """Copies every dict and list of a JSON-like object; other values are immutable and shared."""
+    match obj:
+        case dict():
+            return {key: _copy_containers(value) for key, value in obj.items()}
+        case list():
+            return [_copy_containers(item) for item in obj]
+    return obj
+
+
+class PayloadTemplate:
+    """
+    A payload compiled once: the placeholder paths are found and a builder is prepared that
+    produces a fresh copy of every dict and list on each render, with the placeholders resolved.
+    The rendered payload shares no container with the original object or with other renders,
+    so a test may mutate it freely.
+    """
+    __slots__ = ('skeleton', 'placeholders', '_build')
+
+    def __init__(self, obj: Any):
+        self.skeleton = obj
+        self.placeholders: list[tuple[tuple, str, str | None]] = []
+        self._build = self._compile(obj, ())
+
+    def _compile(self, obj: Any, path: tuple) -> Callable[[Any], Any]:
+        found = len(self.placeholders)
+        match obj:
+            case dict():
+                builders = [(key, self._compile(value, path + (key,))) for key, value in obj.items()]
+                if len(self.placeholders) > found:
+                    return lambda request: {key: build(request) for key, build in builders}
+            case list():
+                builders = [self._compile(item, path + (index,)) for index, item in enumerate(obj)]
+                if len(self.placeholders) > found:
+                    return lambda request: [build(request) for build in builders]
+            case str():
+                if placeholder := parse_placeholder(obj):
+                    self.placeholders.append((path, *placeholder))
+                    return lambda request: resolve_fixture(*placeholder, request)
+                return lambda request: obj
+        return lambda request: _copy_containers(obj)  # No placeholders below: a plain copy
+
+    def render(self, request) -> Any:
+        return self._build(request)
+
+
+_compiled: dict[int, tuple[Any, PayloadTemplate]] = {}
+
+
+def compile_template(obj: Any) -> PayloadTemplate:
+    """
+    Compiles a payload and caches the template under the object's id. Meant for the long-lived
+    parametrize payloads compiled at collection time; the cache holds a reference to each object,
+    so its id cannot be reused while cached, and it is never evicted.
+    """
+    cached = cached_template(obj)
+    if cached is not None:
+        return cached
+    template = PayloadTemplate(obj)
+    _compiled[id(obj)] = (obj, template)
+    return template
+
+
+def cached_template(obj: Any) -> PayloadTemplate | None:
+    """Returns the template compiled for this very object, or None."""
+    cached = _compiled.get(id(obj))
+    if cached is not None and cached[0] is obj:
+        return cached[1]
+    return None
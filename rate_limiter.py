@@ -0,0 +1,185 @@
+import hashlib
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from typing import Any, Callable
+
+try:
+    import fcntl
+except ImportError:  # Windows: the bucket is shared by the threads of one process only
+    fcntl = None
+
+
+class RateLimiter:
+    """
+    Client-side token bucket for live-stand requests, shared by all threads and all worker processes
+    (shards, xdist) on the machine through a locked state file.
+
+    LIVE_RATE        - requests per second for the whole run, 0 (default) disables the limit;
+    LIVE_BURST       - bucket size, default one second worth of requests;
+    LIVE_RATE_STATE  - state file, default a file in the temp directory named after the stand URL.
+
+    The rate adapts: a 429/503 answer halves the current rate (down to LIVE_RATE_MIN, at most once a second),
+    and successful requests raise it back towards LIVE_RATE step by step. The adapted rate lives in the
+    state file, so one worker being throttled slows down all of them.
+
+    Retries of idempotent requests use `backoff()`: full-jitter exponential delay, at least the
+    server's Retry-After. Time spent waiting for tokens and in backoff is kept in `stats()`.
+    """
+    rate = float(os.getenv('LIVE_RATE', '0'))
+    burst = float(os.getenv('LIVE_BURST', '0')) or None
+    min_rate = float(os.getenv('LIVE_RATE_MIN', '0.5'))
+    state_file = os.getenv('LIVE_RATE_STATE')
+    max_retries = int(os.getenv('LIVE_RETRIES', '3'))
+    backoff_base = float(os.getenv('LIVE_BACKOFF_BASE', '0.5'))
+    backoff_cap = float(os.getenv('LIVE_BACKOFF_CAP', '10'))
+
+    IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'})
+    RETRY_STATUSES = frozenset({429, 502, 503, 504})
+    THROTTLE_STATUSES = frozenset({429, 503})
+    RECOVERY_STEPS = 20  # Successful requests needed to climb from the minimum back to LIVE_RATE
+    DECREASE_INTERVAL = 1.0  # Seconds; at most one halving per interval
+    STALE_AFTER = 60.0  # Seconds; older state (a previous run) starts again from LIVE_RATE
+
+    _lock = threading.Lock()
+    _stats = {'requests': 0, 'waits': 0, 'wait_time': 0.0, 'retries': 0, 'backoff_time': 0.0, 'throttled': 0}
+
+    @staticmethod
+    def enabled() -> bool:
+        return RateLimiter.rate > 0
+
+    @staticmethod
+    def configure(rate: float | None = None, burst: float | None = None, state_file: str | None = None,
+                  max_retries: int | None = None) -> None:
+        """Overrides the settings taken from the environment. Call before the first request."""
+        if rate is not None:
+            RateLimiter.rate = rate
+        if burst is not None:
+            RateLimiter.burst = burst
+        if state_file is not None:
+            RateLimiter.state_file = state_file
+        if max_retries is not None:
+            RateLimiter.max_retries = max_retries
+
+    @staticmethod
+    def _state_path(base_url: str) -> str:
+        if RateLimiter.state_file:
+            return RateLimiter.state_file
+        digest = hashlib.sha1(base_url.encode('utf-8')).hexdigest()[:12]
+        return os.path.join(tempfile.gettempdir(), f'qa_live_rate_{digest}.json')
+
+    @staticmethod
+    def _update(base_url: str, change: Callable[[dict, float], Any]) -> Any:
+        """
+        Runs `change(state, now)` on the shared state under the thread and file locks and
+        returns its result. `state` holds tokens, the current rate and the time of the last update.
+        """
+        path = RateLimiter._state_path(base_url)
+        burst = RateLimiter.burst or max(1.0, RateLimiter.rate)
+        with RateLimiter._lock, open(path, 'a+', encoding='utf-8') as stream:
+            if fcntl is not None:
+                fcntl.flock(stream, fcntl.LOCK_EX)
+            try:
+                stream.seek(0)
+                try:
+                    state = json.loads(stream.read())
+                except ValueError:
+                    state = {}
+                now = time.time()
+                if state.get('limit') != RateLimiter.rate or now - state.get('updated', 0.0) > RateLimiter.STALE_AFTER:
+                    state = {'tokens': burst, 'rate': RateLimiter.rate, 'limit': RateLimiter.rate, 'updated': now}
+                elapsed = max(0.0, now - state['updated'])
+                state['tokens'] = min(burst, state['tokens'] + elapsed * state['rate'])
+                state['updated'] = now
+                result = change(state, now)
+                stream.seek(0)
+                stream.truncate()
+                stream.write(json.dumps(state))
+                stream.flush()
+                return result
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(stream, fcntl.LOCK_UN)
+
+    @staticmethod
+    def acquire(base_url: str) -> float:
+        """
+        Takes one token, sleeping until it is available. The token is reserved before sleeping,
+        so concurrent callers queue up in order instead of polling. Returns the time waited.
+        """
+        RateLimiter._stats['requests'] += 1
+        if not RateLimiter.enabled():
+            return 0.0
+
+        def reserve(state: dict, now: float) -> float:
+            state['tokens'] -= 1
+            return -state['tokens'] / state['rate'] if state['tokens'] < 0 else 0.0
+
+        wait = RateLimiter._update(base_url, reserve)
+        if wait > 0:
+            time.sleep(wait)
+            RateLimiter._stats['waits'] += 1
+            RateLimiter._stats['wait_time'] += wait
+        return wait
+
+    @staticmethod
+    def record_response(base_url: str, status_code: int) -> None:
+        """Adapts the shared rate: halves it on throttling answers, raises it a step on success."""
+        throttled = status_code in RateLimiter.THROTTLE_STATUSES
+        if throttled:
+            RateLimiter._stats['throttled'] += 1
+        if not RateLimiter.enabled():
+            return
+
+        def adapt(state: dict, now: float) -> None:
+            if throttled:
+                state['tokens'] = min(state['tokens'], 0.0)
+                # Answers to requests sent before the last decrease do not count again
+                if now - state.get('decreased', 0.0) >= RateLimiter.DECREASE_INTERVAL:
+                    state['rate'] = max(RateLimiter.min_rate, state['rate'] / 2)
+                    state['decreased'] = now
+            elif state['rate'] < RateLimiter.rate:
+                state['rate'] = min(RateLimiter.rate, state['rate'] + RateLimiter.rate / RateLimiter.RECOVERY_STEPS)
+
+        if throttled or status_code < 400:
+            RateLimiter._update(base_url, adapt)
+
+    @staticmethod
+    def should_retry(method: str, attempt: int, status_code: int | None = None) -> bool:
+        """`status_code` is None when the request failed without an answer (connection error, timeout)."""
+        return (
+            method in RateLimiter.IDEMPOTENT_METHODS
+            and attempt < RateLimiter.max_retries
+            and (status_code is None or status_code in RateLimiter.RETRY_STATUSES)
+        )
+
+    @staticmethod
+    def backoff(attempt: int, retry_after: str | None = None) -> float:
+        """Sleeps before retry number `attempt + 1` and returns the delay."""
+        delay = random.uniform(0, min(RateLimiter.backoff_cap, RateLimiter.backoff_base * 2 ** attempt))
+        if retry_after:
+            try:
+                delay = max(delay, min(float(retry_after), RateLimiter.backoff_cap))
+            except ValueError:  # HTTP-date values are ignored; the jittered delay is used
+                pass
+        time.sleep(delay)
+        RateLimiter._stats['retries'] += 1
+        RateLimiter._stats['backoff_time'] += delay
+        return delay
+
+    @staticmethod
+    def stats() -> dict:
+        return dict(RateLimiter._stats)
+
+    @staticmethod
+    def format_summary() -> str:
+        stats = RateLimiter.stats()
+        limit = f'{RateLimiter.rate:g} req/s' if RateLimiter.enabled() else 'off'
+        return (
+            f"Live stand rate limit {limit}: {stats['requests']} requests, waited {stats['wait_time']:.2f}s "
+            f"in {stats['waits']} of them; {stats['retries']} retries ({stats['backoff_time']:.2f}s backoff), "
+            f"{stats['throttled']} throttled responses"
+        )
@@ -0,0 +1,172 @@
+import math
+from typing import Any, Callable
+
+from rest_framework import serializers
+from rest_framework.fields import empty
+
+
+def _is_plain_string(value: Any) -> bool:
+    # CharField trims whitespace and rejects blanks and NUL/surrogate characters; anything unusual falls back
+    return (
+        isinstance(value, str) and value != '' and value == value.strip() and '\x00' not in value
+        and (value.isascii() or not any('\ud800' <= ch <= '\udfff' for ch in value))
+    )
+
+
+_MAX_PLAIN_INT = 2 ** 63
+
+
+def _is_plain_int(value: Any) -> bool:
+    # Huge integers go to the field: str() and float() of them may fail there
+    return type(value) is int and -_MAX_PLAIN_INT < value < _MAX_PLAIN_INT
+
+
+def _is_finite_float(value: Any) -> bool:
+    # FloatField rejects nan and +-inf
+    return _is_plain_int(value) or (type(value) is float and math.isfinite(value))
+
+
+# Fast checks for plain JSON values. A value that passes (and passes the field's own validators)
+# is accepted by the DRF field as is; anything else goes to the field's run_validation for the verdict.
+_FAST_CHECKS: dict[type, Callable[[Any], bool]] = {
+    serializers.CharField: _is_plain_string,
+    serializers.IntegerField: _is_plain_int,
+    serializers.FloatField: _is_finite_float,
+    serializers.BooleanField: lambda value: value is True or value is False,
+    serializers.JSONField: lambda value: value is not None,
+}
+
+
+class _CompiledField:
+    __slots__ = ('name', 'field', 'required', 'allow_null', 'check', 'validators', 'nested', 'many', 'allow_empty')
+
+    def __init__(self, name: str, field: serializers.Field):
+        self.name = name
+        self.field = field
+        self.required = field.required
+        self.allow_null = field.allow_null
+        self.check: Callable[[Any], bool] | None = None
+        self.validators = list(field.validators)
+        self.nested: CompiledSchema | None = None
+        self.many = isinstance(field, serializers.ListSerializer)
+        self.allow_empty = getattr(field, 'allow_empty', True)
+
+        nested = field.child if self.many else field
+        if isinstance(nested, serializers.Serializer):
+            length_limits = self.many and (getattr(field, 'max_length', None) or getattr(field, 'min_length', None))
+            if CompiledSchema.compilable(nested) and not self.validators and not length_limits:
+                self.nested = CompiledSchema(type(nested), nested)
+        elif not any(getattr(validator, 'requires_context', False) for validator in self.validators):
+            self.check = _FAST_CHECKS.get(type(field))
+
+    def validate(self, value: Any, errors: dict) -> None:
+        if value is None and self.allow_null:
+            return
+        if self.nested is not None:
+            if self.many and isinstance(value, list) and (value or self.allow_empty):
+                nested_errors = {}
+                for index, item in enumerate(value):
+                    if item_errors := self.nested.validate(item):
+                        nested_errors[index] = item_errors
+                if nested_errors:
+                    errors[self.name] = nested_errors
+                return
+            if not self.many and isinstance(value, dict):
+                if item_errors := self.nested.validate(value):
+                    errors[self.name] = item_errors
+                return
+        elif self.check is not None and self.check(value) and self._passes_validators(value):
+            return
+        try:
+            self.field.run_validation(value)
+        except serializers.ValidationError as e:
+            errors[self.name] = e.detail
+
+    def _passes_validators(self, value: Any) -> bool:
+        try:
+            for validator in self.validators:
+                validator(value)
+        except Exception:
+            return False
+        return True
+
+
+class CompiledSchema:
+    """
+    Serializer field layout compiled once per serializer class: names, required and null flags,
+    fast type checks and nested shapes. Plain JSON items are checked in a tight loop; values the fast
+    checks cannot vouch for are validated by the DRF field itself, and serializers with object-level
+    validation (`validate`, `validate_<field>`, Meta validators) are run in full.
+    """
+    _cache: dict[type, 'CompiledSchema'] = {}
+
+    def __init__(self, serializer_class: type, instance: serializers.Serializer | None = None):
+        self.serializer_class = serializer_class
+        instance = instance if instance is not None else serializer_class()
+        self.full_serializer = not CompiledSchema.compilable(instance)
+        self.fields = [] if self.full_serializer else [
+            _CompiledField(name, field)
+            for name, field in instance.fields.items()
+            if not field.read_only
+        ]
+
+    @staticmethod
+    def for_serializer(serializer_class: type) -> 'CompiledSchema':
+        schema = CompiledSchema._cache.get(serializer_class)
+        if schema is None:
+            schema = CompiledSchema._cache[serializer_class] = CompiledSchema(serializer_class)
+        return schema
+
+    @staticmethod
+    def compilable(serializer: serializers.Serializer) -> bool:
+        serializer_class = type(serializer)
+        if serializer_class.validate is not serializers.Serializer.validate:
+            return False
+        if any(name.startswith('validate_') and not hasattr(serializers.Serializer, name)
+               for name in dir(serializer_class)):
+            return False
+        return not serializer.get_validators()
+
+    def validate(self, item: Any) -> dict | list:
+        """Returns the errors of one item in serializer.errors format (empty dict if valid)."""
+        if item is None:  # As reported for a null item of a many=True serializer
+            return ['This field may not be null.']
+        if self.full_serializer:
+            serializer = self.serializer_class(data=item)
+            return {} if serializer.is_valid() else serializer.errors
+        if not isinstance(item, dict):
+            return {'non_field_errors': [f'Invalid data. Expected a dictionary, but got {type(item).__name__}.']}
+        errors = {}
+        for compiled_field in self.fields:
+            value = item.get(compiled_field.name, empty)
+            if value is empty:
+                if compiled_field.required:
+                    errors[compiled_field.name] = ['This field is required.']
+                continue
+            compiled_field.validate(value, errors)
+        return errors
+
+
+def validate_items(items: Any, serializer_class: type, sample_size: int | None = None) -> dict:
+    """
+    Validates one object or a list of objects against a serializer and returns {index: errors}
+    for the invalid ones. With `sample_size`, only that many evenly spaced items of a list are checked,
+    the first and the last always included (a sample of one checks the first item only).
+    """
+    objects = items if isinstance(items, list) else [items]
+    indexes = range(len(objects))
+    if sample_size is not None:
+        if sample_size < 1:
+            raise ValueError(f'sample_size must be at least 1, got {sample_size}')
+        if sample_size == 1:
+            indexes = range(min(1, len(objects)))
+        elif len(objects) > sample_size:
+            step = (len(objects) - 1) / (sample_size - 1)
+            indexes = sorted({round(i * step) for i in range(sample_size)})
+
+    schema = CompiledSchema.for_serializer(serializer_class)
+    errors = {}
+    for index in indexes:
+        if item_errors := schema.validate(objects[index]):
+            errors[index] = item_errors
+    return errors
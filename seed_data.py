@@ -0,0 +1,43 @@
+from typing import Any, Callable
+
+
+class SeedData:
+    """
+    Rows built once per session (once per worker database) and shared by all tests.
+
+    Builders are registered by name and run by the `seed_data` session fixture the first time a test
+    needs a seeded row, outside any test transaction; their rows are committed, so they are part of
+    the snapshot every later test starts from. Tests run inside pytest-django's per-test transaction,
+    which rolls back to that snapshot, so fixtures only need a primary key lookup instead of new
+    inserts. Builders must be idempotent (get or create by a natural key): with --reuse-db the rows of
+    the previous run are still there. A transactional test flushes the database; conftest runs
+    `build_all()` again after it, outside any test transaction.
+    """
+    _builders: dict[str, Callable[[], Any]] = {}
+    _rows: dict[str, tuple[type, Any]] = {}
+
+    @staticmethod
+    def register(name: str) -> Callable[[Callable[[], Any]], Callable[[], Any]]:
+        """Registers a builder returning a saved model instance. Builders run in registration order."""
+        def decorator(builder: Callable[[], Any]) -> Callable[[], Any]:
+            SeedData._builders[name] = builder
+            return builder
+        return decorator
+
+    @staticmethod
+    def build_all() -> None:
+        SeedData._rows.clear()
+        for name, builder in SeedData._builders.items():
+            instance = builder()
+            SeedData._rows[name] = (type(instance), instance.pk)
+
+    @staticmethod
+    def get(name: str) -> Any:
+        """Returns a fresh instance of a seeded row."""
+        model, pk = SeedData._rows[name]
+        return model._default_manager.get(pk=pk)
+
+    @staticmethod
+    def is_seeded(name: str, instance: Any) -> bool:
+        row = SeedData._rows.get(name)
+        return row is not None and isinstance(instance, row[0]) and instance.pk == row[1]
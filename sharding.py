@@ -0,0 +1,186 @@
+"""
+Duration-aware test sharding.
+
+    pytest --shards 4             # run 4 shard processes in parallel and merge their logs
+    pytest --shard-index 1 --shard-count 4   # run a single shard (e.g. one CI job)
+
+Test durations of every run are stored in `--durations-file`. Tests are split across shards with the
+longest-processing-time rule (longest test first, always to the least loaded shard), so shards finish
+at about the same time. Tests without a recorded duration count as the median known duration.
+"""
+import heapq
+import json
+import os
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+import pytest
+from qa_lib.logger import Logger
+
+
+DEFAULT_DURATION = 1.0
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('sharding')
+    group.addoption('--shards', type=int, default=0,
+                    help='Run the suite in N parallel shard processes balanced by recorded durations.')
+    group.addoption('--shard-index', type=int, default=None, help='Run only this shard (0-based).')
+    group.addoption('--shard-count', type=int, default=None, help='Total number of shards.')
+    group.addoption('--durations-file', default='.test_durations.json',
+                    help='Where recorded test durations are read from and written to.')
+
+
+def load_durations(path: str) -> dict[str, float]:
+    try:
+        with open(path, encoding='utf-8') as stream:
+            return json.load(stream)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_durations(path: str, durations: dict[str, float]) -> None:
+    """Merges `durations` into the file; written atomically so a crashed run cannot corrupt it."""
+    stored = load_durations(path)
+    stored.update(durations)
+    directory = os.path.dirname(os.path.abspath(path))
+    with tempfile.NamedTemporaryFile('w', dir=directory, delete=False, encoding='utf-8') as stream:
+        json.dump(stored, stream, indent=0, sort_keys=True)
+    os.replace(stream.name, path)
+
+
+def split_by_duration(node_ids: list[str], durations: dict[str, float], shard_count: int) -> list[list[str]]:
+    """Longest-processing-time partition of tests into `shard_count` shards of about equal total duration."""
+    known = [durations[node_id] for node_id in node_ids if node_id in durations]
+    default = statistics.median(known) if known else DEFAULT_DURATION
+    ordered = sorted(node_ids, key=lambda node_id: (-durations.get(node_id, default), node_id))
+    shards = [[] for _ in range(shard_count)]
+    loads = [(0.0, index) for index in range(shard_count)]
+    for node_id in ordered:
+        load, index = heapq.heappop(loads)
+        shards[index].append(node_id)
+        heapq.heappush(loads, (load + durations.get(node_id, default), index))
+    return shards
+
+
+def pytest_collection_modifyitems(config, items):
+    shard_count = config.getoption('shard_count')
+    shard_index = config.getoption('shard_index')
+    if shard_count is None:
+        return
+    durations = load_durations(config.getoption('durations_file'))
+    selected = set(split_by_duration([item.nodeid for item in items], durations, shard_count)[shard_index])
+    deselected = [item for item in items if item.nodeid not in selected]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = [item for item in items if item.nodeid in selected]
+
+
+class DurationRecorder:
+    def __init__(self, path: str):
+        self.path = path
+        self.durations: dict[str, float] = {}
+
+    @pytest.hookimpl
+    def pytest_runtest_logreport(self, report):
+        self.durations[report.nodeid] = self.durations.get(report.nodeid, 0.0) + report.duration
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_sessionfinish(self, session):
+        if self.durations:
+            save_durations(self.path, self.durations)
+
+
+def validate_shard_options(config) -> None:
+    shard_count = config.getoption('shard_count')
+    shard_index = config.getoption('shard_index')
+    if (shard_count is None) != (shard_index is None):
+        raise pytest.UsageError('--shard-index and --shard-count must be given together')
+    if shard_count is not None and shard_count < 1:
+        raise pytest.UsageError(f'--shard-count must be at least 1, got {shard_count}')
+    if shard_index is not None and not 0 <= shard_index < shard_count:
+        raise pytest.UsageError(f'--shard-index must be between 0 and {shard_count - 1}, got {shard_index}')
+    if config.getoption('shards') < 0:
+        raise pytest.UsageError(f'--shards must not be negative, got {config.getoption("shards")}')
+
+
+def pytest_configure(config):
+    validate_shard_options(config)
+    if config.getoption('shards') or hasattr(config, 'workerinput'):
+        return  # The shard runner and xdist controllers record durations from their workers
+    path = config.getoption('durations_file')
+    worker = Logger.worker_id()
+    if worker:
+        path = f'{path}.{worker}'  # Merged by the parent process once all shards are done
+    config.pluginmanager.register(DurationRecorder(path), 'qa-duration-recorder')
+
+
+def _strip_shards_option(args: list[str]) -> list[str]:
+    result, skip = [], False
+    for arg in args:
+        if skip:
+            skip = False
+        elif arg == '--shards':
+            skip = True
+        elif not arg.startswith('--shards='):
+            result.append(arg)
+    return result
+
+
+def merge_worker_logs(log_dir: str, stamp: str, workers: list[str]) -> None:
+    """Concatenates the text logs and the exchange-log indexes of all shards into the run's files."""
+    for prefix, suffix in (('log', '.log'), ('exchanges', '.idx')):
+        parts = [os.path.join(log_dir, f'{prefix}_{stamp}_{worker}{suffix}') for worker in workers]
+        parts = [part for part in parts if os.path.exists(part)]
+        if not parts:
+            continue
+        with open(os.path.join(log_dir, f'{prefix}_{stamp}{suffix}'), 'ab') as merged:
+            for part in parts:
+                with open(part, 'rb') as stream:
+                    shutil.copyfileobj(stream, merged)
+                os.remove(part)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_cmdline_main(config):
+    shard_count = config.getoption('shards')
+    if not shard_count:
+        return None
+
+    stamp = Logger.run_stamp()
+    workers = [f'shard{index}' for index in range(shard_count)]
+    args = _strip_shards_option(list(config.invocation_params.args))
+    durations_file = config.getoption('durations_file')
+    os.makedirs('logs', exist_ok=True)
+    # One data seed for the whole run, so it can be repeated; shards still differ through their worker salt
+    data_seed = os.getenv('QA_DATA_SEED') or str(random.SystemRandom().randrange(2 ** 32))
+
+    processes = []
+    for index, worker in enumerate(workers):
+        env = {**os.environ, 'QA_WORKER_ID': worker, 'QA_LOG_STAMP': stamp, 'QA_DATA_SEED': data_seed}
+        output = open(os.path.join('logs', f'{worker}_{stamp}.out'), 'w+', encoding='utf-8')
+        command = [sys.executable, '-m', 'pytest', *args, '--shard-index', str(index), '--shard-count', str(shard_count)]
+        processes.append((worker, output, subprocess.Popen(command, stdout=output, stderr=subprocess.STDOUT, env=env)))
+
+    exit_codes = []
+    for worker, output, process in processes:
+        exit_codes.append(process.wait())
+        output.seek(0)
+        sys.stdout.write(f'\n{"=" * 30} {worker} {"=" * 30}\n{output.read()}')
+        output.close()
+        os.remove(output.name)
+
+    merge_worker_logs('logs', stamp, workers)
+    for worker in workers:
+        worker_durations = f'{durations_file}.{worker}'
+        if os.path.exists(worker_durations):
+            save_durations(durations_file, load_durations(worker_durations))
+            os.remove(worker_durations)
+
+    # A shard with nothing to run exits with 5 (no tests collected); that is not a failure of the run
+    failures = [code for code in exit_codes if code not in (pytest.ExitCode.OK, pytest.ExitCode.NO_TESTS_COLLECTED)]
+    return failures[0] if failures else pytest.ExitCode.OK
@@ -1,18 +1,23 @@
-import requests
-from api.api import Constants, Body
+from api.api import Constants, Body, Endpoints
 
 
 class TestForm:
-    def test_auth_indo_step(self):
-        endpoint = "/api/form/create/auth_info"
-        response = requests.post(Constants.URL + endpoint, params=Constants.PARAMS,
-                                 headers=Constants.HEADERS, json=Body.AUTH_INDO_STEP)
+    def test_auth_indo_step(self, live_client):
+        endpoint = Endpoints.AUTH_INFO
+        response = live_client.post(endpoint, Body.AUTH_INDO_STEP, params=Constants.PARAMS)
         assert response.status_code == 200, "Код статуса не 200"
         assert "Данные успешно сохранены/изменены на нулевом этапе" in response.text, "Текст ответа неверный"
 
-    def test_credit_parameters_step(self):
-        endpoint = "/api/form/create/credit_parameters_info"
-        response = requests.post(Constants.URL + endpoint, params=Constants.PARAMS,
-                                 headers=Constants.HEADERS, json=Body.CREDIT_PARAMETERS_STEP)
+    def test_credit_parameters_step(self, live_client):
+        endpoint = Endpoints.CREDIT_PARAMETERS
+        response = live_client.post(endpoint, Body.CREDIT_PARAMETERS_STEP, params=Constants.PARAMS)
+        assert response.status_code == 200, "Код статуса не 200"
+        assert "Данные успешно сохранены/изменены на первом этапе" in response.text, "Текст ответа неверный"
+
+    def test_funnel_with_generated_applicant(self, live_client, form_data):
+        auth_info, credit_parameters = form_data.funnel()
+        response = live_client.post(Endpoints.AUTH_INFO, auth_info, params=Constants.PARAMS)
+        assert response.status_code == 200, "Код статуса не 200"
+        response = live_client.post(Endpoints.CREDIT_PARAMETERS, credit_parameters, params=Constants.PARAMS)
         assert response.status_code == 200, "Код статуса не 200"
         assert "Данные успешно сохранены/изменены на первом этапе" in response.text, "Текст ответа неверный"
@@ -0,0 +1,72 @@
+import gc
+import json
+
+import pytest
+
+from qa_lib.assertions import Assertions
+
+
+class CountingResponse:
+    def __init__(self, body):
+        self.content = json.dumps(body).encode('utf-8')
+        self.parses = 0
+
+    def json(self):
+        self.parses += 1
+        return json.loads(self.content)
+
+
+class SlottedResponse:
+    """Response type without weak reference support."""
+    __slots__ = ('content',)
+
+    def __init__(self, body):
+        self.content = json.dumps(body).encode('utf-8')
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class TestParseJsonCache:
+    def test_body_is_parsed_once_per_response(self):
+        response = CountingResponse({'id': 1, 'name': 'a'})
+
+        Assertions.assert_json_has_key(response, 'id')
+        Assertions.assert_json_value_by_name(response, 'name', 'a')
+        Assertions.assert_json_has_keys(response, ['id', 'name'])
+
+        assert response.parses == 1
+
+    def test_responses_are_cached_separately(self):
+        first, second = CountingResponse({'id': 1}), CountingResponse({'id': 2})
+
+        assert Assertions._parse_json(first) == {'id': 1}
+        assert Assertions._parse_json(second) == {'id': 2}
+        assert (first.parses, second.parses) == (1, 1)
+
+    def test_parsed_data_is_returned_as_is(self):
+        data = {'id': 1}
+        assert Assertions._parse_json(data) is data
+
+    def test_entry_is_dropped_with_the_response(self):
+        response = CountingResponse({'id': 1})
+        Assertions._parse_json(response)
+        size = len(Assertions._parsed_cache)
+
+        del response
+        gc.collect()
+
+        assert len(Assertions._parsed_cache) == size - 1
+
+    def test_response_without_weak_references_is_parsed_every_time(self):
+        response = SlottedResponse({'id': 1})
+        assert Assertions._parse_json(response) == {'id': 1}
+        assert Assertions._parse_json(response) == {'id': 1}
+
+    def test_invalid_json_fails_the_test(self):
+        response = CountingResponse({})
+        response.content = b'<html>'
+        response.json = lambda: json.loads(response.content)
+
+        with pytest.raises(pytest.fail.Exception, match='not in JSON format'):
+            Assertions._parse_json(response)
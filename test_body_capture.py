@@ -0,0 +1,48 @@
+import pytest
+
+from qa_lib.body_capture import BodyCapture, short_repr
+
+
+class TestShortRepr:
+    @pytest.mark.parametrize('obj', [
+        None, 1, 2.5, True, 'text', b'bytes', (), (1,), [], {}, set(), {1}, frozenset({2}),
+        {'login': 'user@example.com', 'roles': ['admin', ('a', 1)], 'meta': {'n': None}},
+    ], ids=repr)
+    def test_small_data_is_plain_repr(self, obj):
+        assert short_repr(obj) == repr(obj)
+
+    @pytest.mark.parametrize('obj', [
+        {'results': [{'id': index, 'title': 'x' * 20} for index in range(10000)]},
+        [list(range(100))] * 1000,
+        {'file': 'x' * 10 ** 7},
+        {'nested': [[[['x' * 1000] * 10] * 10] * 10]},
+    ], ids=['records', 'rows', 'long string', 'nested'])
+    def test_large_data_is_cut_at_the_limit(self, obj):
+        text = short_repr(obj, limit=500)
+        assert text == repr(obj)[:500] + '...'
+
+    def test_escaped_characters_are_cut_at_the_limit(self):
+        obj = {'data': '\x00' * 200}
+        assert short_repr(obj, limit=100) == repr(obj)[:100] + '...'
+
+    def test_recursive_and_deep_data(self):
+        loop = []
+        loop.append(loop)
+        deep = []
+        for _ in range(200):
+            deep = [deep]
+
+        assert short_repr(loop, limit=20) == '[' * 20 + '...'
+        assert short_repr(deep, limit=1000) == '[' * 50 + '...' + ']' * 50
+
+
+class TestPrefix:
+    def test_regular_body_prefix_is_not_limited_by_preview(self, monkeypatch):
+        monkeypatch.setattr(BodyCapture, 'preview_size', 4)
+        assert BodyCapture.from_bytes(b'abcdefghijklmnop').prefix(10) == b'abcdefghij'
+
+    def test_stream_prefix_is_the_head(self, monkeypatch):
+        monkeypatch.setattr(BodyCapture, 'preview_size', 4)
+        capture, stream = BodyCapture.wrap_stream([b'abcdefgh', b'ijklmnop'])
+        list(stream)
+        assert capture.prefix(10) == b'abcd'
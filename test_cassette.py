@@ -0,0 +1,84 @@
+import requests
+
+import pytest
+
+from qa_lib.cassette import Cassette
+
+
+@pytest.fixture
+def cassette(tmp_path, monkeypatch):
+    monkeypatch.setattr(Cassette, 'mode', 'record')
+    monkeypatch.setattr(Cassette, 'directory', str(tmp_path))
+    monkeypatch.setattr(Cassette, '_exchanges', None)
+    monkeypatch.setattr(Cassette, '_recorded', set())
+    monkeypatch.setattr(Cassette, '_replay_positions', {})
+    return Cassette
+
+
+def make_response(content: bytes, status: int = 200) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response._content = content
+    response.headers['Content-Type'] = 'application/octet-stream'
+    return response
+
+
+def start_process(monkeypatch, worker: str):
+    """Resets the in-memory state as a new worker process would start."""
+    monkeypatch.setenv('QA_WORKER_ID', worker)
+    monkeypatch.delenv('PYTEST_XDIST_WORKER', raising=False)
+    monkeypatch.setattr(Cassette, '_exchanges', None)
+    monkeypatch.setattr(Cassette, '_recorded', set())
+    monkeypatch.setattr(Cassette, '_replay_positions', {})
+
+
+class TestCassette:
+    def test_workers_do_not_overwrite_each_other(self, cassette, monkeypatch):
+        for worker, path in (('shard0', '/a'), ('shard1', '/b')):
+            start_process(monkeypatch, worker)
+            cassette.record(cassette.match_key('GET', path, None, None), make_response(path.encode()))
+            cassette.save()
+
+        start_process(monkeypatch, '')
+        cassette.merge_worker_files()
+
+        for path in ('/a', '/b'):
+            response = cassette.replay(cassette.match_key('GET', path, None, None), path)
+            assert response.content == path.encode()
+
+    def test_rerecording_replaces_only_recorded_keys(self, cassette, monkeypatch):
+        start_process(monkeypatch, '')
+        cassette.record(cassette.match_key('GET', '/a', None, None), make_response(b'old a'))
+        cassette.record(cassette.match_key('GET', '/b', None, None), make_response(b'old b'))
+        cassette.save()
+
+        start_process(monkeypatch, 'shard0')
+        cassette.record(cassette.match_key('GET', '/a', None, None), make_response(b'new a'))
+        cassette.save()
+        start_process(monkeypatch, '')
+        cassette.merge_worker_files()
+
+        assert cassette.replay(cassette.match_key('GET', '/a', None, None), '/a').content == b'new a'
+        assert cassette.replay(cassette.match_key('GET', '/b', None, None), '/b').content == b'old b'
+
+    def test_binary_body_round_trips(self, cassette, monkeypatch):
+        start_process(monkeypatch, '')
+        body = bytes(range(256)) * 4
+        cassette.record(cassette.match_key('GET', '/export', None, None), make_response(body))
+        cassette.save()
+
+        start_process(monkeypatch, '')
+        assert cassette.replay(cassette.match_key('GET', '/export', None, None), '/export').content == body
+
+    def test_text_body_round_trips(self, cassette, monkeypatch):
+        start_process(monkeypatch, '')
+        cassette.record(cassette.match_key('POST', '/form', None, {'a': 1}), make_response('Данные'.encode()))
+        cassette.save()
+
+        start_process(monkeypatch, '')
+        response = cassette.replay(cassette.match_key('POST', '/form', None, {'a': 1}), '/form')
+        assert response.text == 'Данные'
+
+    def test_ignored_fields_do_not_change_the_key(self, cassette):
+        assert (cassette.match_key('POST', '/form', {'user_id': 1}, {'user_id': 1, 'a': 2})
+                == cassette.match_key('POST', '/form', {'user_id': 2}, {'user_id': 3, 'a': 2}))
@@ -0,0 +1,79 @@
+import re
+
+import pytest
+
+from api.data_factory import CREDIT_SUM_MAX, CREDIT_SUM_MIN, FormDataFactory
+
+
+def sample(factory):
+    return {
+        'phones': [factory.phone_number() for _ in range(5)],
+        'sums': [factory.credit_sum() for _ in range(5)],
+        'applicants': [factory.applicant() for _ in range(5)],
+        'strings': [factory.string(6) for _ in range(5)],
+    }
+
+
+class TestDeterminism:
+    def test_same_seed_same_values(self):
+        assert sample(FormDataFactory(seed=42)) == sample(FormDataFactory(seed=42))
+
+    @pytest.mark.parametrize('other', [
+        {'seed': 43}, {'seed': 42, 'salt': 'shard1'},
+    ], ids=['seed', 'salt'])
+    def test_seed_and_salt_change_every_pool(self, other):
+        first, second = sample(FormDataFactory(seed=42)), sample(FormDataFactory(**other))
+        assert all(first[pool] != second[pool] for pool in first)
+
+    def test_pool_sequence_does_not_depend_on_other_pools(self):
+        phones_first = FormDataFactory(seed=7)
+        phones = [phones_first.phone_number() for _ in range(3)]
+        applicants = [phones_first.applicant() for _ in range(3)]
+
+        applicants_first = FormDataFactory(seed=7)
+        applicants_first.funnels(10)
+        applicants_first.string(4)
+        late_applicants = [applicants_first.applicant() for _ in range(3)]
+
+        reordered = FormDataFactory(seed=7)
+        assert [reordered.applicant() for _ in range(3)] == applicants
+        assert [reordered.phone_number() for _ in range(3)] == phones
+        assert late_applicants != applicants  # funnels() used the first ten applicants of the same pool
+
+    def test_sequence_continues_across_blocks(self):
+        small_blocks = FormDataFactory(seed=5, block_size=3)
+        one_block = FormDataFactory(seed=5, block_size=100)
+
+        assert [small_blocks.phone_number() for _ in range(10)] == [one_block.phone_number() for _ in range(10)]
+
+    def test_seed_comes_from_environment(self, monkeypatch):
+        monkeypatch.setenv('QA_DATA_SEED', '1234')
+        assert FormDataFactory().seed == 1234
+        assert sample(FormDataFactory()) == sample(FormDataFactory(seed=1234))
+
+
+class TestValues:
+    def test_formats(self):
+        factory = FormDataFactory(seed=1)
+        for _ in range(200):
+            assert re.fullmatch(r'79\d{9}', factory.phone_number())
+            credit_sum = int(factory.credit_sum().replace(' ', ''))
+            assert CREDIT_SUM_MIN <= credit_sum <= CREDIT_SUM_MAX and credit_sum % 1000 == 0
+            assert re.fullmatch(r'[A-Z0-9]{8}', factory.string(8))
+
+    def test_funnel_steps_describe_one_applicant(self):
+        auth_info, credit_parameters = FormDataFactory(seed=3).funnel()
+
+        assert auth_info['phone_number'] == credit_parameters['phone_number']
+        assert re.fullmatch(r'\d{4}', auth_info['sms_code'])
+        assert credit_parameters['gender']['value'] in {'MALE', 'FEMALE'}
+
+    def test_payloads_do_not_share_state(self):
+        factory = FormDataFactory(seed=3)
+        _, credit_parameters = factory.funnel()
+        credit_parameters['gender']['value'] = 'CHANGED'
+        credit_parameters['credit_target']['value'] = 'CHANGED'
+
+        _, next_parameters = factory.funnel()
+        assert next_parameters['gender']['value'] in {'MALE', 'FEMALE'}
+        assert next_parameters['credit_target']['value'] != 'CHANGED'
@@ -0,0 +1,96 @@
+import glob
+import os
+
+import pytest
+
+from qa_lib.body_capture import BodyCapture
+from qa_lib.exchange_log import ExchangeLog
+
+
+def write_exchanges(log, test_ids):
+    for number, test_id in enumerate(test_ids):
+        log.write(test_id, 'POST', f'/api/items/{number}/', 200, 0.01, {'number': number}, {'id': number})
+
+
+class TestRotation:
+    def test_parts_stay_under_max_file_size(self, tmp_path):
+        log = ExchangeLog(log_dir=str(tmp_path), max_file_size=1024, stamp='run')
+        write_exchanges(log, ['t::a'] * 30)
+        log.close()
+
+        parts = sorted(glob.glob(str(tmp_path / 'exchanges_run_*.jsonl')))
+        assert len(parts) > 1
+        assert all(os.path.getsize(part) <= 1024 for part in parts)
+        assert sum(1 for part in parts for _ in open(part, encoding='utf-8')) == 30
+
+    def test_record_larger_than_limit_gets_its_own_part(self, tmp_path):
+        log = ExchangeLog(log_dir=str(tmp_path), max_file_size=10, stamp='run')
+        write_exchanges(log, ['t::a'] * 3)
+        log.close()
+
+        assert len(glob.glob(str(tmp_path / 'exchanges_run_*.jsonl'))) == 3
+
+
+class TestReadTest:
+    def test_reads_only_the_given_test_across_parts(self, tmp_path):
+        log = ExchangeLog(log_dir=str(tmp_path), max_file_size=600, stamp='run')
+        write_exchanges(log, ['t::a', 't::b', 't::a', 't::c', 't::a'] * 4)
+        log.close()
+
+        records = list(ExchangeLog.read_test('t::a', str(tmp_path)))
+        assert len(records) == 12
+        assert {record['test_id'] for record in records} == {'t::a'}
+        assert [record['request']['body']['number'] for record in records][:3] == [0, 2, 4]
+
+    def test_reads_runs_oldest_first(self, tmp_path):
+        for stamp in ('2024-01-02', '2024-01-01'):
+            log = ExchangeLog(log_dir=str(tmp_path), stamp=stamp)
+            log.write('t::a', 'GET', f'/run/{stamp}/', 200, 0.0)
+            log.close()
+
+        assert [record['url'] for record in ExchangeLog.read_test('t::a', str(tmp_path))] == [
+            '/run/2024-01-01/', '/run/2024-01-02/',
+        ]
+
+    def test_unknown_test_yields_nothing(self, tmp_path):
+        log = ExchangeLog(log_dir=str(tmp_path), stamp='run')
+        write_exchanges(log, ['t::a'])
+        log.close()
+
+        assert list(ExchangeLog.read_test('t::missing', str(tmp_path))) == []
+
+
+class TestBodyCaps:
+    def test_small_body_is_kept(self, tmp_path):
+        log = ExchangeLog(log_dir=str(tmp_path), max_body_size=100)
+        assert log._cap_body({'a': 1}) == {'body': {'a': 1}}
+        log.close()
+
+    def test_truncate_keeps_head_size_and_hash(self, tmp_path):
+        log = ExchangeLog(log_dir=str(tmp_path), max_body_size=10)
+        capped = log._cap_body('x' * 50)
+        log.close()
+
+        assert capped['body'] == 'x' * 10
+        assert capped['body_size'] == 50 and capped['body_truncated']
+        assert len(capped['body_sha256']) == 64
+
+    def test_hash_mode_drops_body(self, tmp_path):
+        log = ExchangeLog(log_dir=str(tmp_path), max_body_size=10, body_mode='hash')
+        capped = log._cap_body('x' * 50)
+        log.close()
+
+        assert 'body' not in capped and capped['body_size'] == 50
+
+    def test_invalid_body_mode(self, tmp_path):
+        with pytest.raises(ValueError):
+            ExchangeLog(log_dir=str(tmp_path), body_mode='drop')
+
+    def test_truncate_keeps_head_beyond_the_preview(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(BodyCapture, 'preview_size', 8)
+        log = ExchangeLog(log_dir=str(tmp_path), max_body_size=100)
+        capped = log._cap_body(BodyCapture.from_bytes(bytes(range(48, 58)) * 50))
+        log.close()
+
+        assert capped['body'] == '0123456789' * 10
+        assert capped['body_size'] == 500
@@ -0,0 +1,39 @@
+import json
+
+from qa_lib.fixture_profiler import FixtureProfiler
+
+
+def worker_report(setups, setup_s, phases):
+    return {
+        'phases': phases,
+        'fixtures': [{'name': 'db', 'scope': 'function', 'setups': setups, 'setup_s': setup_s,
+                      'teardowns': setups, 'teardown_s': setup_s / 2}],
+    }
+
+
+class TestWorkerFiles:
+    def test_parent_sums_worker_reports(self, tmp_path):
+        path = tmp_path / 'fixtures.json'
+        for worker, setups in (('shard0', 2), ('shard1', 3)):
+            report = worker_report(setups, setups * 0.1, {'setup': 1.0, 'call': 2.0, 'teardown': 0.5})
+            (tmp_path / f'fixtures.json.{worker}').write_text(json.dumps(report), encoding='utf-8')
+
+        profiler = FixtureProfiler(str(path), top=5)
+        profiler.merge_worker_files()
+
+        report = profiler.report()
+        assert report['phases'] == {'setup': 2.0, 'call': 4.0, 'teardown': 1.0}
+        [row] = report['fixtures']
+        assert (row['setups'], row['setup_s'], row['teardowns']) == (5, 0.5, 5)
+        assert row['mean_setup_ms'] == 100.0
+        assert [entry.name for entry in tmp_path.iterdir()] == []
+
+    def test_worker_report_round_trips(self, tmp_path):
+        worker = FixtureProfiler('', top=5)
+        worker.merge(worker_report(4, 0.2, {'setup': 0.3, 'call': 0.0, 'teardown': 0.1}))
+        worker.write_json(str(tmp_path / 'profile.json.gw0'))
+
+        parent = FixtureProfiler(str(tmp_path / 'profile.json'), top=5)
+        parent.merge_worker_files()
+
+        assert parent.report() == worker.report()
@@ -0,0 +1,93 @@
+import json
+
+from qa_lib.impact_index import (
+    impacted_tests, known_tests, load_index, merge_worker_files, parse_changed_routes, unrouted_tests, update_index,
+)
+
+
+def write(path, payload):
+    path.write_text(json.dumps(payload), encoding='utf-8')
+
+
+class TestUpdateIndex:
+    def test_new_index(self, tmp_path):
+        path = str(tmp_path / 'impact.json')
+        update_index(path, {'t1': {'/a/', '/b/'}, 't2': {'/b/'}, 't3': set()})
+
+        assert load_index(path) == {'/a/': ['t1'], '/b/': ['t1', 't2']}
+        assert known_tests(path) == {'t1', 't2'}
+        assert unrouted_tests(path) == {'t3'}
+
+    def test_observed_tests_replace_their_entries_and_others_are_kept(self, tmp_path):
+        path = str(tmp_path / 'impact.json')
+        update_index(path, {'t1': {'/a/'}, 't2': {'/a/', '/b/'}, 't3': set()})
+        update_index(path, {'t2': {'/c/'}, 't3': {'/a/'}})
+
+        assert load_index(path) == {'/a/': ['t1', 't3'], '/c/': ['t2']}
+        assert known_tests(path) == {'t1', 't2', 't3'}
+        assert unrouted_tests(path) == set()
+
+    def test_test_that_stopped_calling_routes_becomes_unrouted(self, tmp_path):
+        path = str(tmp_path / 'impact.json')
+        update_index(path, {'t1': {'/a/'}})
+        update_index(path, {'t1': set()})
+
+        assert load_index(path) == {}
+        assert known_tests(path) == set()
+        assert unrouted_tests(path) == {'t1'}
+
+    def test_missing_or_broken_file_is_empty(self, tmp_path):
+        broken = tmp_path / 'broken.json'
+        broken.write_text('{', encoding='utf-8')
+
+        for path in (str(tmp_path / 'missing.json'), str(broken)):
+            assert load_index(path) == {}
+            assert known_tests(path) == set()
+            assert unrouted_tests(path) == set()
+
+
+class TestMergeWorkerFiles:
+    def test_worker_files_are_folded_in_and_removed(self, tmp_path):
+        path = tmp_path / 'impact.json'
+        update_index(str(path), {'t1': {'/a/'}, 't2': {'/b/'}, 't3': {'/c/'}})
+        write(tmp_path / 'impact.json.gw0', {'routes': {'/x/': ['t1']}, 'tests': ['t1'], 'unrouted': []})
+        write(tmp_path / 'impact.json.gw1', {'routes': {'/x/': ['t4'], '/y/': ['t4']}, 'tests': ['t4'],
+                                             'unrouted': ['t2']})
+
+        merge_worker_files(str(path))
+
+        assert load_index(str(path)) == {'/c/': ['t3'], '/x/': ['t1', 't4'], '/y/': ['t4']}
+        assert known_tests(str(path)) == {'t1', 't3', 't4'}
+        assert unrouted_tests(str(path)) == {'t2'}
+        assert sorted(item.name for item in tmp_path.iterdir()) == ['impact.json']
+
+    def test_without_worker_files_nothing_is_written(self, tmp_path):
+        merge_worker_files(str(tmp_path / 'impact.json'))
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestSelection:
+    index = {
+        '/api/form/create/auth_info': ['t_auth', 't_funnel'],
+        '/api/form/create/credit_parameters': ['t_funnel'],
+        '/api/users/{id}/': ['t_users'],
+    }
+
+    def test_exact_routes(self):
+        assert impacted_tests(self.index, ['/api/form/create/auth_info']) == {'t_auth', 't_funnel'}
+        assert impacted_tests(self.index, ['/api/unknown/']) == set()
+
+    def test_glob_patterns(self):
+        assert impacted_tests(self.index, ['/api/form/*']) == {'t_auth', 't_funnel'}
+        assert impacted_tests(self.index, ['/api/users/*', '/api/form/create/credit_?arameters']) == {
+            't_users', 't_funnel'}
+
+    def test_parse_comma_separated_routes(self):
+        assert parse_changed_routes(' POST /api/users/5/, /api/form/*,, GET /api/items/?page=2') == [
+            '/api/users/{id}/', '/api/form/*', '/api/items/']
+
+    def test_parse_routes_file(self, tmp_path):
+        routes = tmp_path / 'changed_routes.txt'
+        routes.write_text('# changed in this branch\n/api/users/5/\n\nDELETE /api/form/*\n', encoding='utf-8')
+
+        assert parse_changed_routes(f'@{routes}') == ['/api/users/{id}/', '/api/form/*']
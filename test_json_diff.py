@@ -0,0 +1,29 @@
+from qa_lib.json_diff import diff_json
+
+
+class TestListIgnoreRules:
+    def test_dotted_path_ignores_list_item(self):
+        assert diff_json({'items': [1, 2]}, {'items': [1, 3]}, ['items.1']) == []
+
+    def test_dotted_path_ignores_only_that_item(self):
+        differences = diff_json({'items': [1, 2, 3]}, {'items': [0, 2, 4]}, ['items.2'])
+        assert [str(d) for d in differences] == ['items.0: expected 1, but received 0']
+
+    def test_bare_name_ignores_index_at_any_level(self):
+        expected = {'items': [1, 2], 'nested': {'values': ['a', 'b']}}
+        actual = {'items': [1, 3], 'nested': {'values': ['a', 'c']}}
+        assert diff_json(expected, actual, ['1']) == []
+
+    def test_bare_name_ignores_key_inside_list_items(self):
+        expected = {'items': [{'id': 1, 'modified_at': 'x'}, {'id': 2, 'modified_at': 'y'}]}
+        actual = {'items': [{'id': 1, 'modified_at': 'z'}, {'id': 2, 'modified_at': 'w'}]}
+        assert diff_json(expected, actual, ['modified_at']) == []
+
+    def test_glob_ignores_field_of_every_item(self):
+        expected = {'items': [{'id': 1, 'title': 'a'}, {'id': 2, 'title': 'b'}]}
+        actual = {'items': [{'id': 1, 'title': 'c'}, {'id': 3, 'title': 'd'}]}
+        differences = diff_json(expected, actual, ['items.*.title'])
+        assert [d.path for d in differences] == ['items.1.id']
+
+    def test_glob_ignores_whole_items(self):
+        assert diff_json({'items': [[1], [2]]}, {'items': [[5], [6]]}, ['items.*']) == []
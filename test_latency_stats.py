@@ -0,0 +1,98 @@
+import math
+import random
+
+import pytest
+
+from qa_lib.latency_stats import Histogram, LatencyStats, route_template
+
+
+def exact_percentile(values, p):
+    ordered = sorted(values)
+    return ordered[max(1, math.ceil(p / 100 * len(ordered))) - 1]
+
+
+def histogram_of(values):
+    histogram = Histogram()
+    for value in values:
+        histogram.add(value)
+    return histogram
+
+
+class TestHistogramPercentile:
+    @pytest.mark.parametrize('p', [1, 50, 90, 95, 99, 99.9])
+    def test_within_one_bucket_above_exact(self, p):
+        rng = random.Random(p)
+        values = [rng.lognormvariate(-4, 1.5) for _ in range(5000)]
+        exact = exact_percentile(values, p)
+
+        estimate = histogram_of(values).percentile(p)
+
+        assert exact <= estimate <= exact * Histogram.GROWTH
+
+    def test_empty(self):
+        assert Histogram().percentile(50) == 0.0
+
+    def test_single_value_is_capped_by_max(self):
+        assert histogram_of([0.123]).percentile(50) == 0.123
+
+    def test_hundredth_percentile_is_max(self):
+        values = [0.001, 0.002, 0.5]
+        assert histogram_of(values).percentile(100) == 0.5
+
+    def test_values_below_first_bucket(self):
+        histogram = histogram_of([1e-7, 2e-7])
+        assert histogram.percentile(50) <= Histogram.MIN_VALUE
+
+    def test_values_above_last_bucket_report_max(self):
+        histogram = histogram_of([1e6])
+        assert histogram.count == 1 and histogram.percentile(99) == 1e6
+
+
+class TestLatencyStats:
+    @pytest.fixture(autouse=True)
+    def empty_stats(self):
+        LatencyStats.reset()
+        yield
+        LatencyStats.reset()
+
+    def test_summary_per_endpoint_and_slowest_calls(self, monkeypatch):
+        monkeypatch.setattr(LatencyStats, 'slowest_size', 2)
+        for duration in (0.01, 0.02, 0.03):
+            LatencyStats.add('GET', '/api/items/{id}', duration, 't::a', f'/api/items/{int(duration * 100)}')
+        LatencyStats.add('POST', '/api/items/', 0.5, 't::b')
+
+        summary = LatencyStats.summary()
+
+        assert [(row['method'], row['count']) for row in summary['endpoints']] == [('POST', 1), ('GET', 3)]
+        assert [call['duration_ms'] for call in summary['slowest']] == pytest.approx([500, 30])
+        assert summary['slowest'][1]['path'] == '/api/items/3'
+
+    def test_worker_dumps_merge_into_one_summary(self, tmp_path):
+        rng = random.Random(3)
+        samples = [[rng.lognormvariate(-4, 1) for _ in range(300)] for _ in range(3)]
+        for worker, durations in enumerate(samples):
+            for duration in durations:
+                LatencyStats.add('GET', '/api/items/{id}', duration, f't::{worker}')
+            LatencyStats.dump(str(tmp_path / f'latency.json.shard{worker}'))
+            LatencyStats.reset()
+
+        LatencyStats.merge_worker_files(str(tmp_path / 'latency.json'))
+
+        combined = histogram_of(value for durations in samples for value in durations)
+        [row] = LatencyStats.summary()['endpoints']
+        assert row['count'] == 900 and row['p95_ms'] == combined.percentile(95) * 1000
+        assert [call['duration_ms'] for call in LatencyStats.summary()['slowest']] == pytest.approx(
+            sorted((value * 1000 for durations in samples for value in durations), reverse=True)[:10])
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestRouteTemplate:
+    @pytest.mark.parametrize('path, route', [
+        ('/api/users/42/', '/api/users/{id}/'),
+        ('/api/users/42/orders/7', '/api/users/{id}/orders/{id}'),
+        ('/api/files/0f8fad5b-d9cb-469f-a165-70867728950e/', '/api/files/{id}/'),
+        ('/api/form/create/auth_info?user_id=5', '/api/form/create/auth_info'),
+        ('/api/v2/items/', '/api/v2/items/'),
+    ])
+    def test_ids_are_replaced(self, path, route):
+        assert route_template(path) == route
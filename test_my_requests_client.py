@@ -0,0 +1,74 @@
+import threading
+import time
+
+import pytest
+from django.http import JsonResponse
+from django.urls import path
+
+from qa_lib.logger import Logger
+from qa_lib.my_requests_client import MyRequestsClient
+from qa_lib.testops_reporter import TestOpsReporter
+
+
+class InFlight:
+    lock = threading.Lock()
+    current = 0
+    peak = 0
+
+
+def slow_echo(request, number, status=200):
+    """Answers after a pause and keeps track of how many requests are served at once."""
+    with InFlight.lock:
+        InFlight.current += 1
+        InFlight.peak = max(InFlight.peak, InFlight.current)
+    time.sleep(0.2)
+    with InFlight.lock:
+        InFlight.current -= 1
+    return JsonResponse({'number': number}, status=status)
+
+
+urlpatterns = [path('echo/<int:number>/', slow_echo), path('error/<int:number>/', slow_echo, {'status': 500})]
+
+
+def recorded_steps():
+    return TestOpsReporter._steps.get(Logger.current_test_id(), [])
+
+
+@pytest.fixture
+def batch_client(live_server, monkeypatch):
+    monkeypatch.setattr(TestOpsReporter, 'mode', 'file')
+    monkeypatch.setattr(TestOpsReporter, '_steps', {})
+    InFlight.peak = 0
+    MyRequestsClient.close()
+    MyRequestsClient.configure(base_url=live_server.url)
+    yield MyRequestsClient
+    MyRequestsClient.close()
+
+
+@pytest.mark.urls(__name__)
+class TestBatch:
+    def test_requests_run_concurrently(self, batch_client):
+        started = time.perf_counter()
+        responses = batch_client.batch([('GET', f'/echo/{number}/') for number in range(8)], max_workers=8)
+        elapsed = time.perf_counter() - started
+
+        assert [response.json()['number'] for response in responses] == list(range(8))
+        assert InFlight.peak > 1
+        assert elapsed < 8 * 0.2 / 2
+
+    def test_every_request_is_a_step(self, batch_client):
+        batch_client.batch([('POST', '/echo/1/', {'a': 1}), {'method': 'get', 'path': '/error/2/'}])
+
+        steps = [(title(), status) for title, status, _, _ in recorded_steps()]
+        assert [status for _, status in steps] == ['passed', 'passed', 'passed']
+        assert steps[0][0].startswith('POST request to URL "/echo/1/" with data:\n{\'a\': 1}\n-> 200 in ')
+        assert steps[1][0].startswith('GET request to URL "/error/2/" with data:\nNone\n-> 500 in ')
+        assert steps[2][0] == 'Batch of 2 requests'
+
+    def test_failed_request_is_raised_after_the_others(self, batch_client):
+        calls = [('GET', '/echo/1/'), ('TRACE', '/echo/2/'), ('GET', '/echo/3/')]
+
+        with pytest.raises(ValueError, match='Invalid HTTP method'):
+            batch_client.batch(calls)
+
+        assert [status for _, status, _, _ in recorded_steps()] == ['passed', 'failed', 'passed', 'failed']
@@ -0,0 +1,67 @@
+import copy
+
+from qa_lib import payload_template
+from qa_lib.payload_template import cached_template, compile_template
+
+
+class _Request:
+    values = {'generated_string': lambda n: 'X' * n, 'owner_email': 'owner@example.com'}
+
+    def getfixturevalue(self, name):
+        return self.values[name]
+
+
+class TestRenderReturnsFreshContainers:
+    def test_payload_without_placeholders_is_a_copy(self):
+        payload = {'owner': {'tags': ['a']}, 'items': [{'id': 1}]}
+        original = copy.deepcopy(payload)
+
+        rendered = compile_template(payload).render(_Request())
+        rendered['owner']['tags'].append('b')
+        rendered['items'][0]['id'] = 2
+
+        assert payload == original
+        assert compile_template(payload).render(_Request()) == original
+
+    def test_untouched_subtrees_are_not_shared(self):
+        payload = {'email': 'FIX::owner_email', 'title': 'FIX::generated_string(3)', 'meta': {'tags': ['a']}}
+        original = copy.deepcopy(payload)
+
+        rendered = compile_template(payload).render(_Request())
+        assert rendered == {'email': 'owner@example.com', 'title': 'XXX', 'meta': {'tags': ['a']}}
+        rendered['meta']['tags'].append('b')
+
+        assert payload == original
+        assert compile_template(payload).render(_Request())['meta'] == {'tags': ['a']}
+
+    def test_renders_do_not_share_containers(self):
+        payload = [{'email': 'FIX::owner_email', 'roles': ['admin']}]
+        template = compile_template(payload)
+
+        first, second = template.render(_Request()), template.render(_Request())
+        first[0]['roles'].clear()
+
+        assert second == [{'email': 'owner@example.com', 'roles': ['admin']}]
+
+
+class TestTemplateCache:
+    def test_universal_replace_does_not_cache_one_off_objects(self):
+        from conftest import universal_replace
+
+        size = len(payload_template._compiled)
+        for _ in range(5):
+            payload = {'email': 'FIX::owner_email', 'tags': ['a']}
+            assert universal_replace(payload, _Request()) == {'email': 'owner@example.com', 'tags': ['a']}
+            assert universal_replace(payload, _Request()) is not payload
+
+        assert len(payload_template._compiled) == size
+
+    def test_compiled_payload_is_rendered_from_its_template(self):
+        from conftest import universal_replace
+
+        payload = {'title': 'FIX::generated_string(2)'}
+        template = compile_template(payload)
+
+        assert cached_template(payload) is template
+        assert cached_template(dict(payload)) is None
+        assert universal_replace(payload, _Request()) == {'title': 'XX'}
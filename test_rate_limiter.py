@@ -0,0 +1,147 @@
+import json
+
+import pytest
+
+from qa_lib import rate_limiter
+from qa_lib.rate_limiter import RateLimiter
+
+URL = 'https://stand.example.com'
+
+
+class FakeTime:
+    """Replaces the time module of rate_limiter: sleeping is recorded, the clock moves only on `advance()`."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(tmp_path, monkeypatch):
+    fake = FakeTime()
+    monkeypatch.setattr(rate_limiter, 'time', fake)
+    monkeypatch.setattr(RateLimiter, 'state_file', str(tmp_path / 'rate.json'))
+    monkeypatch.setattr(RateLimiter, 'rate', 8.0)
+    monkeypatch.setattr(RateLimiter, 'burst', 3.0)
+    monkeypatch.setattr(RateLimiter, 'min_rate', 1.0)
+    monkeypatch.setattr(RateLimiter, 'max_retries', 3)
+    monkeypatch.setattr(RateLimiter, 'backoff_base', 0.5)
+    monkeypatch.setattr(RateLimiter, 'backoff_cap', 10.0)
+    monkeypatch.setattr(RateLimiter, '_stats', dict.fromkeys(RateLimiter._stats, 0))
+    return fake
+
+
+def shared_rate():
+    with open(RateLimiter.state_file, encoding='utf-8') as stream:
+        return json.load(stream)['rate']
+
+
+class TestAcquire:
+    def test_disabled_limiter_never_waits(self, clock, monkeypatch):
+        monkeypatch.setattr(RateLimiter, 'rate', 0.0)
+
+        assert [RateLimiter.acquire(URL) for _ in range(10)] == [0.0] * 10
+        assert clock.sleeps == []
+        assert RateLimiter.stats()['requests'] == 10
+
+    def test_callers_queue_up_once_the_burst_is_spent(self, clock):
+        waits = [RateLimiter.acquire(URL) for _ in range(5)]
+
+        assert waits == pytest.approx([0, 0, 0, 1 / 8, 2 / 8])
+        assert clock.sleeps == pytest.approx([1 / 8, 2 / 8])
+        assert RateLimiter.stats()['waits'] == 2
+
+    def test_tokens_refill_up_to_the_burst(self, clock):
+        for _ in range(3):
+            RateLimiter.acquire(URL)
+        clock.advance(10)
+
+        assert [RateLimiter.acquire(URL) for _ in range(4)] == pytest.approx([0, 0, 0, 1 / 8])
+
+
+class TestAdaptiveRate:
+    def test_throttling_halves_the_rate_once_per_interval_down_to_the_minimum(self, clock):
+        RateLimiter.acquire(URL)
+        rates = []
+        for _ in range(5):
+            RateLimiter.record_response(URL, 429)
+            RateLimiter.record_response(URL, 503)  # Answer to a request sent before the decrease
+            rates.append(shared_rate())
+            clock.advance(RateLimiter.DECREASE_INTERVAL)
+
+        assert rates == [4.0, 2.0, 1.0, 1.0, 1.0]
+        assert RateLimiter.stats()['throttled'] == 10
+
+    def test_throttling_empties_the_bucket(self, clock):
+        RateLimiter.acquire(URL)
+        RateLimiter.record_response(URL, 429)
+
+        assert RateLimiter.acquire(URL) == pytest.approx(1 / 4)
+
+    def test_successes_climb_back_to_the_configured_rate(self, clock):
+        RateLimiter.acquire(URL)
+        RateLimiter.record_response(URL, 429)
+        RateLimiter.record_response(URL, 404)  # Client errors say nothing about the stand's load
+        assert shared_rate() == 4.0
+
+        rates = []
+        for _ in range(12):
+            RateLimiter.record_response(URL, 200)
+            rates.append(shared_rate())
+
+        step = 8.0 / RateLimiter.RECOVERY_STEPS
+        assert rates[:9] == pytest.approx([4.0 + step * count for count in range(1, 10)])
+        assert rates[9:] == [8.0, 8.0, 8.0]
+
+    def test_stale_state_starts_again_from_the_configured_rate(self, clock):
+        RateLimiter.acquire(URL)
+        RateLimiter.record_response(URL, 429)
+        clock.advance(RateLimiter.STALE_AFTER + 1)
+        RateLimiter.acquire(URL)
+
+        assert shared_rate() == 8.0
+
+
+class TestRetries:
+    @pytest.mark.parametrize('method, attempt, status_code, expected', [
+        ('GET', 0, None, True),
+        ('GET', 0, 429, True),
+        ('PUT', 2, 503, True),
+        ('DELETE', 0, 504, True),
+        ('GET', 3, 503, False),
+        ('GET', 0, 500, False),
+        ('GET', 0, 404, False),
+        ('POST', 0, 503, False),
+        ('PATCH', 0, None, False),
+    ])
+    def test_should_retry(self, clock, method, attempt, status_code, expected):
+        assert RateLimiter.should_retry(method, attempt, status_code) is expected
+
+    @pytest.mark.parametrize('attempt, retry_after, expected', [
+        (0, None, 0.5),
+        (3, None, 4.0),
+        (10, None, 10.0),
+        (0, '3', 3.0),
+        (3, '1', 4.0),
+        (0, '120', 10.0),
+        (0, 'Wed, 21 Oct 2026 07:28:00 GMT', 0.5),
+    ])
+    def test_backoff_is_capped_and_honors_retry_after(self, clock, monkeypatch, attempt, retry_after, expected):
+        monkeypatch.setattr(rate_limiter.random, 'uniform', lambda low, high: high)
+
+        assert RateLimiter.backoff(attempt, retry_after) == expected
+        assert clock.sleeps == [expected]
+        assert RateLimiter.stats()['retries'] == 1
+
+    def test_backoff_has_full_jitter(self, clock, monkeypatch):
+        monkeypatch.setattr(rate_limiter.random, 'uniform', lambda low, high: low)
+        assert RateLimiter.backoff(5) == 0
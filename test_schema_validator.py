@@ -0,0 +1,103 @@
+import pytest
+from rest_framework import serializers
+
+from qa_lib.schema_validator import validate_items
+
+
+class Tag(serializers.Serializer):
+    name = serializers.CharField(max_length=10)
+
+
+class Item(serializers.Serializer):
+    title = serializers.CharField(max_length=20)
+    note = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+    count = serializers.IntegerField(min_value=0)
+    price = serializers.FloatField(required=False, max_value=1e6)
+    active = serializers.BooleanField()
+    extra = serializers.JSONField(required=False)
+    owner = Tag(required=False, allow_null=True)
+    tags = Tag(many=True, required=False)
+    labels = Tag(many=True, required=False, allow_empty=False)
+
+
+VALID = {'title': 'book', 'count': 1, 'price': 9.5, 'active': True}
+
+
+def drf_errors(items, serializer_class):
+    serializer = serializer_class(data=items, many=True)
+    if serializer.is_valid():
+        return {}
+    errors = serializer.errors
+    if isinstance(errors, list):  # Older DRF versions report one entry per item
+        return {index: item_errors for index, item_errors in enumerate(errors) if item_errors}
+    return dict(errors)
+
+
+def assert_same_verdict(items):
+    expected = drf_errors(items, Item)
+    assert validate_items(items, Item) == expected
+    return expected
+
+
+FIELD_VALUES = {
+    'title': ['book', ' book ', '', '   ', 'a' * 21, 'nul\x00', 'surrogate\ud800', 42, 4.5, True, None, [], {}],
+    'note': ['text', '', ' ', None, 42, False],
+    'count': [0, 7, -1, 2 ** 70, '5', '5.0', 5.0, 5.5, True, None, 'five'],
+    'price': [0, 1.5, -3, 1e6, 1e6 + 1, float('nan'), float('inf'), float('-inf'), 10 ** 400, '2.5', 'nan',
+              True, None, 'price'],
+    'active': [True, False, 'true', 'no', 1, 0, 2, None, 'maybe', []],
+    'extra': [{'a': [1, None]}, [], '', 0, None],
+    'owner': [{'name': 'x'}, {'name': ''}, {'name': 'a' * 11}, {}, None, [], 'x'],
+    'tags': [[], [{'name': 'x'}, {'name': 'y'}], [{'name': 'x'}, {}], [{'name': None}], {'name': 'x'}, None, 'x'],
+    'labels': [[], [{'name': 'x'}], [{}], None],
+}
+
+
+class TestMatchesDrf:
+    @pytest.mark.parametrize('field, value', [
+        (field, value) for field, values in FIELD_VALUES.items() for value in values
+    ], ids=repr)
+    def test_single_field_value(self, field, value):
+        assert_same_verdict([VALID, {**VALID, field: value}])
+
+    @pytest.mark.parametrize('field', ['title', 'count', 'active'])
+    def test_required_field_missing(self, field):
+        item = dict(VALID)
+        del item[field]
+        assert assert_same_verdict([item]) == {0: {field: ['This field is required.']}}
+
+    @pytest.mark.parametrize('field', ['note', 'price', 'extra', 'owner', 'tags', 'labels'])
+    def test_optional_field_missing(self, field):
+        item = {**VALID, 'note': 'n', 'extra': {}, 'owner': {'name': 'o'}, 'tags': [], 'labels': [{'name': 'l'}]}
+        del item[field]
+        assert assert_same_verdict([item]) == {}
+
+    @pytest.mark.parametrize('item', [None, [], 'item', 1])
+    def test_item_is_not_an_object(self, item):
+        assert_same_verdict([VALID, item])
+
+    def test_unknown_keys_are_ignored(self):
+        assert assert_same_verdict([{**VALID, 'unknown': float('nan')}]) == {}
+
+
+class TestSampling:
+    items = [{**VALID, 'count': -index} for index in range(10)]  # Every item except the first one is invalid
+
+    def test_without_sample_all_items_are_checked(self):
+        assert sorted(validate_items(self.items, Item)) == list(range(1, 10))
+
+    def test_sample_includes_first_and_last(self):
+        assert sorted(validate_items(self.items, Item, sample_size=3)) == [4, 9]
+
+    def test_sample_of_one_checks_the_first_item(self):
+        assert validate_items(self.items, Item, sample_size=1) == {}
+        assert validate_items(self.items[1:], Item, sample_size=1) == {0: {'count': [
+            'Ensure this value is greater than or equal to 0.']}}
+
+    @pytest.mark.parametrize('sample_size', [0, -1])
+    def test_empty_sample_is_rejected(self, sample_size):
+        with pytest.raises(ValueError):
+            validate_items(self.items, Item, sample_size=sample_size)
+
+    def test_single_object(self):
+        assert validate_items(VALID, Item, sample_size=5) == {}
@@ -0,0 +1,66 @@
+import random
+
+import pytest
+
+from qa_lib.sharding import DEFAULT_DURATION, load_durations, save_durations, split_by_duration
+
+
+def loads(shards, durations, default=DEFAULT_DURATION):
+    return [sum(durations.get(node_id, default) for node_id in shard) for shard in shards]
+
+
+class TestSplitByDuration:
+    @pytest.mark.parametrize('shard_count', [1, 2, 3, 7])
+    def test_every_test_lands_in_exactly_one_shard(self, shard_count):
+        node_ids = [f'test_a.py::test_{index}' for index in range(50)]
+        shards = split_by_duration(node_ids, {}, shard_count)
+
+        assert len(shards) == shard_count
+        assert sorted(node_id for shard in shards for node_id in shard) == sorted(node_ids)
+
+    def test_shards_are_balanced(self):
+        rng = random.Random(1)
+        durations = {f'test_{index}': rng.expovariate(1) for index in range(200)}
+        shards = split_by_duration(list(durations), durations, 4)
+
+        shard_loads = loads(shards, durations)
+        # Longest-processing-time bound: no shard exceeds the average by more than the longest test
+        assert max(shard_loads) <= sum(shard_loads) / 4 + max(durations.values())
+        assert max(shard_loads) - min(shard_loads) < 1.0
+
+    def test_split_does_not_depend_on_collection_order(self):
+        durations = {f'test_{index}': float(index % 5) for index in range(40)}
+        node_ids = list(durations)
+        shuffled = node_ids[:]
+        random.Random(2).shuffle(shuffled)
+
+        assert split_by_duration(node_ids, durations, 3) == split_by_duration(shuffled, durations, 3)
+
+    def test_unknown_tests_count_as_median_duration(self):
+        durations = {'slow': 10.0, 'a': 1.0, 'b': 1.0, 'c': 1.0}
+        shards = split_by_duration(['slow', 'a', 'b', 'c', 'new_1', 'new_2'], durations, 2)
+
+        assert shards == [['slow'], ['a', 'b', 'c', 'new_1', 'new_2']]
+
+    def test_without_any_durations_tests_are_dealt_round_robin(self):
+        shards = split_by_duration(['t1', 't2', 't3', 't4', 't5'], {}, 2)
+        assert shards == [['t1', 't3', 't5'], ['t2', 't4']]
+
+    def test_more_shards_than_tests(self):
+        assert split_by_duration(['t1', 't2'], {'t1': 2.0, 't2': 1.0}, 4) == [['t1'], ['t2'], [], []]
+
+
+class TestDurationsFile:
+    def test_save_merges_into_existing_file(self, tmp_path):
+        path = str(tmp_path / 'durations.json')
+        save_durations(path, {'a': 1.0, 'b': 2.0})
+        save_durations(path, {'b': 3.0, 'c': 4.0})
+
+        assert load_durations(path) == {'a': 1.0, 'b': 3.0, 'c': 4.0}
+
+    def test_missing_or_broken_file_is_empty(self, tmp_path):
+        broken = tmp_path / 'broken.json'
+        broken.write_text('{', encoding='utf-8')
+
+        assert load_durations(str(tmp_path / 'missing.json')) == {}
+        assert load_durations(str(broken)) == {}
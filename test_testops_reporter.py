@@ -0,0 +1,92 @@
+import queue
+import threading
+import time
+
+import pytest
+
+from qa_lib.logger import Logger
+from qa_lib.testops_reporter import TestOpsReporter
+
+
+@pytest.fixture
+def reporter(monkeypatch):
+    monkeypatch.setattr(TestOpsReporter, 'mode', 'file')
+    monkeypatch.setattr(TestOpsReporter, '_steps', {})
+    monkeypatch.setattr(TestOpsReporter, '_results', {})
+    monkeypatch.setattr(TestOpsReporter, '_queue', queue.SimpleQueue())
+    monkeypatch.setattr(TestOpsReporter, '_start', staticmethod(lambda: None))
+    current = Logger._current_test
+    yield TestOpsReporter
+    Logger._current_test = current
+
+
+def step(title, status='passed'):
+    try:
+        with TestOpsReporter.step(lambda: title):
+            if status == 'failed':
+                raise RuntimeError(title)
+    except RuntimeError:
+        pass
+
+
+def queued(reporter):
+    results = {}
+    while not reporter._queue.empty():
+        test_id, status, _, comment, steps = reporter._queue.get()
+        results[test_id] = (status, comment, [(title(), step_status) for title, step_status, _, _ in steps])
+    return results
+
+
+class TestStepsPerTest:
+    def test_teardown_steps_stay_with_their_test(self, reporter):
+        for test_id in ('t::a', 't::b'):
+            Logger.set_current_test(test_id, 'call')
+            step(f'{test_id} call')
+            reporter.record_result(test_id, 'passed', 0.1)
+            Logger.set_current_test(test_id, 'teardown')
+            step(f'{test_id} teardown', 'failed')
+            reporter.finish_test(test_id)
+
+        assert queued(reporter) == {
+            't::a': ('passed', '', [('t::a call', 'passed'), ('t::a teardown', 'failed')]),
+            't::b': ('passed', '', [('t::b call', 'passed'), ('t::b teardown', 'failed')]),
+        }
+        assert reporter._steps == {}
+
+    def test_thread_step_goes_to_the_test_it_started_in(self, reporter):
+        Logger.set_current_test('t::a', 'call')
+        started, release = threading.Event(), threading.Event()
+
+        def background():
+            with reporter.step(lambda: 'background'):
+                started.set()
+                release.wait(5)
+
+        thread = threading.Thread(target=background)
+        thread.start()
+        started.wait(5)
+        Logger.set_current_test('t::b', 'call')
+        step('b call')
+        release.set()
+        thread.join()
+        reporter.finish_test('t::b')
+        reporter.finish_test('t::a')
+
+        results = queued(reporter)
+        assert results['t::a'][2] == [('background', 'passed')]
+        assert results['t::b'][2] == [('b call', 'passed')]
+
+    def test_steps_are_ordered_by_start(self, reporter):
+        Logger.set_current_test('t::a', 'call')
+        with reporter.step(lambda: 'outer'):
+            time.sleep(0.001)
+            step('inner')
+        reporter.finish_test('t::a')
+
+        assert [title for title, _ in queued(reporter)['t::a'][2]] == ['outer', 'inner']
+
+    def test_failed_teardown_fails_the_test(self, reporter):
+        reporter.record_result('t::a', 'passed', 0.1)
+        reporter.finish_test('t::a', 'teardown error')
+
+        assert queued(reporter)['t::a'][:2] == ('failed', 'teardown error')
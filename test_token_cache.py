@@ -0,0 +1,71 @@
+from datetime import timedelta
+
+import pytest
+
+from qa_lib.token_cache import TokenCache
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    TokenCache.clear()
+    yield
+    TokenCache.clear()
+
+
+class Minter:
+    def __init__(self):
+        self.calls = 0
+
+    def pair(self):
+        self.calls += 1
+        return {'access': f'access-{self.calls}', 'refresh': f'refresh-{self.calls}'}
+
+
+class TestTokenCache:
+    def test_token_is_reused_and_counted(self):
+        minter = Minter()
+        first = TokenCache.get(1, 'USER', 'pair', minter.pair, timedelta(minutes=10))
+        second = TokenCache.get(1, 'USER', 'pair', minter.pair, timedelta(minutes=10))
+
+        assert first == second == {'access': 'access-1', 'refresh': 'refresh-1'}
+        assert minter.calls == 1
+        assert TokenCache.stats() == {'hits': 1, 'misses': 1, 'size': 1}
+
+    def test_keys_separate_subjects_and_token_types(self):
+        minter = Minter()
+        TokenCache.get(1, 'USER', 'pair', minter.pair, timedelta(minutes=10))
+        TokenCache.get(2, 'USER', 'pair', minter.pair, timedelta(minutes=10))
+        TokenCache.get(1, 'USER', 'access', minter.pair, timedelta(minutes=10))
+
+        assert minter.calls == 3
+        assert TokenCache.stats() == {'hits': 0, 'misses': 3, 'size': 3}
+
+    def test_token_within_refresh_margin_is_reminted(self, monkeypatch):
+        monkeypatch.setattr(TokenCache, 'refresh_margin', 60.0)
+        minter = Minter()
+        TokenCache.get(1, 'USER', 'pair', minter.pair, timedelta(seconds=59))
+        TokenCache.get(1, 'USER', 'pair', minter.pair, timedelta(seconds=59))
+
+        assert minter.calls == 2
+        assert TokenCache.stats()['misses'] == 2
+
+    def test_token_outside_refresh_margin_is_reused(self, monkeypatch):
+        monkeypatch.setattr(TokenCache, 'refresh_margin', 60.0)
+        minter = Minter()
+        TokenCache.get(1, 'USER', 'pair', minter.pair, timedelta(seconds=120))
+        TokenCache.get(1, 'USER', 'pair', minter.pair, timedelta(seconds=120))
+
+        assert minter.calls == 1
+
+    def test_edited_pair_does_not_leak_into_later_calls(self):
+        minter = Minter()
+        tokens = TokenCache.get(1, 'USER', 'pair', minter.pair, timedelta(minutes=10))
+        tokens['access'] = 'broken'
+
+        assert TokenCache.get(1, 'USER', 'pair', minter.pair, timedelta(minutes=10))['access'] == 'access-1'
+
+    def test_clear_resets_tokens_and_counters(self):
+        TokenCache.get(1, 'USER', 'pair', Minter().pair, timedelta(minutes=10))
+        TokenCache.clear()
+
+        assert TokenCache.stats() == {'hits': 0, 'misses': 0, 'size': 0}
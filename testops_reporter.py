@@ -0,0 +1,241 @@
+"""
+Buffered Qase TestOps reporting.
+
+QA_TESTOPS_MODE selects how test results and request steps are reported:
+    off       - default, steps go through the qase-pytest plugin (`qase.step`) as configured in qase.config.json;
+    buffered  - results and steps are kept in memory and uploaded in bulk batches by a background thread
+                to QA_TESTOPS_URL (Qase API v1 layout; the project and token come from qase.config.json);
+    file      - the same batches are appended to QA_TESTOPS_FILE as JSON lines, for offline runs.
+
+In the buffered and file modes a step costs the test thread one list append: the step title is a
+callable that is formatted by the background thread (request steps reuse the bounded repr of the data
+that the client logs anyway, so it is never computed twice). Steps are kept per test id, so steps of
+teardown and of other threads go to the test that was running when they started. Batches that cannot be uploaded are written
+to the file sink, so no results are lost. Run with QASE_MODE=off in these modes so the qase-pytest
+plugin does not report the same tests a second time.
+"""
+import contextlib
+import datetime
+import json
+import os
+import queue
+import threading
+import time
+from typing import Any, Callable, Iterator
+
+from qa_lib.logger import Logger
+
+
+class FileSink:
+    def __init__(self, path: str):
+        self.path = path
+
+    def send(self, results: list[dict]) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as stream:
+            stream.write(''.join(json.dumps(result, ensure_ascii=False) + '\n' for result in results))
+
+    def complete(self) -> None:
+        pass
+
+
+class HttpSink:
+    """Uploads results to a TestOps API v1 endpoint: one run per session, bulk result batches."""
+
+    def __init__(self, url: str, project: str, token: str, timeout: float = 30.0):
+        self.url = url.rstrip('/')
+        self.project = project
+        self.token = token
+        self.timeout = timeout
+        self.run_id: int | None = None
+
+    def _post(self, path: str, body: dict) -> dict:
+        import urllib.request  # Only the buffered mode uploads; the clients import this module in every mode
+
+        request = urllib.request.Request(
+            f'{self.url}{path}',
+            data=json.dumps(body, ensure_ascii=False).encode('utf-8'),
+            headers={'Token': self.token, 'Content-Type': 'application/json', 'Accept': 'application/json'},
+            method='POST',
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return json.loads(response.read() or b'{}')
+
+    def send(self, results: list[dict]) -> None:
+        if self.run_id is None:
+            stamp = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            self.run_id = self._post(f'/v1/run/{self.project}', {'title': f'Automated run {stamp}'})['result']['id']
+        self._post(f'/v1/result/{self.project}/{self.run_id}/bulk', {'results': results})
+
+    def complete(self) -> None:
+        if self.run_id is not None:
+            self._post(f'/v1/run/{self.project}/{self.run_id}/complete', {})
+
+
+class TestOpsReporter:
+    __test__ = False  # Not a test class, despite the name
+
+    mode = os.getenv('QA_TESTOPS_MODE', 'off')
+    batch_size = int(os.getenv('QA_TESTOPS_BATCH', '200'))  # Qase accepts at most 200 results per bulk request
+    flush_interval = float(os.getenv('QA_TESTOPS_FLUSH_INTERVAL', '2'))
+    file_path = os.getenv('QA_TESTOPS_FILE', os.path.join('logs', 'testops_results.jsonl'))
+
+    _steps: dict[str, list[tuple]] = {}  # Test id -> steps recorded for it
+    _results: dict[str, tuple] = {}  # Test id -> (status, duration, comment), until the teardown is over
+    _queue: queue.SimpleQueue = queue.SimpleQueue()
+    _worker: threading.Thread | None = None
+    _sink = None
+    _fallback: FileSink | None = None
+    _lock = threading.Lock()
+
+    @staticmethod
+    def enabled() -> bool:
+        return TestOpsReporter.mode in {'buffered', 'file'}
+
+    @staticmethod
+    def _start() -> None:
+        with TestOpsReporter._lock:
+            if TestOpsReporter._worker is not None:
+                return
+            TestOpsReporter._fallback = FileSink(TestOpsReporter.file_path)
+            if TestOpsReporter.mode == 'buffered':
+                with open(os.getenv('QASE_CONFIG', 'qase.config.json'), encoding='utf-8') as stream:
+                    testops = json.load(stream)['testops']
+                TestOpsReporter._sink = HttpSink(
+                    os.getenv('QA_TESTOPS_URL', 'https://api.qase.io'),
+                    os.getenv('QASE_TESTOPS_PROJECT', testops['project']),
+                    os.getenv('QASE_TESTOPS_API_TOKEN', testops['api']['token']),
+                )
+            else:
+                TestOpsReporter._sink = TestOpsReporter._fallback
+            TestOpsReporter._worker = threading.Thread(target=TestOpsReporter._run, name='TestOpsReporter', daemon=True)
+            TestOpsReporter._worker.start()
+
+    @staticmethod
+    @contextlib.contextmanager
+    def step(title: Callable[[], str]) -> Iterator[None]:
+        """Records a step of the current test. `title` is called later, on the background thread."""
+        test_id = Logger.current_test_id()
+        started = time.time()
+        status = 'passed'
+        try:
+            yield
+        except BaseException:
+            status = 'failed'
+            raise
+        finally:
+            TestOpsReporter.add_step(title, status, started, time.time() - started, test_id)
+
+    @staticmethod
+    def add_step(title: Callable[[], str], status: str, started: float, duration: float,
+                 test_id: str | None = None) -> None:
+        """Records a step that has already run, e.g. a request sent by a batch worker thread."""
+        test_id = Logger.current_test_id() if test_id is None else test_id
+        TestOpsReporter._steps.setdefault(test_id, []).append((title, status, started, duration))
+
+    @staticmethod
+    def record_result(test_id: str, status: str, duration: float, comment: str = '') -> None:
+        """Keeps the result of a test's setup or call phase until its teardown is over."""
+        TestOpsReporter._results[test_id] = (status, duration, comment)
+
+    @staticmethod
+    def finish_test(test_id: str, teardown_error: str = '') -> None:
+        """
+        Queues the result of a test with its steps from setup to teardown, in the order they started.
+        Called once the teardown is reported; a failed teardown fails the test.
+        """
+        TestOpsReporter._start()
+        status, duration, comment = TestOpsReporter._results.pop(test_id, ('passed', 0.0, ''))
+        if teardown_error:
+            status, comment = 'failed', f'{comment}\n{teardown_error}'.strip()
+        steps = sorted(TestOpsReporter._steps.pop(test_id, []), key=lambda step: step[2])
+        TestOpsReporter._queue.put((test_id, status, duration, comment, steps))
+
+    @staticmethod
+    def _format(test_id: str, status: str, duration: float, comment: str, steps: list[tuple]) -> dict[str, Any]:
+        return {
+            'case': {'title': test_id},
+            'status': status,
+            'time_ms': int(duration * 1000),
+            'comment': comment,
+            'steps': [
+                {'position': position, 'status': step_status, 'comment': title()}
+                for position, (title, step_status, _, _) in enumerate(steps, start=1)
+            ],
+        }
+
+    @staticmethod
+    def _send(batch: list[dict]) -> None:
+        try:
+            TestOpsReporter._sink.send(batch)
+        except Exception as e:
+            if TestOpsReporter._sink is TestOpsReporter._fallback:
+                raise
+            TestOpsReporter._fallback.send(batch)
+            from qa_lib.logger import Logger
+            Logger.log_message(f'TestOps upload failed ({e}); {len(batch)} results written to '
+                               f'{TestOpsReporter.file_path}', 'warning')
+
+    @staticmethod
+    def _run() -> None:
+        batch, stopping = [], False
+        while not stopping:
+            try:
+                item = TestOpsReporter._queue.get(timeout=TestOpsReporter.flush_interval)
+            except queue.Empty:
+                item = None
+            if item is StopIteration:
+                stopping = True
+            elif item is not None:
+                batch.append(TestOpsReporter._format(*item))
+            if batch and (len(batch) >= TestOpsReporter.batch_size or item is None or stopping):
+                TestOpsReporter._send(batch)
+                batch = []
+
+    @staticmethod
+    def shutdown() -> None:
+        """Uploads everything still buffered and completes the run. Called at the end of the session."""
+        worker = TestOpsReporter._worker
+        if worker is None:
+            return
+        TestOpsReporter._queue.put(StopIteration)
+        worker.join()
+        TestOpsReporter._worker = None
+        try:
+            TestOpsReporter._sink.complete()
+        except Exception as e:
+            from qa_lib.logger import Logger
+            Logger.log_message(f'TestOps run completion failed: {e}', 'warning')
+
+
+def report_step(title: Callable[[], str]):
+    """
+    Context manager for a request step. Goes to the buffered reporter when it is enabled,
+    otherwise to `qase.step` with the title formatted right away.
+    """
+    if TestOpsReporter.enabled():
+        return TestOpsReporter.step(title)
+    from qase.pytest import qase
+    return qase.step(title())
+
+
+class _StepFailed(Exception):
+    pass
+
+
+def report_completed_step(title: Callable[[], str], status: str, started: float, duration: float) -> None:
+    """
+    Reports a step that has already run elsewhere (a batch worker thread) with its own status and timing.
+    The qase-pytest runtime tracks a single current step, so there the step is opened on the test thread
+    once the work is done, and only the status is carried over.
+    """
+    if TestOpsReporter.enabled():
+        TestOpsReporter.add_step(title, status, started, duration)
+        return
+    from qase.pytest import qase
+    try:
+        with qase.step(title()):
+            if status == 'failed':
+                raise _StepFailed
+    except _StepFailed:
+        pass
@@ -0,0 +1,134 @@
+"""
+Local stand-in for the TestOps API endpoints used by the buffered reporter.
+
+    python -m qa_lib.testops_stub --port 8765
+    QA_TESTOPS_MODE=buffered QA_TESTOPS_URL=http://127.0.0.1:8765 pytest
+
+Runs and results are kept in memory; `GET /v1/result/{project}/{run}` returns what was received.
+"""
+import argparse
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_RUN = re.compile(r'^/v1/run/(?P<project>[^/]+)$')
+_COMPLETE = re.compile(r'^/v1/run/(?P<project>[^/]+)/(?P<run>\d+)/complete$')
+_BULK = re.compile(r'^/v1/result/(?P<project>[^/]+)/(?P<run>\d+)/bulk$')
+_RESULTS = re.compile(r'^/v1/result/(?P<project>[^/]+)/(?P<run>\d+)$')
+
+
+class TestOpsStub:
+    __test__ = False  # Not a test class, despite the name
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, token: str | None = None):
+        self.token = token
+        self.runs: dict[int, dict] = {}
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self) -> 'TestOpsStub':
+        self._thread = threading.Thread(target=self._server.serve_forever, name='TestOpsStub', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> 'TestOpsStub':
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def results(self, run_id: int | None = None) -> list[dict]:
+        runs = [self.runs[run_id]] if run_id is not None else self.runs.values()
+        return [result for run in runs for result in run['results']]
+
+    def _handle(self, method: str, path: str, body: dict) -> tuple[int, dict]:
+        with self._lock:
+            self.requests += 1
+            if method == 'POST' and (match := _RUN.match(path)):
+                run_id = len(self.runs) + 1
+                self.runs[run_id] = {'project': match['project'], 'title': body.get('title'),
+                                     'results': [], 'batches': 0, 'completed': False}
+                return 200, {'status': True, 'result': {'id': run_id}}
+            if method == 'POST' and (match := _BULK.match(path)):
+                run = self.runs.get(int(match['run']))
+                if run is None:
+                    return 404, {'status': False, 'errorMessage': 'Run not found'}
+                results = body.get('results', [])
+                if len(results) > 200:
+                    return 400, {'status': False, 'errorMessage': 'At most 200 results per request'}
+                run['results'].extend(results)
+                run['batches'] += 1
+                return 200, {'status': True}
+            if method == 'POST' and (match := _COMPLETE.match(path)):
+                run = self.runs.get(int(match['run']))
+                if run is None:
+                    return 404, {'status': False, 'errorMessage': 'Run not found'}
+                run['completed'] = True
+                return 200, {'status': True}
+            if method == 'GET' and (match := _RESULTS.match(path)):
+                run_id = int(match['run'])
+                if run_id not in self.runs:
+                    return 404, {'status': False, 'errorMessage': 'Run not found'}
+                return 200, {'status': True, 'result': {'entities': self.results(run_id)}}
+            return 404, {'status': False, 'errorMessage': f'Unknown endpoint {method} {path}'}
+
+    def _handler_class(self) -> type:
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _reply(self, method: str) -> None:
+                if stub.token is not None and self.headers.get('Token') != stub.token:
+                    status, payload = 401, {'status': False, 'errorMessage': 'Unauthenticated'}
+                else:
+                    length = int(self.headers.get('Content-Length') or 0)
+                    body = json.loads(self.rfile.read(length) or b'{}') if length else {}
+                    status, payload = stub._handle(method, self.path.split('?', 1)[0], body)
+                data = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self._reply('GET')
+
+            def do_POST(self):
+                self._reply('POST')
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Local TestOps API stand-in.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--token', default=None, help='Reject requests without this Token header.')
+    args = parser.parse_args()
+    stub = TestOpsStub(args.host, args.port, args.token)
+    print(f'TestOps stub listening on {stub.url}')
+    try:
+        stub._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stub._server.server_close()
+
+
+if __name__ == '__main__':
+    main()
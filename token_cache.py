@@ -0,0 +1,60 @@
+import os
+import threading
+import time
+from datetime import timedelta
+from typing import Any, Callable
+
+
+class TokenCache:
+    """
+    Session-wide cache of JWT tokens keyed by (subject, subject type, token type).
+    A token is reused until it is within `refresh_margin` seconds of its expiration,
+    so thousands of authenticated tests sign only a handful of tokens.
+    """
+    refresh_margin = float(os.getenv('QA_TOKEN_REFRESH_MARGIN', '60'))
+    hits = 0
+    misses = 0
+    _tokens: dict[tuple, tuple[Any, float]] = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def get(
+            subject: Any,
+            subject_type: Any,
+            token_type: str,
+            factory: Callable[[], Any],
+            lifetime: timedelta
+    ) -> Any:
+        """
+        Returns a cached token or mints a new one with `factory`.
+        `lifetime` is the token's validity period (e.g. settings.ACCESS_TOKEN_EXPIRATION_TIME).
+        Dict tokens (pairs) are returned as copies, so a test editing its pair does not affect others.
+        """
+        key = (subject, subject_type, token_type)
+        now = time.time()
+        with TokenCache._lock:
+            cached = TokenCache._tokens.get(key)
+            if cached is not None and cached[1] - TokenCache.refresh_margin > now:
+                TokenCache.hits += 1
+                return TokenCache._copy(cached[0])
+            TokenCache.misses += 1
+        token = factory()
+        with TokenCache._lock:
+            TokenCache._tokens[key] = (token, now + lifetime.total_seconds())
+        return TokenCache._copy(token)
+
+    @staticmethod
+    def _copy(token: Any) -> Any:
+        return dict(token) if isinstance(token, dict) else token
+
+    @staticmethod
+    def clear() -> None:
+        """Drops all cached tokens and resets the counters, e.g. after the users table is rebuilt."""
+        with TokenCache._lock:
+            TokenCache._tokens.clear()
+            TokenCache.hits = 0
+            TokenCache.misses = 0
+
+    @staticmethod
+    def stats() -> dict[str, int]:
+        return {'hits': TokenCache.hits, 'misses': TokenCache.misses, 'size': len(TokenCache._tokens)}